@@ -10,6 +10,9 @@ Exposes:
     Preprocessors (Tokenize, Stem, Lemma, BoW, TFIDF)
     Sentiment engines (RuleBased, Behavioral, LDA)
     behavioral_analyze() convenience function
+- registry / warm_models / release_models : lazy model registry
+- GradingWorker / get_grading_worker : background answer grading
+- AnswerIndex / get_answer_index : near-duplicate answer detection
 """
 
 from .questions import (
@@ -17,6 +20,7 @@ from .questions import (
     get_leveling_questions,
     get_wage_question,
     get_all_questions,
+    load_questions,
     get_job_positions,
     determine_level,
 )
@@ -25,24 +29,49 @@ from .decisions import DecisionEngine, FinalDecisions
 
 
 from .text_mining import(
+    Tokenizer,
+    Stemmer,
+    Lemmatizer,
+    BehavioralSentiment,
+    behavioral_analyze,
     analyze_sentiment,
+    analyze_sentiment_batch,
     calculate_relevance,
+    calculate_relevance_batch,
     grading_formula,
     extract_keywords,)
+from .model_registry import registry, warm_models, release_models
+from .grading_worker import GradingWorker, get_grading_worker
+from .answer_index import AnswerIndex, get_answer_index
 
 __all__ = [
     "get_questions_for_position",
     "get_leveling_questions",
     "get_wage_question",
     "get_all_questions",
+    "load_questions",
     "get_job_positions",
     "determine_level",
     "Judger",
     "InterviewJudger",
     "DecisionEngine",
     "FinalDecisions",
+    "Tokenizer",
+    "Stemmer",
+    "Lemmatizer",
+    "BehavioralSentiment",
+    "behavioral_analyze",
     "analyze_sentiment",
+    "analyze_sentiment_batch",
     "calculate_relevance",
+    "calculate_relevance_batch",
     "grading_formula",
     "extract_keywords",
+    "registry",
+    "warm_models",
+    "release_models",
+    "GradingWorker",
+    "get_grading_worker",
+    "AnswerIndex",
+    "get_answer_index",
     ]
@@ -0,0 +1,409 @@
+# app/modules/QnA/answer_index.py
+"""
+Near-duplicate answer index (copied answers / online templates).
+
+Answer embeddings (the normalized MiniLM vectors `encode_texts()`
+produces) are kept per question in an append-only file of fixed-size
+records, stored as float16:
+
+    app/data/answer_index/v<RECORD_VERSION>/<encoder hash>/<question hash>.rec
+        user  S64            user id (or "template:<source>"), cut at 64 bytes
+        uid   uint64         hash of the full user id (see user_hash)
+        label S16            L1, Q3, ...
+        vec   float16[dim]   normalized embedding
+
+Answers of the querying user are skipped by `uid`, so ids longer than
+the `user` field still never match each other.
+
+Lookups use random-projection LSH: `n_tables` tables of `n_bits`
+sign bits each (see LSHIndex for the centering). A query only re-ranks
+the answers sharing a bucket with it in at least one table (exact cosine
+on the float16 rows), so the cost does not grow with the number of
+stored answers. The hyperplanes are
+derived from a fixed seed, so bucket codes are never stored; they are
+recomputed for rows read from disk.
+
+Every process keeps its own in-memory view and, before each lookup,
+reads only the records other workers appended since its last read.
+
+Backfill from stored reports / seed known templates with:
+    python -m app.modules.QnA.answer_index rebuild
+    python -m app.modules.QnA.answer_index seed templates.jsonl
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from array import array
+from itertools import chain
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from .model_registry import EMBEDDING_MODEL_ID, model_tag
+from ..io_manager.storage_paths import DATA_ROOT, REPORTS_DIR
+
+ANSWER_INDEX_DIR = DATA_ROOT / "answer_index"
+RECORD_VERSION = 2           # bump when record_dtype() changes
+RECORD_SUFFIX = ".rec"
+EMBEDDING_DIM = 384          # paraphrase-multilingual-MiniLM-L12-v2
+N_TABLES = 32
+N_BITS = 14
+CENTER_ROWS = 1024           # exact scan below this many answers per question
+SEED = 1729
+SIMILARITY_THRESHOLD = 0.92  # cosine; copied / lightly edited answers score ~0.95+
+MIN_ANSWER_CHARS = 20        # "ya", "tidak" etc. are not worth flagging
+
+
+class SimilarAnswer(NamedTuple):
+    user_id: str
+    label: str
+    similarity: float
+
+
+def record_dtype(dim: int = EMBEDDING_DIM) -> np.dtype:
+    return np.dtype([("user", "S64"), ("uid", "<u8"), ("label", "S16"), ("vec", "<f2", (dim,))])
+
+
+def user_hash(user_id: str) -> int:
+    """64-bit key of the full user id (the stored `user` may be cut)."""
+    return int.from_bytes(hashlib.sha256(str(user_id).encode("utf-8")).digest()[:8], "little")
+
+
+def question_key(question: str) -> str:
+    """Stable file key for a question text (16 hex chars)."""
+    return hashlib.sha256(str(question).strip().encode("utf-8")).hexdigest()[:16]
+
+
+def encoder_key(model_id: Optional[str] = None) -> str:
+    """Directory key for the encoder; embeddings of different backends never mix."""
+    model_id = model_tag(EMBEDDING_MODEL_ID) if model_id is None else model_id
+    return hashlib.sha256(model_id.encode("utf-8")).hexdigest()[:12]
+
+
+class LSHIndex:
+    """
+    In-memory random-projection LSH over normalized float16 vectors.
+    Rows are appended, never removed.
+
+    Answers to one question all lean the same way, so raw sign bits would
+    put most of them in a few buckets. Codes are taken on vectors centered
+    on the mean of the first `center_rows` rows (the same rows in every
+    process, since the file is append-only); until there are that many,
+    lookups are an exact scan.
+    """
+
+    def __init__(
+        self,
+        dim: int = EMBEDDING_DIM,
+        n_tables: int = N_TABLES,
+        n_bits: int = N_BITS,
+        seed: int = SEED,
+        center_rows: int = CENTER_ROWS,
+    ):
+        self.dim = dim
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.center_rows = center_rows
+        planes = np.random.default_rng(seed).standard_normal((n_tables * n_bits, dim))
+        self._planes = planes.astype(np.float32).T                  # (dim, T*B)
+        self._weights = (1 << np.arange(n_bits, dtype=np.int64))     # bit -> int
+        self._center: Optional[np.ndarray] = None
+        self._buckets: List[Dict[int, array]] = [{} for _ in range(n_tables)]
+        self._vectors = np.empty((0, dim), dtype=np.float16)
+        self._users: List[str] = []
+        self._uids = array("Q")
+        self._labels: List[str] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _codes(self, vectors: np.ndarray) -> np.ndarray:
+        """(n, dim) -> (n, n_tables) bucket codes."""
+        bits = ((np.asarray(vectors, dtype=np.float32) - self._center) @ self._planes) > 0
+        return bits.reshape(len(bits), self.n_tables, self.n_bits) @ self._weights
+
+    def _bucket(self, first: int, last: int):
+        codes = self._codes(self._vectors[first:last])
+        rows = np.arange(first, last, dtype=np.int32)
+        for table, column in zip(self._buckets, codes.T):
+            # Group rows by code (stable, so buckets stay in row order)
+            order = np.argsort(column, kind="stable")
+            keys, starts = np.unique(column[order], return_index=True)
+            for code, group in zip(keys.tolist(), np.split(rows[order], starts[1:])):
+                bucket = table.get(code)
+                if bucket is None:
+                    bucket = table[code] = array("i")
+                bucket.frombytes(group.tobytes())
+
+    def add(self, vectors: np.ndarray, users: List[str], labels: List[str], uids: Optional[np.ndarray] = None):
+        vectors = np.asarray(vectors, dtype=np.float16).reshape(-1, self.dim)
+        n = len(vectors)
+        if n == 0:
+            return
+        # Amortized O(1) growth of the vector matrix
+        if self._size + n > len(self._vectors):
+            grown = np.empty((max(2 * len(self._vectors), self._size + n, 256), self.dim), dtype=np.float16)
+            grown[:self._size] = self._vectors[:self._size]
+            self._vectors = grown
+        self._vectors[self._size:self._size + n] = vectors
+        self._users.extend(users)
+        if uids is None:
+            uids = [user_hash(u) for u in users]
+        self._uids.extend(np.asarray(uids, dtype=np.uint64).tolist())
+        self._labels.extend(labels)
+        first, self._size = self._size, self._size + n
+
+        if self._center is not None:
+            self._bucket(first, self._size)
+        elif self._size >= self.center_rows:
+            self._center = self._vectors[:self.center_rows].astype(np.float32).mean(axis=0)
+            self._bucket(0, self._size)
+
+    def _candidates(self, vector: np.ndarray) -> np.ndarray:
+        if self._center is None:
+            return np.arange(self._size)
+        codes = self._codes(vector[None, :])[0].tolist()
+        hits = [table.get(code, ()) for table, code in zip(self._buckets, codes)]
+        return np.unique(np.fromiter(chain.from_iterable(hits), dtype=np.int64))
+
+    def query(
+        self,
+        vector: np.ndarray,
+        k: int = 5,
+        min_similarity: float = SIMILARITY_THRESHOLD,
+        exclude_user: Optional[str] = None,
+    ) -> List[SimilarAnswer]:
+        """
+        Stored answers with cosine >= `min_similarity` to `vector`, best
+        first (at most `k`). Answers of `exclude_user` are ignored.
+        """
+        if self._size == 0:
+            return []
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        rows = self._candidates(vector)
+        if len(rows) == 0:
+            return []
+
+        sims = self._vectors[rows].astype(np.float32) @ vector
+        keep = sims >= min_similarity
+        rows, sims = rows[keep], sims[keep]
+        order = np.argsort(-sims)
+
+        excluded = None if exclude_user is None else user_hash(exclude_user)
+        matches = []
+        for i in order:
+            if self._uids[rows[i]] == excluded:
+                continue
+            matches.append(SimilarAnswer(self._users[rows[i]], self._labels[rows[i]], round(float(sims[i]), 4)))
+            if len(matches) >= k:
+                break
+        return matches
+
+
+class AnswerIndex:
+    """
+    Per-question LSH indexes backed by the append-only record files.
+    """
+
+    def __init__(self, root: Path = None, dim: int = EMBEDDING_DIM, n_tables: int = N_TABLES, n_bits: int = N_BITS):
+        self.root = Path(root) if root is not None else ANSWER_INDEX_DIR / f"v{RECORD_VERSION}" / encoder_key()
+        self.dim = dim
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.dtype = record_dtype(dim)
+        self._indexes: Dict[str, LSHIndex] = {}
+        self._offsets: Dict[str, int] = {}   # bytes of each file already loaded
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}{RECORD_SUFFIX}"
+
+    def _sync(self, key: str) -> LSHIndex:
+        """Load records appended (by any process) since the last sync."""
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = LSHIndex(self.dim, self.n_tables, self.n_bits)
+            self._offsets[key] = 0
+
+        path = self._path(key)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return index
+        offset = self._offsets[key]
+        whole = (size - offset) // self.dtype.itemsize   # ignore a torn last record
+        if whole <= 0:
+            return index
+
+        with path.open("rb") as f:
+            f.seek(offset)
+            records = np.fromfile(f, dtype=self.dtype, count=whole)
+        index.add(
+            records["vec"],
+            [u.decode("utf-8", "replace") for u in records["user"]],
+            [l.decode("utf-8", "replace") for l in records["label"]],
+            records["uid"],
+        )
+        self._offsets[key] = offset + whole * self.dtype.itemsize
+        return index
+
+    def _append(self, key: str, vectors: np.ndarray, users: List[str], labels: List[str]):
+        records = np.zeros(len(vectors), dtype=self.dtype)
+        records["user"] = [str(u).encode("utf-8")[:64] for u in users]
+        records["uid"] = [user_hash(u) for u in users]
+        records["label"] = [str(l).encode("utf-8")[:16] for l in labels]
+        records["vec"] = np.asarray(vectors, dtype=np.float16).reshape(-1, self.dim)
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        # One O_APPEND write per batch: concurrent workers never interleave
+        # inside a record
+        fd = os.open(self._path(key), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, records.tobytes())
+        finally:
+            os.close(fd)
+
+    def __len__(self) -> int:
+        return sum(len(index) for index in self._indexes.values())
+
+    def size(self, question: str) -> int:
+        return len(self._sync(question_key(question)))
+
+    def add(self, question: str, vectors: np.ndarray, users: List[str], labels: List[str]):
+        """Store answers to `question` (persisted, then visible to lookups)."""
+        vectors = np.asarray(vectors).reshape(-1, self.dim)
+        if len(vectors):
+            key = question_key(question)
+            self._append(key, vectors, users, labels)
+            self._sync(key)
+
+    def query(self, question: str, vector: np.ndarray, **kwargs) -> List[SimilarAnswer]:
+        """Similar stored answers to the same question (see LSHIndex.query)."""
+        return self._sync(question_key(question)).query(vector, **kwargs)
+
+    def check_and_add(
+        self,
+        question: str,
+        vector: np.ndarray,
+        user_id: str,
+        label: str,
+        min_similarity: float = SIMILARITY_THRESHOLD,
+        k: int = 5,
+    ) -> List[SimilarAnswer]:
+        """
+        Look up earlier answers (by other users) similar to this one, then
+        store it. Returns the matches; empty means nothing to flag.
+        """
+        matches = self.query(question, vector, k=k, min_similarity=min_similarity, exclude_user=user_id)
+        self.add(question, vector, [user_id], [label])
+        return matches
+
+
+_cached_index: Optional[AnswerIndex] = None
+_cached_tag = None
+
+
+def get_answer_index() -> AnswerIndex:
+    """
+    Process-wide AnswerIndex for the current encoder.
+    Replaced when the inference backend changes.
+    """
+    global _cached_index, _cached_tag
+    tag = model_tag(EMBEDDING_MODEL_ID)
+    if _cached_index is None or tag != _cached_tag:
+        _cached_index = AnswerIndex()
+        _cached_tag = tag
+    return _cached_index
+
+
+# -------------------------------------------------------------------
+# Backfill
+# -------------------------------------------------------------------
+def rebuild(reports_dir: Path = REPORTS_DIR, index: AnswerIndex = None, batch_size: int = 256) -> int:
+    """
+    Index every answer in the stored answer logs (<id>.jsonl) from
+    scratch. Returns the number of answers indexed.
+    """
+    from .text_mining import encode_texts
+    from ..io_manager.answer_log import read_records
+
+    index = index or get_answer_index()
+    for old in index.root.glob(f"*{RECORD_SUFFIX}"):
+        old.unlink()
+    index._indexes.clear()
+    index._offsets.clear()
+
+    pending: Dict[str, List] = {}
+    for log in sorted(Path(reports_dir).glob("*.jsonl")):
+        for rec in read_records(log):
+            answer = str(rec.get("answer") or "")
+            if rec.get("label") in ("FINAL", "Wage_Expectation") or len(answer) < MIN_ANSWER_CHARS:
+                continue
+            pending.setdefault(str(rec.get("question") or ""), []).append((log.stem, rec["label"], answer))
+
+    total = 0
+    for question, items in pending.items():
+        for start in range(0, len(items), batch_size):
+            chunk = items[start:start + batch_size]
+            index.add(
+                question,
+                encode_texts([a for _, _, a in chunk]),
+                [u for u, _, _ in chunk],
+                [l for _, l, _ in chunk],
+            )
+            total += len(chunk)
+    return total
+
+
+def seed_templates(path: Path, index: AnswerIndex = None) -> int:
+    """
+    Add known template answers from a JSON Lines file of
+    {"question": ..., "answer": ..., "source": ...}; matches against them
+    are reported with user id "template:<source>".
+    """
+    from .text_mining import encode_texts
+
+    index = index or get_answer_index()
+    rows = [json.loads(line) for line in Path(path).read_text(encoding="utf-8").splitlines() if line.strip()]
+    for row in rows:
+        index.add(
+            row["question"],
+            encode_texts([row["answer"]]),
+            [f"template:{row.get('source', 'web')}"],
+            [str(row.get("label", ""))],
+        )
+    return len(rows)
+
+
+__all__ = [
+    "SimilarAnswer",
+    "LSHIndex",
+    "AnswerIndex",
+    "get_answer_index",
+    "question_key",
+    "user_hash",
+    "rebuild",
+    "seed_templates",
+    "SIMILARITY_THRESHOLD",
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the near-duplicate answer index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="re-index all stored answer logs")
+    seed = sub.add_parser("seed", help="add template answers from a JSON Lines file")
+    seed.add_argument("path", type=Path)
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        print(f"Indexed {rebuild()} answers into {get_answer_index().root}")
+    else:
+        print(f"Seeded {seed_templates(args.path)} template answers")
+
+
+if __name__ == "__main__":
+    main()
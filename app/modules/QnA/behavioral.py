@@ -0,0 +1,144 @@
+# app/modules/QnA/behavioral.py
+"""
+Behavioral lexicon sentiment (see COMPLETE_GUIDE.md, "Behavioral Axes").
+
+Four axes, each with positive / negative words:
+
+    Per-Axis Score = (pos - neg) / (pos + neg + 1)        in [-1, 1]
+    overall        = average of the 4 axes
+
+The lexicon is compiled once into a vocabulary -> axis weight matrix
+(+1 positive, -1 negative), so scoring a token list is one NumPy gather
+and sum instead of a Python loop per word and axis. Two-word entries
+("give up") are matched on token bigrams.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .preprocessing import Tokenizer
+
+BEHAVIORAL_LEXICON: Dict[str, Dict[str, List[str]]] = {
+    "Determination": {
+        "positive": ["dedicated", "persistent", "determined", "motivated", "driven", "resilient", "committed", "ambitious"],
+        "negative": ["unmotivated", "give up", "quit", "apathetic", "indifferent", "disengaged"],
+    },
+    "Willingness": {
+        "positive": ["willing", "eager", "enthusiastic", "open", "cooperative", "adaptable", "flexible", "proactive"],
+        "negative": ["unwilling", "reluctant", "resistant", "hesitant", "avoid", "averse"],
+    },
+    "Reliability": {
+        "positive": ["punctual", "consistent", "dependable", "responsible", "organized", "reliable", "steady", "trustworthy"],
+        "negative": ["late", "inconsistent", "unreliable", "irresponsible", "careless", "erratic"],
+    },
+    "Honesty": {
+        "positive": ["honest", "transparent", "truthful", "sincere", "straightforward", "upfront", "trustworthy"],
+        "negative": ["dishonest", "untruthful", "deceptive", "evasive", "misleading", "conceal"],
+    },
+}
+
+
+class CompiledLexicon:
+    """
+    vocabulary: term -> row, weights: (n_terms + 1, n_axes) float32.
+    The last row is all zeros and is used for out-of-vocabulary tokens.
+    """
+
+    def __init__(self, lexicon: Dict[str, Dict[str, List[str]]] = BEHAVIORAL_LEXICON):
+        self.axes: Tuple[str, ...] = tuple(lexicon)
+        terms = list(dict.fromkeys(
+            term.lower() for axis in lexicon.values() for words in axis.values() for term in words
+        ))
+        self.vocabulary: Dict[str, int] = {term: i for i, term in enumerate(terms)}
+        self.oov = len(terms)
+
+        weights = np.zeros((len(terms) + 1, len(self.axes)), dtype=np.float32)
+        for col, axis in enumerate(self.axes):
+            for term in lexicon[axis].get("positive", []):
+                weights[self.vocabulary[term.lower()], col] = 1.0
+            for term in lexicon[axis].get("negative", []):
+                weights[self.vocabulary[term.lower()], col] = -1.0
+        self.weights = weights
+        # A single occurrence scores (±1) / (1 + 1) on each of its axes
+        self.word_weights = weights.sum(axis=1) / 2.0
+        self.has_phrases = any(" " in term for term in terms)
+
+    def ids(self, terms: Iterable[str]) -> np.ndarray:
+        vocab, oov = self.vocabulary, self.oov
+        return np.fromiter((vocab.get(t, oov) for t in terms), dtype=np.intp)
+
+
+_DEFAULT_LEXICON = None
+
+
+def default_lexicon() -> CompiledLexicon:
+    global _DEFAULT_LEXICON
+    if _DEFAULT_LEXICON is None:
+        _DEFAULT_LEXICON = CompiledLexicon()
+    return _DEFAULT_LEXICON
+
+
+class BehavioralSentiment:
+    """
+    Lexicon-based scorer over the four behavioral axes.
+    """
+
+    def __init__(self, lexicon: CompiledLexicon = None):
+        self.lexicon = lexicon or default_lexicon()
+
+    def _term_ids(self, tokens: Sequence[str]) -> np.ndarray:
+        tokens = [str(t).lower() for t in tokens]
+        if self.lexicon.has_phrases and len(tokens) > 1:
+            tokens = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return self.lexicon.ids(tokens)
+
+    def score_axes(self, tokens: Sequence[str]) -> Dict[str, float]:
+        """
+        Per-axis scores in [-1, 1] for a token list.
+        """
+        rows = self.lexicon.weights[self._term_ids(tokens)]
+        pos = (rows > 0).sum(axis=0)
+        neg = (rows < 0).sum(axis=0)
+        scores = (pos - neg) / (pos + neg + 1)
+        return {axis: round(float(s), 4) for axis, s in zip(self.lexicon.axes, scores)}
+
+    def analyze(self, text_or_tokens: Union[str, Sequence[str]]) -> Dict[str, float]:
+        """
+        Axis scores plus "overall" (average of the axes).
+        Accepts raw text or an already tokenized answer.
+        """
+        if isinstance(text_or_tokens, (list, tuple)):
+            tokens = text_or_tokens
+        else:
+            tokens = Tokenizer().process(text_or_tokens)
+        result = self.score_axes(tokens)
+        result["overall"] = round(sum(result.values()) / len(result), 4)
+        return result
+
+    def top_weighted(self, tokens: Iterable[str], k: int = 3) -> List[Tuple[str, float]]:
+        """
+        The k unique tokens with the highest summed single-word axis weight
+        (ties keep first-occurrence order). One gather over unique tokens.
+        """
+        unique = list(dict.fromkeys(str(t).lower() for t in tokens))
+        if not unique or k <= 0:
+            return []
+        weights = self.lexicon.word_weights[self.lexicon.ids(unique)]
+        order = np.argsort(-weights, kind="stable")[:k]
+        return [(unique[i], float(weights[i])) for i in order]
+
+
+def behavioral_analyze(text_or_tokens: Union[str, Sequence[str]]) -> Dict[str, float]:
+    """
+    Convenience wrapper: BehavioralSentiment().analyze(...)
+    """
+    return BehavioralSentiment().analyze(text_or_tokens)
+
+
+__all__ = [
+    "BEHAVIORAL_LEXICON",
+    "CompiledLexicon",
+    "BehavioralSentiment",
+    "behavioral_analyze",
+]
@@ -4,27 +4,78 @@ from pathlib import Path
 import pandas as pd
 from collections import Counter
 
-from .text_mining import 
+from .text_mining import (
+    Tokenizer,
+    Stemmer,
+    Lemmatizer,
+    BehavioralSentiment,
+    answer_embedding_store,
+    extract_keywords,
+)
+from .question_index import get_question_index
 from ..io_manager.storage_paths import REPORTS_DIR
+from ..io_manager.score_store import read_scores, source_signature, NON_ANSWER_LABELS
+from ..io_manager.dashboard_artifact import read_artifact, write_artifact
+from ..io_manager.storage_backend import get_backend
+
+THRESHOLD = 0.8
+SUMMARY_KEYS = (
+    "identity",
+    "relevance_score",
+    "sentiment_score",
+    "overall_score",
+    "semantic_relevance",
+    "most_frequent_words",
+    "most_weighted_words",
+    "bar_chart",
+)
+
+
+def figure_spec(labels, scores, threshold: float = THRESHOLD) -> dict:
+    """
+    Plotly figure dict (go.Figure(spec)) for the score bar chart with the
+    threshold line; plain JSON, so plotly is only needed to render it.
+    """
+    return {
+        "data": [{"type": "bar", "x": list(labels), "y": list(scores), "name": "Score"}],
+        "layout": {
+            "shapes": [{
+                "type": "line", "xref": "paper", "x0": 0, "x1": 1,
+                "yref": "y", "y0": threshold, "y1": threshold,
+                "line": {"dash": "dash", "color": "red"},
+            }],
+            "annotations": [{
+                "xref": "paper", "x": 1, "xanchor": "right", "yref": "y", "y": threshold,
+                "yanchor": "bottom", "text": f"Threshold ({threshold})", "showarrow": False,
+            }],
+        },
+    }
 
 
 class DashboardBuilder:
     """
-    Builds analytical summary from a user's CSV interview file.
+    Builds analytical summary from a user's interview report
+    (typed long-format score store, see io_manager/score_store.py).
 
     Extracts:
     - identity
     - relevance scores (0-1)
     - sentiment (-1 to 1)
     - overall score
+    - semantic relevance (stored answer embeddings vs. question index,
+      no encoder call; None when either is missing)
     - most weighted words (top 3)
     - most frequent words (top 3)
     - bar-chart ready scores
+
+    `build()` serves the precomputed dashboard artifact when it is newer
+    than the report (see io_manager/dashboard_artifact.py) and recomputes
+    otherwise; `write_artifact()` stores it (Judger.finalize, re-grader).
     """
 
-    def __init__(self, user_id: str, use_stem=False, use_lemma=True):
+    def __init__(self, user_id: str, use_stem=False, use_lemma=True, report_path: Path = None):
         self.user_id = user_id
-        self.file_path = Path(REPORTS_DIR) / f"{user_id}.csv"
+        self.file_path = Path(report_path) if report_path else Path(REPORTS_DIR) / f"{user_id}.csv"
 
         # Preprocessors
         self.tokenizer = Tokenizer()
@@ -33,11 +84,35 @@ class DashboardBuilder:
         self.behavior = BehavioralSentiment()
 
     # -------------------------------
-    # CSV READER
+    # REPORT READER
     # -------------------------------
     def load(self) -> pd.DataFrame:
-        df = pd.read_csv(self.file_path)
-        return df
+        # One row per answer: label / question / answer / score (float32);
+        # only these columns are read. Answers appended to the log since
+        # the last write are picked up by the compatibility reader.
+        return read_scores(self.file_path, columns=["label", "question", "answer", "score"])
+
+    # -------------------------------
+    # STORED EMBEDDINGS
+    # -------------------------------
+    def semantic_relevance(self, df: pd.DataFrame):
+        """
+        Mean cosine of the stored answer vectors (written at grading time)
+        with their questions' precomputed vectors; reads both memory maps,
+        never runs the encoder. None if nothing usable is stored.
+        """
+        store = answer_embedding_store()
+        index = get_question_index()
+        if store is None or index is None:
+            return None
+        labels, vectors = store.vectors(self.user_id)
+        questions = dict(zip(df["label"].astype(str), df["question"].astype(str)))
+        sims = []
+        for label, vec in zip(labels, vectors):
+            q_vec = index.lookup(questions.get(label, ""))
+            if q_vec is not None and len(q_vec) == len(vec):
+                sims.append(float(vec.astype("float32") @ q_vec))
+        return round(sum(sims) / len(sims), 4) if sims else None
 
     # -------------------------------
     # TOKEN PIPELINE
@@ -54,40 +129,37 @@ class DashboardBuilder:
     # BUILD DASHBOARD
     # -------------------------------
     def build(self) -> dict:
+        artifact = read_artifact(self.file_path)
+        if artifact is not None:
+            summary = {key: artifact[key] for key in SUMMARY_KEYS}
+            for key in ("most_frequent_words", "most_weighted_words"):
+                summary[key] = [tuple(item) for item in summary[key]]
+            return summary
+
+        empty = {
+            "identity": self.user_id,
+            "relevance_score": 0.0,
+            "sentiment_score": 0.0,
+            "overall_score": 0.0,
+            "semantic_relevance": None,
+            "most_frequent_words": [],
+            "most_weighted_words": [],
+            "bar_chart": {"labels": [], "scores": [], "threshold": THRESHOLD}
+        }
         try:
             df = self.load()
         except FileNotFoundError:
-            return {
-                "identity": self.user_id,
-                "relevance_score": 0.0,
-                "sentiment_score": 0.0,
-                "overall_score": 0.0,
-                "most_frequent_words": [],
-                "most_weighted_words": [],
-                "bar_chart": {"labels": [], "scores": [], "threshold": 0.8}
-            }
-
-        # Extract identity (stored in first column row 2 = answer)
-        identity = df.iloc[2, 0] if df.shape[0] > 2 and df.shape[1] > 0 else self.user_id
-
-        # Collect question scores (row index 3)
-        if df.shape[0] < 4:
-            return {
-                "identity": identity,
-                "relevance_score": 0.0,
-                "sentiment_score": 0.0,
-                "overall_score": 0.0,
-                "most_frequent_words": [],
-                "most_weighted_words": [],
-                "bar_chart": {"labels": [], "scores": [], "threshold": 0.8}
-            }
-
-        score_row = df.iloc[3, :]  # row 3 is scores
+            return empty
+
+        if df.empty:
+            return empty
+        return self.summarize(df)
+
+    def summarize(self, df: pd.DataFrame) -> dict:
+        scores = df["score"].astype("float64").fillna(0.0).round(4)
 
         # Remove FINAL and Wage_Expectation scores
-        clean_scores = score_row[
-            ~score_row.index.isin(["FINAL", "Wage_Expectation"])
-        ].astype(float).tolist()
+        clean_scores = scores[~df["label"].isin(NON_ANSWER_LABELS)].tolist()
 
         # Relevance score (average of Q1..Q16)
         relevance_score = sum(clean_scores[:16]) / 16 if len(clean_scores) >= 16 else (sum(clean_scores) / len(clean_scores) if clean_scores else 0.0)
@@ -99,7 +171,7 @@ class DashboardBuilder:
         overall_score = (relevance_score + (sentiment_score+1)/2) / 2
 
         # MOST FREQUENT WORDS
-        answers = df.iloc[2, :].astype(str).tolist()  # row 2 = answers
+        answers = df["answer"].tolist()
         all_tokens = []
         for ans in answers:
             try:
@@ -111,30 +183,84 @@ class DashboardBuilder:
         most_frequent = freq.most_common(3)
 
         # MOST WEIGHTED WORDS using BehavioralSentiment axes
-        axis_scores = {}
-        for word in all_tokens:
-            try:
-                axes = self.behavior.score_axes([word])
-                axis_scores[word] = sum(axes.values())
-            except Exception:
-                continue
-
-        weighted_sorted = sorted(axis_scores.items(), key=lambda x: x[1], reverse=True)
-        most_weighted = weighted_sorted[:3]
+        # (one lexicon-matrix gather over the unique tokens)
+        most_weighted = self.behavior.top_weighted(all_tokens, k=3)
 
         # BAR CHART DATA
         bar_data = {
-            "labels": list(df.columns),
-            "scores": score_row.astype(float).tolist(),
-            "threshold": 0.8
+            "labels": df["label"].astype(str).tolist(),
+            "scores": scores.tolist(),
+            "threshold": THRESHOLD
         }
 
         return {
-            "identity": identity,
+            "identity": self.user_id,
             "relevance_score": round(relevance_score, 4),
             "sentiment_score": round(sentiment_score, 4),
             "overall_score": round(overall_score, 4),
+            "semantic_relevance": self.semantic_relevance(df),
             "most_frequent_words": most_frequent,
             "most_weighted_words": most_weighted,
             "bar_chart": bar_data
         }
+
+    # -------------------------------
+    # PRECOMPUTED ARTIFACT
+    # -------------------------------
+    def artifact(self, df: pd.DataFrame = None, decision: dict = None) -> dict:
+        """
+        Everything the dashboard views show, computed once: the summary
+        above plus per-answer questions / answers / scores, top keywords,
+        the decision and the bar-chart figure spec.
+        """
+        df = self.load() if df is None else df
+        answered = df[~df["label"].isin(NON_ANSWER_LABELS)]
+        labels = answered["label"].astype(str).tolist()
+        scores = answered["score"].astype("float64").fillna(0.0).round(4).tolist()
+        answers = answered["answer"].astype(str).tolist()
+        return {
+            **self.summarize(df),
+            "labels": labels,
+            "questions": answered["question"].astype(str).tolist(),
+            "answers": answers,
+            "scores": scores,
+            "keywords": extract_keywords(answers, top_n=3),
+            "decision": decision,
+            "figure": figure_spec(labels, scores),
+        }
+
+    def write_artifact(self, decision: dict = None, df: pd.DataFrame = None) -> Path:
+        source = source_signature(self.file_path)  # before the report is read
+        return write_artifact(self.file_path, self.artifact(df, decision), source=source)
+
+
+def load_dashboard(report_path: Path, user_id: str = None, decision: dict = None) -> dict:
+    """
+    Dashboard artifact for a report, rebuilt (and stored again) when it is
+    missing or the report changed since it was built. Raises FileNotFoundError when the
+    report does not exist.
+
+    A rebuild keeps the report's decision: `decision` when given, else the
+    one stored through the storage backend, else the previous artifact's.
+    """
+    report_path = Path(report_path)
+    artifact = read_artifact(report_path)
+    if artifact is None:
+        if decision is None:
+            decision = _stored_decision(report_path)
+        source = source_signature(report_path)  # before the report is read
+        artifact = DashboardBuilder(user_id or report_path.stem, report_path=report_path).artifact(decision=decision)
+        try:
+            write_artifact(report_path, artifact, source=source)
+        except OSError:
+            pass  # read-only tree: serve from memory
+    return artifact
+
+
+def _stored_decision(report_path: Path):
+    stored = get_backend().load_decision(report_path.stem)
+    if stored:
+        # FileBackend keeps the owner next to the decision fields
+        return {k: v for k, v in stored.items() if k not in ("report_id", "username", "position")}
+    previous = read_artifact(report_path, stale_ok=True)
+    return previous.get("decision") if previous else None
@@ -11,10 +11,15 @@ Implements:
 from typing import List, Dict
 import math
 
+import numpy as np
+
 
 PHI = (1 + 5 ** 0.5) / 2   # Golden ratio 1.618...
 PASS_THRESHOLD = 0.8       # <--- Updated threshold
 CONSIDER_THRESHOLD = 0.6   
+WAGE_PENALTY = 0.05        # applied when expectation / budget >= PHI
+
+LABELS = ("Layak", "Dipertimbangkan", "Tidak Layak")
 
 
 class DecisionEngine:
@@ -66,7 +71,7 @@ class DecisionEngine:
         Applied if expectation/company_budget ≥ φ
         """
         ratio = expectation / self.company_budget
-        return 0.05 if ratio >= PHI else 0.0
+        return WAGE_PENALTY if ratio >= PHI else 0.0
 
     # -------------------------------------------------------------------
 
@@ -108,4 +113,59 @@ class DecisionEngine:
             "threshold_used": PASS_THRESHOLD
         }
 
+    # -------------------------------------------------------------------
+
+    def judge_batch(
+        self,
+        question_scores,
+        sentiment,
+        months_experience,
+        wage_expectation,
+        company_budget=None,
+        pass_threshold: float = PASS_THRESHOLD,
+        consider_threshold: float = CONSIDER_THRESHOLD,
+        wage_penalty: float = WAGE_PENALTY,
+        penalty_ratio: float = PHI,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized `judge` for N candidates.
+
+        question_scores   : (N, Q) per-question scores (NaN pads shorter
+                            interviews) or (N,) precomputed averages
+        sentiment         : (N,) overall sentiment in [-1, 1]
+        months_experience : (N,)
+        wage_expectation  : (N,)
+        company_budget    : scalar or (N,); defaults to this engine's budget
+
+        The thresholds and the wage penalty can be overridden (what-if
+        analysis). Returns arrays keyed like `judge` (label / difficulty
+        as string arrays).
+        """
+        scores = np.asarray(question_scores, dtype=np.float64)
+        avg_scores = np.nanmean(scores, axis=1) if scores.ndim == 2 else scores
+        sentiment = np.asarray(sentiment, dtype=np.float64)
+        months = np.asarray(months_experience, dtype=np.float64)
+        wages = np.asarray(wage_expectation, dtype=np.float64)
+        budget = np.asarray(self.company_budget if company_budget is None else company_budget, dtype=np.float64)
+
+        base_score = np.round((avg_scores + (sentiment + 1) / 2) / 2, 4)
+        penalty = np.where(wages / budget >= penalty_ratio, wage_penalty, 0.0)
+        final_score = np.round(np.maximum(0.0, base_score - penalty), 4)
+
+        label = np.select(
+            [final_score >= pass_threshold, final_score >= consider_threshold],
+            LABELS[:2],
+            default=LABELS[2],
+        )
+        difficulty = np.select([months < 12, months < 18], ["beginner", "intermediate"], default="advanced")
+
+        return {
+            "difficulty": difficulty,
+            "base_score": base_score,
+            "penalty": penalty,
+            "final_score": final_score,
+            "label": label,
+            "threshold_used": pass_threshold,
+        }
+
 FinalDecisions = DecisionEngine
@@ -0,0 +1,211 @@
+# app/modules/QnA/grading_worker.py
+"""
+Background grading worker.
+
+The interview UI submits (user, question index, question, answer) jobs and
+gets a Future back immediately; a daemon thread drains the job queue and
+grades everything waiting in one batched pass (analyze_sentiment_batch +
+calculate_relevance_batch), so the candidate never waits on a forward
+pass between questions. Results are collected before the wage/finalize
+step with `results(user)`.
+
+Answers are encoded only when needed: for a relevance score that is not
+cached yet, or for an answer whose vector is not in the answer embedding
+store yet (keyed by user and L1/L2/Q1.. label). Vectors encoded for
+relevance are reused for the store, so each answer is encoded at most
+once and later analyses never re-encode it. Set HIREON_EMBEDDING_STORE=0
+to skip persisting.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from .questions import get_leveling_questions
+from .text_mining import (
+    analyze_sentiment_batch,
+    calculate_relevance_batch,
+    encode_texts,
+    answer_embedding_store,
+    grading_formula,
+)
+from ..logging.metrics import metrics
+
+MAX_BATCH = 32
+RESULTS_TIMEOUT = 60.0  # seconds the finalize step waits for queued grades
+
+
+class GradingJob(NamedTuple):
+    user: str
+    index: int
+    question: str
+    answer: str
+    future: Future
+
+
+class GradingWorker:
+    """
+    Single background thread + job queue; one Future per answer.
+    """
+
+    def __init__(self, max_batch: int = MAX_BATCH, store_embeddings: bool = None):
+        self.max_batch = max_batch
+        if store_embeddings is None:
+            store_embeddings = os.environ.get("HIREON_EMBEDDING_STORE", "1") != "0"
+        self.store_embeddings = store_embeddings
+        self._queue: "queue.Queue[Optional[GradingJob]]" = queue.Queue()
+        self._futures: Dict[str, Dict[int, Future]] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="grading-worker", daemon=True)
+        self._thread.start()
+
+    # -------------------------------------------------------------------
+    def submit(self, user: str, index: int, question: str, answer: str) -> Future:
+        """
+        Queue one answer for grading. Resubmitting the same (user, index)
+        replaces the earlier job's result.
+        """
+        future: Future = Future()
+        with self._lock:
+            self._futures.setdefault(user, {})[index] = future
+        self._queue.put(GradingJob(user, index, question, answer, future))
+        return future
+
+    def pending(self, user: str) -> int:
+        with self._lock:
+            return sum(1 for f in self._futures.get(user, {}).values() if not f.done())
+
+    def results(self, user: str, timeout: Optional[float] = None) -> Dict[int, Dict]:
+        """
+        Wait for all of `user`'s jobs and return {index: result}.
+        `timeout` bounds the whole wait, not each job. A failed or
+        unfinished job yields a zero grade with an "error" entry.
+        """
+        with self._lock:
+            futures = dict(self._futures.get(user, {}))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        out = {}
+        for index, future in sorted(futures.items()):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                out[index] = future.result(timeout=remaining)
+            except Exception as e:
+                out[index] = {"grade": 0.0, "sentiment": 0.0, "relevance": 0.0, "error": str(e) or type(e).__name__}
+        return out
+
+    def discard(self, user: str):
+        """Forget a user's futures (after their results were saved)."""
+        with self._lock:
+            self._futures.pop(user, None)
+
+    def shutdown(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    # -------------------------------------------------------------------
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch: List[GradingJob] = [job]
+            # Grade everything already waiting in the same pass
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._queue.put(None)
+                    break
+                batch.append(nxt)
+            self._grade(batch)
+
+    def _grade(self, batch: List[GradingJob]):
+        """
+        Grade a batch in one pass. If the pass fails, each job is retried
+        on its own so one bad answer only fails its own Future.
+        """
+        try:
+            answers = [j.answer for j in batch]
+            questions = [j.question for j in batch]
+            sentiments = analyze_sentiment_batch(answers, strict=True)
+            encoded = {} if self.store_embeddings else None
+            relevances = calculate_relevance_batch(answers, questions, encoded=encoded)
+        except Exception as e:
+            if len(batch) > 1:
+                for j in batch:
+                    self._grade([j])
+                return
+            metrics.inc("errors", stage="grading")
+            batch[0].future.set_exception(e)
+            return
+        for j, sent, rel in zip(batch, sentiments, relevances):
+            j.future.set_result({
+                "grade": grading_formula(sent, rel),
+                "sentiment": sent,
+                "relevance": rel,
+            })
+        if self.store_embeddings:
+            self._persist(batch, encoded)
+
+    @staticmethod
+    def _persist(batch: List[GradingJob], encoded: Dict[str, np.ndarray]):
+        """
+        Append the vectors of answers not stored yet for their user and
+        label, one store call per user. `encoded` holds the vectors
+        computed for relevance; only the rest are encoded here.
+        """
+        try:
+            store = answer_embedding_store()
+            new: Dict[str, Dict[str, str]] = {}
+            stored: Dict[str, set] = {}
+            for j in batch:
+                if j.user not in stored:
+                    stored[j.user] = set(store.rows(j.user)) if store is not None else set()
+                label = answer_label(j.index)
+                if label not in stored[j.user]:
+                    new.setdefault(j.user, {})[label] = j.answer
+            if not new:
+                return
+
+            missing = list(dict.fromkeys(
+                text for labels in new.values() for text in labels.values() if text not in encoded
+            ))
+            if missing:
+                encoded.update(zip(missing, encode_texts(missing)))
+            if store is None:
+                store = answer_embedding_store(dim=len(next(iter(encoded.values()))))
+            for user, labels in new.items():
+                store.append(user, list(labels), np.stack([encoded[text] for text in labels.values()]))
+        except Exception:
+            # Grades are still valid; only the cached vectors are lost
+            metrics.inc("errors", stage="embedding_store")
+
+
+def answer_label(index: int) -> str:
+    """Interview position -> report label (L1, L2, Q1..Q16)."""
+    leveling = len(get_leveling_questions())
+    return f"L{index + 1}" if index < leveling else f"Q{index - leveling + 1}"
+
+
+_worker: Optional[GradingWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_grading_worker() -> GradingWorker:
+    """Process-wide grading worker (started on first use)."""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = GradingWorker()
+    return _worker
+
+
+__all__ = ["GradingWorker", "GradingJob", "get_grading_worker", "answer_label", "RESULTS_TIMEOUT"]
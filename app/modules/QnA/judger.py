@@ -4,34 +4,56 @@ Judger module orchestrates:
 - question sequencing
 - text-mining scoring
 - decision engine evaluation
-- CSV report writing (incremental)
+- report writing (append-only answer log, CSV materialized at finalize)
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+import logging
 from pathlib import Path
 import os
 
 from .questions import get_leveling_questions, load_questions
 from .text_mining import (
+    Tokenizer,
+    Stemmer,
+    Lemmatizer,
+    BehavioralSentiment,
     analyze_sentiment,
     calculate_relevance,
+    encode_texts,
+    answer_embedding_store,
     grading_formula,
     extract_keywords,
 )
 from .decisions import DecisionEngine
-from ..io_manager.csvio import ensure_csv, append_column
-from ..io_manager.storage_paths import REPORTS_DIR
+from .dashboard import DashboardBuilder
+from .answer_index import get_answer_index, MIN_ANSWER_CHARS
+from ..io_manager.answer_log import log_path_for, import_csv_report
+from ..io_manager.storage_backend import get_backend, FileBackend
+from ..io_manager.jsonio import load_json
+from ..io_manager.storage_paths import REPORTS_DIR, USERS_DIR
+from ..logging.logger import log_user_event
+from ..logging.metrics import metrics, span
 
 
 class Judger:
     """
     Manages the entire QnA pipeline for a single user.
 
+    Answers are appended through the storage backend (by default the
+    <user_id>.jsonl log, O(1) per answer); the CSV below is materialized
+    from the stored answers by `materialize()` / `finalize()`.
+
     CSV layout per column (vertical):
       Row 0: Label (L1, L2, Q1..Q16, Wage_Expectation, FINAL)
       Row 1: Question text
       Row 2: Answer text
       Row 3: Score (float)
+
+    With `similarity_check` (off by default; enable with HIREON_ANSWER_INDEX=1) every answer
+    is also embedded and looked up in the near-duplicate answer index
+    (answer_index.py); matches against other candidates' answers are
+    collected in `similarity_flags` and logged.
     """
 
     def __init__(
@@ -40,16 +62,22 @@ class Judger:
         company_budget: int,
         use_stem: bool = False,
         use_lemma: bool = True,
+        similarity_check: bool = None,
     ):
         self.user_id = user_id
         # REPORTS_DIR is a Path (from storage_paths.py)
         self.file_path = Path(REPORTS_DIR) / f"{user_id}.csv"
+        self.log_path = log_path_for(self.file_path)
         self.company_budget = company_budget
         self.questions = load_questions()  # dict with keys leveling/beginner/...
         self.collected_answers: List[str] = []
         self.scores: List[float] = []
         self.use_stem = use_stem
         self.use_lemma = use_lemma
+        if similarity_check is None:
+            similarity_check = os.environ.get("HIREON_ANSWER_INDEX", "0") == "1"
+        self.similarity_check = similarity_check
+        self.similarity_flags: List[Dict] = []
 
         # internal counter for columns added (0-based)
         self._col_counter = 0
@@ -60,16 +88,20 @@ class Judger:
         self.lemmatizer = Lemmatizer() if self.use_lemma else None
         self.behavior_engine = BehavioralSentiment()
 
-        # Ensure reports directory and base CSV exist (we will append columns later)
-        ensure_csv(self.file_path, headers=["ID"])
+        self.backend = get_backend()
+
+        # Keep columns of a pre-existing CSV report (no-op once the log exists)
+        if isinstance(self.backend, FileBackend):
+            import_csv_report(self.file_path, self.log_path)
 
     # -------------------------------------------------------------------
     def _preprocess_tokens(self, text: str) -> List[str]:
-        tokens = self.tokenizer.process(text)
-        if self.stemmer:
-            tokens = self.stemmer.process(" ".join(tokens))
-        if self.lemmatizer:
-            tokens = self.lemmatizer.process(" ".join(tokens))
+        with span("preprocess"):
+            tokens = self.tokenizer.process(text)
+            if self.stemmer:
+                tokens = self.stemmer.process(" ".join(tokens))
+            if self.lemmatizer:
+                tokens = self.lemmatizer.process(" ".join(tokens))
         return tokens
 
     # -------------------------------------------------------------------
@@ -80,12 +112,47 @@ class Judger:
         """
         try:
             tokens = self._preprocess_tokens(answer)
-            axes = self.behavior_engine.score_axes(tokens)
+            with span("scoring"):
+                axes = self.behavior_engine.score_axes(tokens)
             sentiment_score = round(sum(axes.values()) / 4, 4)
             return sentiment_score
         except Exception as e:
+            metrics.inc("errors", stage="scoring")
             return 0.0
 
+    # -------------------------------------------------------------------
+    def _check_similarity(self, question: str, answer: str, label: str) -> List:
+        """
+        Flag answers that (nearly) repeat another candidate's answer to the
+        same question, then add this one to the index. Never raises.
+        """
+        if len((answer or "").strip()) < MIN_ANSWER_CHARS:
+            return []
+        try:
+            with span("similarity"):
+                vector = encode_texts([answer])[0]
+                matches = get_answer_index().check_and_add(question or "", vector, self.user_id, label)
+        except Exception:
+            metrics.inc("errors", stage="similarity")
+            return []
+        try:
+            # Keep the vector for later analyses (see io_manager/embedding_store.py)
+            answer_embedding_store(dim=len(vector)).append(self.user_id, [label], vector)
+        except Exception:
+            metrics.inc("errors", stage="embedding_store")
+
+        if matches:
+            self.similarity_flags.append({"label": label, "matches": [m._asdict() for m in matches]})
+            metrics.inc("similar_answers")
+            log_user_event(
+                self.user_id,
+                f"Similar answer flagged: {label}",
+                level=logging.WARNING,
+                label=label,
+                matches=[m._asdict() for m in matches],
+            )
+        return matches
+
     # -------------------------------------------------------------------
     def _next_label(self) -> str:
         """
@@ -111,7 +178,7 @@ class Judger:
         """
         Process one QnA pair:
           - compute sentiment score
-          - append a column with 4 rows: [Label, Question, Answer, Score]
+          - append a record [Label, Question, Answer, Score] to the answer log
           - increment counters and store locally
         Returns the sentiment score (float).
         """
@@ -126,20 +193,31 @@ class Judger:
             # determine label for this column (L1/L2/Q1..)
             label = self._next_label()
 
-            # Ensure rows length == 4: [label, question, answer, score]
-            rows = [label, question or "", answer or "", float(sentiment_score)]
-
-            # Append column (csvio.append_column pads/truncates as needed)
-            append_column(self.file_path, col_name=label if label else f"Col{self._col_counter+1}", rows=rows)
+            # Append one record (the CSV column is materialized later)
+            with span("report_io", op="append"):
+                self.backend.append_answer(
+                    self.user_id,
+                    label=label if label else f"Col{self._col_counter+1}",
+                    question=question or "",
+                    answer=answer or "",
+                    score=float(sentiment_score),
+                )
 
             # increment internal counter
             self._col_counter += 1
 
+            if self.similarity_check:
+                self._check_similarity(question, answer, label)
+
+            # queued; written by the background log listener
+            log_user_event(self.user_id, f"Answer recorded: {label}", label=label, score=float(sentiment_score))
+
             return float(sentiment_score)
         except Exception as e:
             import traceback
             print(f"Error in process_answer: {e}")
             traceback.print_exc()
+            log_user_event(self.user_id, f"Error in process_answer: {e}", level=logging.ERROR)
             return 0.0
 
     # -------------------------------------------------------------------
@@ -151,19 +229,28 @@ class Judger:
         """
         wage_q = self.questions.get("wage", ["Berapa ekspektasi gaji Anda? (angka)"])[0]
         label = "Wage_Expectation"
-        rows = [label, wage_q, str(wage_expectation), 0.0]
-        append_column(self.file_path, col_name=label, rows=rows)
+        self.backend.append_answer(self.user_id, label=label, question=wage_q, answer=str(wage_expectation), score=0.0)
         self._col_counter += 1
         # also store into metadata lists for completeness
         self.collected_answers.append(str(wage_expectation))
         self.scores.append(0.0)
 
     # -------------------------------------------------------------------
+    def _owner(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        (username, position) of the candidate this report belongs to:
+        the user stored under `user_id` as a username, else the
+        <user_id>.json user file (reports named by File_ID).
+        """
+        meta = self.backend.load_user(self.user_id) or load_json(Path(USERS_DIR) / f"{self.user_id}.json")
+        return meta.get("Username"), meta.get("Position")
+
     def finalize(self, months_experience: int, wage_expectation: int) -> Dict:
         """
         Triggered after all questions (16 + wage) are answered.
-        Computes final decision using DecisionEngine and appends a FINAL column
-        with a stringified summary.
+        Computes final decision using DecisionEngine, appends a FINAL record
+        with a stringified summary, materializes the CSV report and writes
+        the precomputed dashboard artifact.
 
         Returns the final_report dict.
         """
@@ -178,15 +265,23 @@ class Judger:
             # Use only first 16 question sentiment scores for decision (per design)
             question_scores = [float(x) for x in (self.scores[:16] if len(self.scores) >= 16 else self.scores)]
 
-            final_report = engine.judge(
-                question_scores=question_scores,
-                sentiment=avg_sentiment,
-                months_experience=months_experience,
-                wage_expectation=wage_expectation,
-            )
+            with span("decision"):
+                final_report = engine.judge(
+                    question_scores=question_scores,
+                    sentiment=avg_sentiment,
+                    months_experience=months_experience,
+                    wage_expectation=wage_expectation,
+                )
+            if self.similarity_flags:
+                final_report["similar_answers"] = [flag["label"] for flag in self.similarity_flags]
 
-            # append a FINAL column with the summary string (rows padded to 4)
-            append_column(self.file_path, col_name="FINAL", rows=["FINAL", "Summary", str(final_report), 0.0])
+            # append a FINAL record with the summary string
+            with span("report_io", op="finalize"):
+                self.backend.append_answer(self.user_id, label="FINAL", question="Summary", answer=str(final_report), score=0.0)
+                username, position = self._owner()
+                self.backend.save_decision(self.user_id, final_report, username=username, position=position)
+                self.materialize()
+                self.write_dashboard(final_report)
 
             return final_report
         except Exception as e:
@@ -198,4 +293,25 @@ class Judger:
                 "final_score": 0.0
             }
 
+    # -------------------------------------------------------------------
+    def write_dashboard(self, decision: Dict = None):
+        """
+        Store the dashboard artifact for this report; the dashboard falls
+        back to rebuilding it, so a failure here is only logged.
+        """
+        try:
+            builder = DashboardBuilder(self.user_id, self.use_stem, self.use_lemma, report_path=self.file_path)
+            return builder.write_artifact(decision=decision)
+        except Exception as e:
+            metrics.inc("errors", stage="dashboard")
+            log_user_event(self.user_id, f"Dashboard artifact not written: {e}", level=logging.WARNING)
+            return None
+
+    # -------------------------------------------------------------------
+    def materialize(self) -> Path:
+        """
+        Write the column-layout CSV report from the stored answers.
+        """
+        return self.backend.materialize_report(self.user_id, self.file_path)
+
 InterviewJudger = Judger
@@ -0,0 +1,230 @@
+# app/modules/QnA/model_registry.py
+"""
+Lazy, process-wide registry for the heavy NLP models.
+
+Nothing is loaded at import time. Each model is built by its loader on the
+first `get()` call and then shared by every caller in the process.
+
+- get(name)        : load on first use, return the shared instance
+- warm(*names)     : load eagerly (e.g. at worker start-up)
+- release(*names)  : drop instances so their memory can be reclaimed
+- release_idle(s)  : drop instances unused for more than `s` seconds
+
+The sentiment classifier and sentence encoder can be served by PyTorch
+(default) or ONNX Runtime (see onnx_backend.py), selected with
+`set_inference_backend()` or the environment:
+    HIREON_INFERENCE_BACKEND=torch|onnx|onnx-int8
+An unknown value in the environment logs a warning and keeps torch.
+"""
+
+import gc
+import os
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from ..logging.metrics import span
+
+# Model identifiers (also used as cache / index keys elsewhere)
+SENTIMENT_MODEL_ID = "w11wo/indonesian-roberta-base-sentiment-classifier"
+EMBEDDING_MODEL_ID = "paraphrase-multilingual-MiniLM-L12-v2"
+STEMMER_ID = "sastrawi"
+
+INFERENCE_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+class ModelRegistry:
+    """
+    Holds one instance per registered model name, built on demand.
+    Thread-safe: concurrent first calls load the model only once.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._last_used: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    # -------------------------------------------------------------------
+    def register(self, name: str, loader: Callable[[], Any]):
+        """
+        Register (or replace) the loader for `name`.
+        Replacing a loader drops any instance built by the old one.
+        """
+        with self._guard:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+            self._instances.pop(name, None)
+            self._last_used.pop(name, None)
+
+    # -------------------------------------------------------------------
+    def get(self, name: str) -> Any:
+        """
+        Return the shared instance for `name`, loading it on first use.
+        Raises KeyError for unknown names.
+        """
+        instance = self._instances.get(name)
+        if instance is None:
+            if name not in self._loaders:
+                raise KeyError(f"Unknown model: {name}")
+            with self._locks[name]:
+                instance = self._instances.get(name)
+                if instance is None:
+                    with span("model_load", model=name):
+                        instance = self._loaders[name]()
+                    self._instances[name] = instance
+        self._last_used[name] = time.monotonic()
+        return instance
+
+    # -------------------------------------------------------------------
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def warm(self, *names: str):
+        """
+        Load the given models (all registered models if none given).
+        """
+        for name in names or tuple(self._loaders):
+            self.get(name)
+
+    # -------------------------------------------------------------------
+    def release(self, *names: str):
+        """
+        Drop the given models (all loaded models if none given).
+        They will be reloaded on the next `get()`.
+        """
+        targets = names or tuple(self._instances)
+        for name in targets:
+            with self._locks.get(name, self._guard):
+                self._instances.pop(name, None)
+                self._last_used.pop(name, None)
+        gc.collect()
+
+    def release_idle(self, max_idle_seconds: float) -> list:
+        """
+        Release models not used for more than `max_idle_seconds`.
+        Returns the list of released names.
+        """
+        now = time.monotonic()
+        idle = [
+            name for name, last in list(self._last_used.items())
+            if now - last > max_idle_seconds
+        ]
+        if idle:
+            self.release(*idle)
+        return idle
+
+
+# -----------------------
+# Default loaders
+# -----------------------
+def _load_stemmer():
+    from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+    return StemmerFactory().create_stemmer()
+
+
+def _load_sentiment_pipeline():
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model=SENTIMENT_MODEL_ID)
+
+
+def _load_embedding_model():
+    # Using a multilingual model for Indonesian support
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL_ID)
+
+
+def _load_onnx_sentiment(quantized: bool):
+    from .onnx_backend import OnnxSentimentClassifier
+    return OnnxSentimentClassifier.load(quantized=quantized)
+
+
+def _load_onnx_encoder(quantized: bool):
+    from .onnx_backend import OnnxSentenceEncoder
+    return OnnxSentenceEncoder.load(quantized=quantized)
+
+
+registry = ModelRegistry()
+registry.register("stemmer", _load_stemmer)
+
+_inference_backend = "torch"
+
+
+def set_inference_backend(name: str):
+    """
+    Serve "sentiment" and "embedding" from `name` (torch, onnx, onnx-int8).
+    Already loaded instances are dropped and reloaded on next use.
+    """
+    global _inference_backend
+    if name not in INFERENCE_BACKENDS:
+        raise ValueError(f"Unknown inference backend: {name} (expected one of {INFERENCE_BACKENDS})")
+    if name == "torch":
+        registry.register("sentiment", _load_sentiment_pipeline)
+        registry.register("embedding", _load_embedding_model)
+    else:
+        quantized = name == "onnx-int8"
+        registry.register("sentiment", lambda: _load_onnx_sentiment(quantized))
+        registry.register("embedding", lambda: _load_onnx_encoder(quantized))
+    _inference_backend = name
+
+
+def get_inference_backend() -> str:
+    return _inference_backend
+
+
+def model_tag(model_id: str) -> str:
+    """
+    Model id qualified by the inference backend, for cache / index keys:
+    scores from a quantized model must not be mixed with PyTorch ones.
+    """
+    if _inference_backend == "torch":
+        return model_id
+    return f"{model_id}@{_inference_backend}"
+
+
+def _backend_from_env():
+    name = os.environ.get("HIREON_INFERENCE_BACKEND", "torch").lower()
+    try:
+        set_inference_backend(name)
+    except ValueError:
+        from ..logging.logger import get_logger
+
+        get_logger("model_registry").warning(
+            f"Ignoring HIREON_INFERENCE_BACKEND={name!r} (expected one of {INFERENCE_BACKENDS}); using torch"
+        )
+        set_inference_backend("torch")
+
+
+_backend_from_env()
+
+
+def get_model(name: str) -> Any:
+    """Shortcut for registry.get(name)."""
+    return registry.get(name)
+
+
+def warm_models(*names: str):
+    """Shortcut for registry.warm(*names)."""
+    registry.warm(*names)
+
+
+def release_models(*names: str):
+    """Shortcut for registry.release(*names)."""
+    registry.release(*names)
+
+
+__all__ = [
+    "ModelRegistry",
+    "registry",
+    "get_model",
+    "warm_models",
+    "release_models",
+    "set_inference_backend",
+    "get_inference_backend",
+    "model_tag",
+    "INFERENCE_BACKENDS",
+    "SENTIMENT_MODEL_ID",
+    "EMBEDDING_MODEL_ID",
+    "STEMMER_ID",
+]
@@ -0,0 +1,346 @@
+# app/modules/QnA/model_server.py
+"""
+Local model server shared by all Streamlit workers on a node.
+
+One process owns the sentiment classifier and the sentence encoder and
+listens on a Unix socket. Concurrent requests from the workers are
+coalesced into micro-batches: a batch is flushed when it holds
+`max_batch` texts or when the oldest request has waited `max_wait_ms`.
+
+Workers opt in with the environment; text_mining then routes its model
+calls through `ModelClient` and never loads the models itself:
+
+    python -m app.modules.QnA.model_server --socket /tmp/hireon-models.sock
+    HIREON_MODEL_SERVER=/tmp/hireon-models.sock streamlit run main.py
+
+Wire format: 4-byte big-endian length + UTF-8 JSON, one request/response
+pair at a time per connection:
+    {"op": "sentiment", "texts": [...]}                 -> {"ok": true, "result": [...]}
+    {"op": "relevance", "answers": [...], "questions": [...]}
+    {"op": "encode", "texts": [...]}                    -> one float list per text
+    {"op": "ping"}
+A batch whose inference failed is answered with {"ok": false, "error": ...};
+the client raises ModelServerError and text_mining runs the model
+in-process instead, so a failure is never cached as a score.
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_SOCKET = "/tmp/hireon-models.sock"
+MAX_BATCH = 64
+MAX_WAIT_MS = 10.0
+
+_HEADER = struct.Struct(">I")
+
+
+class ModelServerError(RuntimeError):
+    """The server answered, but could not run the request."""
+
+
+# ---------------------------------------------------------------------
+# Framing
+# ---------------------------------------------------------------------
+def _send(sock: socket.socket, payload: Dict):
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> Optional[bytes]:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def _recv(sock: socket.socket) -> Optional[Dict]:
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    body = _recv_exact(sock, _HEADER.unpack(header)[0])
+    if body is None:
+        return None
+    return json.loads(body.decode("utf-8"))
+
+
+# ---------------------------------------------------------------------
+# Micro-batching
+# ---------------------------------------------------------------------
+class MicroBatcher:
+    """
+    Coalesces concurrent submit() calls into one call of `fn(items)`.
+    `fn` maps a list of items to a list of results of the same length.
+    """
+
+    def __init__(self, fn: Callable[[List], List], max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, items: List) -> Future:
+        future: Future = Future()
+        if not items:
+            future.set_result([])
+        else:
+            self._queue.put((list(items), future))
+        return future
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            pending = [first]
+            size = len(first[0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                pending.append(nxt)
+                size += len(nxt[0])
+            self._flush(pending)
+
+    def _flush(self, pending):
+        items = [item for batch, _ in pending for item in batch]
+        try:
+            results = self.fn(items)
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        start = 0
+        for batch, future in pending:
+            future.set_result(results[start:start + len(batch)])
+            start += len(batch)
+
+
+# ---------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                request = _recv(self.request)
+            except (OSError, ValueError):
+                return
+            if request is None:
+                return
+            try:
+                result = self.server.dispatch(request)
+                response = {"ok": True, "result": result}
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            try:
+                _send(self.request, response)
+            except OSError:
+                return
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix-socket server with one MicroBatcher per operation.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128  # one connection per worker thread
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        from .text_mining import analyze_sentiment_batch, calculate_relevance_batch, encode_texts
+
+        # This process serves the models; it must never route to itself
+        disable_client()
+
+        self.socket_path = str(socket_path)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.batchers = {
+            "sentiment": MicroBatcher(
+                lambda texts: analyze_sentiment_batch(texts, batch_size=max_batch, strict=True),
+                max_batch, max_wait_ms,
+            ),
+            "relevance": MicroBatcher(
+                lambda pairs: calculate_relevance_batch([a for a, _ in pairs], [q for _, q in pairs]),
+                max_batch, max_wait_ms,
+            ),
+            "encode": MicroBatcher(
+                lambda texts: encode_texts(texts, batch_size=max_batch).tolist(),
+                max_batch, max_wait_ms,
+            ),
+        }
+        super().__init__(self.socket_path, _Handler)
+
+    def dispatch(self, request: Dict):
+        op = request.get("op")
+        if op == "ping":
+            return "pong"
+        if op == "sentiment":
+            return self.batchers["sentiment"].submit(request["texts"]).result()
+        if op == "relevance":
+            pairs = list(zip(request["answers"], request["questions"]))
+            return self.batchers["relevance"].submit(pairs).result()
+        if op == "encode":
+            return self.batchers["encode"].submit(request["texts"]).result()
+        raise ValueError(f"Unknown op: {op}")
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def serve(socket_path: str = DEFAULT_SOCKET, max_batch: int = MAX_BATCH,
+          max_wait_ms: float = MAX_WAIT_MS, warm: bool = True):
+    """
+    Run the model server until interrupted.
+    """
+    from .model_registry import warm_models
+    from ..logging.logger import get_logger
+
+    logger = get_logger("model_server")
+    if warm:
+        warm_models("sentiment", "embedding")
+    with ModelServer(socket_path, max_batch, max_wait_ms) as server:
+        logger.info(f"Model server listening on {socket_path} (max_batch={max_batch}, max_wait_ms={max_wait_ms})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Model server stopped")
+
+
+# ---------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------
+class ModelClient:
+    """
+    Blocking client; one connection per thread, reconnected on failure.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, timeout: float = 60.0):
+        self.socket_path = str(socket_path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+    def _call(self, payload: Dict):
+        for attempt in (1, 2):
+            sock = getattr(self._local, "sock", None)
+            try:
+                if sock is None:
+                    sock = self._local.sock = self._connect()
+                _send(sock, payload)
+                response = _recv(sock)
+                if response is None:
+                    raise ConnectionError("model server closed the connection")
+                break
+            except OSError:
+                self.close()
+                if attempt == 2:
+                    raise
+        if not response.get("ok"):
+            raise ModelServerError(response.get("error", "model server error"))
+        return response["result"]
+
+    def ping(self) -> bool:
+        return self._call({"op": "ping"}) == "pong"
+
+    def sentiment(self, texts: List[str]) -> List[float]:
+        return [float(x) for x in self._call({"op": "sentiment", "texts": list(texts)})]
+
+    def relevance(self, answers: List[str], questions: List[str]) -> List[float]:
+        return [float(x) for x in self._call({"op": "relevance", "answers": list(answers), "questions": list(questions)})]
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self._call({"op": "encode", "texts": list(texts)}), dtype=np.float32)
+
+    def close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+            self._local.sock = None
+
+
+_client: Optional[ModelClient] = None
+_client_disabled = False
+_client_lock = threading.Lock()
+
+
+def get_model_client() -> Optional[ModelClient]:
+    """
+    Client for the server named by HIREON_MODEL_SERVER, or None when the
+    models should be run in-process.
+    """
+    global _client
+    if _client_disabled:
+        return None
+    socket_path = os.environ.get("HIREON_MODEL_SERVER")
+    if not socket_path:
+        return None
+    if _client is None or _client.socket_path != socket_path:
+        with _client_lock:
+            if _client is None or _client.socket_path != socket_path:
+                _client = ModelClient(socket_path)
+    return _client
+
+
+def disable_client():
+    """Always run models in-process (used by the server itself)."""
+    global _client_disabled
+    _client_disabled = True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the NLP models over a local Unix socket.")
+    parser.add_argument("--socket", default=os.environ.get("HIREON_MODEL_SERVER", DEFAULT_SOCKET))
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="texts per micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS, help="max time a request waits for a batch")
+    parser.add_argument("--no-warm", action="store_true", help="load models on first request")
+    args = parser.parse_args(argv)
+
+    Path(args.socket).parent.mkdir(parents=True, exist_ok=True)
+    serve(args.socket, args.max_batch, args.max_wait_ms, warm=not args.no_warm)
+
+
+__all__ = [
+    "ModelServer",
+    "ModelClient",
+    "ModelServerError",
+    "MicroBatcher",
+    "serve",
+    "get_model_client",
+    "disable_client",
+    "DEFAULT_SOCKET",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+# app/modules/QnA/onnx_backend.py
+"""
+ONNX Runtime inference for the sentiment classifier and sentence encoder.
+
+Both models are exported once from their PyTorch checkpoints, optionally
+int8 dynamic-quantized, and served without torch in the process:
+
+    app/data/models/onnx/sentiment/model.onnx        (+ model.int8.onnx)
+    app/data/models/onnx/embedding/model.onnx        (+ model.int8.onnx)
+
+Each directory also holds the tokenizer files and an `onnx_config.json`.
+The runtime classes mimic the objects text_mining already calls
+(`pipeline(texts, batch_size=..., truncation=True)` and
+`SentenceTransformer.encode(...)`), so the registry can swap them in:
+
+    HIREON_INFERENCE_BACKEND=onnx-int8 streamlit run main.py
+
+Usage:
+    python -m app.modules.QnA.onnx_backend export [--no-quantize]
+    python -m app.modules.QnA.onnx_backend parity [--backend onnx-int8] [--limit 100]
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .model_registry import SENTIMENT_MODEL_ID, EMBEDDING_MODEL_ID
+from ..io_manager.storage_paths import DATA_ROOT
+
+ONNX_DIR = DATA_ROOT / "models" / "onnx"
+MODEL_FILE = "model.onnx"
+QUANTIZED_FILE = "model.int8.onnx"
+CONFIG_FILE = "onnx_config.json"
+OPSET = 17
+
+
+# ---------------------------------------------------------------------
+# Export (needs torch / transformers / sentence-transformers)
+# ---------------------------------------------------------------------
+def _export(module, sample: Dict, out_path: Path, output_name: str, opset: int):
+    import torch
+
+    input_names = list(sample)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes[output_name] = {0: "batch"}
+    with torch.no_grad():
+        torch.onnx.export(
+            module,
+            tuple(sample[name] for name in input_names),
+            str(out_path),
+            input_names=input_names,
+            output_names=[output_name],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+
+
+def export_sentiment(out_dir: Path = ONNX_DIR / "sentiment", opset: int = OPSET) -> Path:
+    """
+    Export the sentiment classifier (logits output) to ONNX.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL_ID)
+    model = AutoModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL_ID).eval()
+
+    class Logits(torch.nn.Module):
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, input_ids, attention_mask):
+            return self.inner(input_ids=input_ids, attention_mask=attention_mask).logits
+
+    sample = tokenizer(["contoh jawaban kandidat"], return_tensors="pt")
+    sample = {"input_ids": sample["input_ids"], "attention_mask": sample["attention_mask"]}
+    _export(Logits(model), sample, out_dir / MODEL_FILE, "logits", opset)
+
+    tokenizer.save_pretrained(out_dir)
+    config = {
+        "model_id": SENTIMENT_MODEL_ID,
+        "max_length": int(min(tokenizer.model_max_length, 512)),
+        "id2label": {str(k): v for k, v in model.config.id2label.items()},
+    }
+    (out_dir / CONFIG_FILE).write_text(json.dumps(config, indent=2), encoding="utf-8")
+    return out_dir / MODEL_FILE
+
+
+def export_encoder(out_dir: Path = ONNX_DIR / "embedding", opset: int = OPSET) -> Path:
+    """
+    Export the sentence encoder's transformer (token embeddings output);
+    mean pooling is done in NumPy at inference time.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    st_model = SentenceTransformer(EMBEDDING_MODEL_ID, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    class TokenEmbeddings(torch.nn.Module):
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, input_ids, attention_mask):
+            return self.inner(input_ids=input_ids, attention_mask=attention_mask)[0]
+
+    sample = tokenizer(["contoh jawaban kandidat"], return_tensors="pt")
+    sample = {"input_ids": sample["input_ids"], "attention_mask": sample["attention_mask"]}
+    _export(TokenEmbeddings(transformer), sample, out_dir / MODEL_FILE, "token_embeddings", opset)
+
+    tokenizer.save_pretrained(out_dir)
+    config = {
+        "model_id": EMBEDDING_MODEL_ID,
+        "max_length": int(st_model.max_seq_length),
+        "pooling": "mean",
+    }
+    (out_dir / CONFIG_FILE).write_text(json.dumps(config, indent=2), encoding="utf-8")
+    return out_dir / MODEL_FILE
+
+
+def quantize_model(model_path: Path) -> Path:
+    """
+    Write an int8 dynamic-quantized copy next to `model_path`.
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    model_path = Path(model_path)
+    out_path = model_path.with_name(QUANTIZED_FILE)
+    quantize_dynamic(str(model_path), str(out_path), weight_type=QuantType.QInt8)
+    return out_path
+
+
+def export_models(out_dir: Path = ONNX_DIR, quantize: bool = True, opset: int = OPSET) -> List[Path]:
+    """
+    Export both models (and their int8 variants). Returns written model paths.
+    """
+    out_dir = Path(out_dir)
+    written = [
+        export_sentiment(out_dir / "sentiment", opset),
+        export_encoder(out_dir / "embedding", opset),
+    ]
+    if quantize:
+        written += [quantize_model(path) for path in list(written)]
+    return written
+
+
+# ---------------------------------------------------------------------
+# Runtime (onnxruntime + tokenizer only, no torch)
+# ---------------------------------------------------------------------
+def _session(model_path: Path):
+    import onnxruntime as ort
+
+    opts = ort.SessionOptions()
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    threads = int(os.environ.get("HIREON_ORT_THREADS", "0") or 0)
+    if threads > 0:
+        opts.intra_op_num_threads = threads
+    return ort.InferenceSession(str(model_path), opts, providers=["CPUExecutionProvider"])
+
+
+class _OnnxModel:
+    """
+    Shared loading + length-bucketed batching for the exported models.
+    """
+
+    subdir = ""
+
+    def __init__(self, model_dir: Path, quantized: bool = True, tokenizer=None):
+        self.model_dir = Path(model_dir)
+        model_path = self.model_dir / (QUANTIZED_FILE if quantized else MODEL_FILE)
+        if not model_path.exists():
+            raise FileNotFoundError(
+                f"{model_path} not found; run `python -m app.modules.QnA.onnx_backend export`"
+            )
+        self.quantized = quantized
+        self.config = json.loads((self.model_dir / CONFIG_FILE).read_text(encoding="utf-8"))
+        self.max_length = int(self.config.get("max_length", 512))
+        if tokenizer is None:
+            from transformers import AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+        self.tokenizer = tokenizer
+        self.session = _session(model_path)
+        self._input_names = [i.name for i in self.session.get_inputs()]
+
+    @classmethod
+    def load(cls, root: Path = ONNX_DIR, quantized: bool = True):
+        return cls(Path(root) / cls.subdir, quantized=quantized)
+
+    def _run_batches(self, texts: List[str], batch_size: int, truncation: bool = True):
+        """
+        Yield (positions, encoded, output) per batch. Texts are sorted by
+        length first so each batch is padded to a similar length.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), batch_size):
+            positions = order[start:start + batch_size]
+            encoded = self.tokenizer(
+                [texts[i] for i in positions],
+                padding=True,
+                truncation=truncation,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            feed = {name: encoded[name].astype(np.int64) for name in self._input_names}
+            yield positions, encoded, self.session.run(None, feed)[0]
+
+
+class OnnxSentimentClassifier(_OnnxModel):
+    """
+    Drop-in for the transformers sentiment pipeline:
+    returns [{"label": ..., "score": ...}, ...].
+    """
+
+    subdir = "sentiment"
+
+    def __init__(self, model_dir: Path, quantized: bool = True, tokenizer=None):
+        super().__init__(model_dir, quantized, tokenizer)
+        self.id2label = {int(k): v for k, v in self.config["id2label"].items()}
+
+    def __call__(self, texts, batch_size: int = 32, truncation: bool = True, **kwargs) -> List[Dict]:
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        results: List[Optional[Dict]] = [None] * len(texts)
+        for positions, _, logits in self._run_batches(texts, batch_size, truncation):
+            logits = logits - logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            best = probs.argmax(axis=1)
+            for pos, label_id, row in zip(positions, best, probs):
+                results[pos] = {"label": self.id2label[int(label_id)], "score": float(row[label_id])}
+        return results
+
+
+class OnnxSentenceEncoder(_OnnxModel):
+    """
+    Drop-in for SentenceTransformer.encode (mean pooling).
+    """
+
+    subdir = "embedding"
+
+    def encode(self, texts, batch_size: int = 64, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        out = None
+        for positions, encoded, token_embeddings in self._run_batches(texts, batch_size):
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if out is None:
+                out = np.zeros((len(texts), pooled.shape[1]), dtype=np.float32)
+            out[positions] = pooled
+        if out is None:
+            out = np.zeros((0, 0), dtype=np.float32)
+        if normalize_embeddings and len(out):
+            out /= np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+        return out[0] if single else out
+
+
+# ---------------------------------------------------------------------
+# Parity check against PyTorch
+# ---------------------------------------------------------------------
+def parity_check(backend: str = "onnx-int8", texts: Optional[List[str]] = None,
+                 limit: Optional[int] = None, root: Path = ONNX_DIR) -> Dict:
+    """
+    Score the same texts with PyTorch and ONNX and report the drift:
+    sentiment scores, label agreement, embedding cosine, and relevance of
+    consecutive text pairs. Also reports wall time per backend.
+    """
+    from .model_registry import _load_embedding_model, _load_sentiment_pipeline
+    from .question_index import iter_question_texts
+    from .text_mining import _label_to_score
+
+    if backend not in ("onnx", "onnx-int8"):
+        raise ValueError(f"Parity is checked for onnx / onnx-int8, not {backend}")
+    quantized = backend == "onnx-int8"
+    texts = list(texts) if texts is not None else iter_question_texts()
+    if limit:
+        texts = texts[:limit]
+    if len(texts) < 2:
+        raise ValueError("Parity check needs at least two texts")
+
+    def run(classifier, encoder):
+        start = time.perf_counter()
+        labels = classifier(texts, batch_size=32, truncation=True)
+        emb = np.asarray(encoder.encode(texts, batch_size=64, normalize_embeddings=True), dtype=np.float32)
+        return labels, emb, time.perf_counter() - start
+
+    torch_labels, torch_emb, torch_s = run(_load_sentiment_pipeline(), _load_embedding_model())
+    onnx_labels, onnx_emb, onnx_s = run(
+        OnnxSentimentClassifier.load(root, quantized),
+        OnnxSentenceEncoder.load(root, quantized),
+    )
+
+    sent_drift = np.abs(
+        np.array([_label_to_score(r) for r in torch_labels]) - np.array([_label_to_score(r) for r in onnx_labels])
+    )
+    agreement = np.mean([a["label"] == b["label"] for a, b in zip(torch_labels, onnx_labels)])
+    cosine = np.einsum("ij,ij->i", torch_emb, onnx_emb)
+    rel_torch = np.einsum("ij,ij->i", torch_emb[:-1], torch_emb[1:])
+    rel_onnx = np.einsum("ij,ij->i", onnx_emb[:-1], onnx_emb[1:])
+    rel_drift = np.abs(rel_torch - rel_onnx)
+
+    return {
+        "backend": backend,
+        "n_texts": len(texts),
+        "sentiment_max_drift": round(float(sent_drift.max()), 4),
+        "sentiment_mean_drift": round(float(sent_drift.mean()), 4),
+        "label_agreement": round(float(agreement), 4),
+        "embedding_min_cosine": round(float(cosine.min()), 4),
+        "relevance_max_drift": round(float(rel_drift.max()), 4),
+        "relevance_mean_drift": round(float(rel_drift.mean()), 4),
+        "torch_seconds": round(torch_s, 3),
+        "onnx_seconds": round(onnx_s, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ONNX Runtime inference backend tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_export = sub.add_parser("export", help="export both models to ONNX")
+    p_export.add_argument("--out", type=Path, default=ONNX_DIR)
+    p_export.add_argument("--no-quantize", action="store_true", help="skip the int8 variants")
+    p_export.add_argument("--opset", type=int, default=OPSET)
+
+    p_parity = sub.add_parser("parity", help="compare ONNX scores with PyTorch")
+    p_parity.add_argument("--backend", choices=("onnx", "onnx-int8"), default="onnx-int8")
+    p_parity.add_argument("--limit", type=int, default=None, help="number of question-bank texts")
+    p_parity.add_argument("--root", type=Path, default=ONNX_DIR)
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        for path in export_models(args.out, quantize=not args.no_quantize, opset=args.opset):
+            print(f"Wrote {path}")
+    else:
+        print(json.dumps(parity_check(args.backend, limit=args.limit, root=args.root), indent=2))
+
+
+__all__ = [
+    "OnnxSentimentClassifier",
+    "OnnxSentenceEncoder",
+    "export_models",
+    "export_sentiment",
+    "export_encoder",
+    "quantize_model",
+    "parity_check",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# app/modules/QnA/preprocessing.py
+"""
+Token preprocessors shared by the judger, dashboard and analytics.
+
+Every preprocessor exposes `process(text) -> List[str]`:
+
+- Tokenizer  : lowercase word tokens, one precompiled regex pass
+- Stemmer    : Sastrawi stems, memoized per word in `stem_cache`
+- Lemmatizer : NLTK WordNet lemmas (identity if WordNet is not installed)
+
+Sastrawi stemming is dictionary + regex work and the same words repeat
+across answers and candidates, so stems go through a bounded, process-wide
+LRU (`stem_cache`). It is loaded from app/data/temp/stem_cache.json on
+first use and written back at exit.
+"""
+
+import atexit
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .model_registry import registry
+from ..io_manager.storage_paths import TEMP_DIR
+
+TOKEN_RE = re.compile(r"\w+")
+STEM_CACHE_PATH = TEMP_DIR / "stem_cache.json"
+STEM_CACHE_SIZE = 50_000
+
+
+def iter_tokens(texts: Iterable[str]) -> Iterator[str]:
+    """
+    Stream lowercase tokens from many texts without joining them.
+    """
+    for text in texts:
+        if text is None:
+            continue
+        for match in TOKEN_RE.finditer(str(text).lower()):
+            yield match.group()
+
+
+class Tokenizer:
+    """
+    Lowercase word tokenizer (`\\w+`, Unicode aware).
+    """
+
+    def process(self, text: str) -> List[str]:
+        return TOKEN_RE.findall(str(text).lower()) if text is not None else []
+
+
+# ---------------------------------------------------------------------
+# Stem cache
+# ---------------------------------------------------------------------
+class StemCache:
+    """
+    Bounded LRU of word -> stem in front of the Sastrawi stemmer.
+    """
+
+    def __init__(self, max_entries: int = STEM_CACHE_SIZE, path: Optional[Path] = STEM_CACHE_PATH):
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def stem(self, word: str) -> str:
+        if not self._loaded:
+            self.load()
+        with self._lock:
+            stem = self._entries.get(word)
+            if stem is not None:
+                self._entries.move_to_end(word)
+                self.hits += 1
+                return stem
+            self.misses += 1
+        stem = registry.get("stemmer").stem(word)
+        with self._lock:
+            self._entries[word] = stem
+            self._dirty = True
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return stem
+
+    # -------------------------------------------------------------------
+    def load(self, path: Optional[Path] = None):
+        """
+        Merge stems saved by an earlier process (missing file is fine).
+        """
+        path = Path(path) if path else self.path
+        self._loaded = True
+        if path is None:
+            return
+        try:
+            saved = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            for word, stem in list(saved.items())[-self.max_entries:]:
+                self._entries.setdefault(word, stem)
+
+    def save(self, path: Optional[Path] = None):
+        """
+        Write the cache atomically (most recently used last).
+        """
+        path = Path(path) if path else self.path
+        if path is None:
+            return
+        with self._lock:
+            data = dict(self._entries)
+            self._dirty = False
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass  # persistence is best-effort
+
+    def _save_if_dirty(self):
+        if self._dirty:
+            self.save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+            }
+
+
+stem_cache = StemCache()
+atexit.register(stem_cache._save_if_dirty)
+
+
+class Stemmer:
+    """
+    Sastrawi stemmer over Tokenizer tokens, memoized per word.
+    """
+
+    def __init__(self, cache: StemCache = None):
+        self.cache = cache or stem_cache
+
+    def process(self, text: str) -> List[str]:
+        return [self.cache.stem(t) for t in Tokenizer().process(text)]
+
+
+# ---------------------------------------------------------------------
+# Lemmatizer
+# ---------------------------------------------------------------------
+@lru_cache(maxsize=1)
+def _wordnet():
+    from nltk.stem import WordNetLemmatizer
+    lemmatizer = WordNetLemmatizer()
+    try:
+        lemmatizer.lemmatize("tests")
+    except LookupError:
+        return None  # WordNet corpus not downloaded
+    return lemmatizer
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def _lemma(word: str) -> str:
+    lemmatizer = _wordnet()
+    return lemmatizer.lemmatize(word) if lemmatizer else word
+
+
+class Lemmatizer:
+    """
+    WordNet lemmatizer over Tokenizer tokens, memoized per word.
+    """
+
+    def process(self, text: str) -> List[str]:
+        return [_lemma(t) for t in Tokenizer().process(text)]
+
+
+__all__ = [
+    "Tokenizer",
+    "Stemmer",
+    "Lemmatizer",
+    "StemCache",
+    "stem_cache",
+    "iter_tokens",
+]
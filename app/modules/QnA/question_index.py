@@ -0,0 +1,181 @@
+# app/modules/QnA/question_index.py
+"""
+Precomputed embedding index for the fixed question bank.
+
+Every question (leveling + 5 positions x 3 levels x 16 + wage) is embedded
+once by `build_question_index()` and stored as a float32 `.npy` matrix,
+named after a content hash of the question texts and the encoder id:
+
+    app/data/temp/question_index/<hash>.npy    (n_questions, dim), normalized
+    app/data/temp/question_index/<hash>.json   question texts, row order
+
+At runtime the matrix is memory-mapped, so relevance scoring only has to
+encode the answer. Editing the question bank changes the hash; the old
+index is then ignored until rebuilt.
+
+Build it with:
+    python -m app.modules.QnA.question_index
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .questions import QUESTION_BANK, LEVELING_QUESTIONS, WAGE_QUESTION
+from .model_registry import EMBEDDING_MODEL_ID, model_tag
+from ..io_manager.storage_paths import TEMP_DIR
+
+INDEX_DIR = TEMP_DIR / "question_index"
+
+
+def iter_question_texts() -> List[str]:
+    """
+    All distinct questions in the bank, in a stable order.
+    """
+    texts = list(LEVELING_QUESTIONS)
+    for levels in QUESTION_BANK.values():
+        for questions in levels.values():
+            texts.extend(questions)
+    texts.append(WAGE_QUESTION)
+    return list(dict.fromkeys(t.strip() for t in texts))
+
+
+def question_bank_hash(texts: Optional[List[str]] = None, model_id: Optional[str] = None) -> str:
+    """
+    Content hash of the question texts + encoder id (16 hex chars).
+    The encoder id includes the inference backend (see model_tag).
+    """
+    texts = iter_question_texts() if texts is None else texts
+    model_id = model_tag(EMBEDDING_MODEL_ID) if model_id is None else model_id
+    h = hashlib.sha256(model_id.encode("utf-8"))
+    for t in texts:
+        h.update(b"\x00")
+        h.update(t.encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+class QuestionIndex:
+    """
+    Read-only view over a built index: question text -> embedding row.
+    """
+
+    def __init__(self, vectors: np.ndarray, texts: List[str]):
+        self.vectors = vectors
+        self.texts = texts
+        self._rows: Dict[str, int] = {t: i for i, t in enumerate(texts)}
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __contains__(self, question: str) -> bool:
+        return str(question).strip() in self._rows
+
+    def lookup(self, question: str) -> Optional[np.ndarray]:
+        """
+        Return the normalized embedding of `question`, or None if the
+        question is not part of the bank.
+        """
+        row = self._rows.get(str(question).strip())
+        if row is None:
+            return None
+        return self.vectors[row]
+
+    @classmethod
+    def load(cls, index_dir: Optional[Path] = None) -> Optional["QuestionIndex"]:
+        """
+        Memory-map the index matching the current question bank
+        (under INDEX_DIR by default). Returns None if it has not been
+        built yet.
+        """
+        index_dir = INDEX_DIR if index_dir is None else index_dir
+        key = question_bank_hash()
+        vec_path = Path(index_dir) / f"{key}.npy"
+        txt_path = Path(index_dir) / f"{key}.json"
+        if not vec_path.exists() or not txt_path.exists():
+            return None
+        try:
+            texts = json.loads(txt_path.read_text(encoding="utf-8"))
+            vectors = np.load(vec_path, mmap_mode="r")
+        except Exception:
+            return None
+        if vectors.shape[0] != len(texts):
+            return None
+        return cls(vectors, texts)
+
+
+def build_question_index(index_dir: Optional[Path] = None, force: bool = False) -> Path:
+    """
+    Embed every question in the bank and write the index files.
+    Skips the work if an index for the current hash already exists,
+    unless `force` is set. Returns the path of the `.npy` file.
+    """
+    from .text_mining import encode_texts
+
+    global _cached_index
+
+    index_dir = Path(INDEX_DIR if index_dir is None else index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    texts = iter_question_texts()
+    key = question_bank_hash(texts)
+    vec_path = index_dir / f"{key}.npy"
+    txt_path = index_dir / f"{key}.json"
+
+    if vec_path.exists() and txt_path.exists() and not force:
+        return vec_path
+
+    vectors = encode_texts(texts)
+
+    # Write to temp files first so readers never see a partial index
+    tmp_vec = index_dir / f".{key}.npy.tmp"
+    with tmp_vec.open("wb") as f:
+        np.save(f, vectors)
+    tmp_txt = index_dir / f".{key}.json.tmp"
+    tmp_txt.write_text(json.dumps(texts, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_vec, vec_path)
+    os.replace(tmp_txt, txt_path)
+
+    # Drop indexes of older question banks
+    for old in index_dir.glob("*.npy"):
+        if old.stem != key:
+            old.unlink(missing_ok=True)
+            (index_dir / f"{old.stem}.json").unlink(missing_ok=True)
+
+    _cached_index = _UNLOADED
+    return vec_path
+
+
+_UNLOADED = object()
+_cached_index = _UNLOADED
+_cached_tag = None
+
+
+def get_question_index() -> Optional[QuestionIndex]:
+    """
+    Process-wide QuestionIndex (memory-mapped once), or None if not built.
+    Reloaded when the inference backend changes.
+    """
+    global _cached_index, _cached_tag
+    tag = model_tag(EMBEDDING_MODEL_ID)
+    if _cached_index is _UNLOADED or tag != _cached_tag:
+        _cached_index = QuestionIndex.load()
+        _cached_tag = tag
+    return _cached_index
+
+
+__all__ = [
+    "QuestionIndex",
+    "build_question_index",
+    "get_question_index",
+    "iter_question_texts",
+    "question_bank_hash",
+]
+
+
+if __name__ == "__main__":
+    path = build_question_index(force=True)
+    print(f"Question index written to {path} ({len(iter_question_texts())} questions)")
@@ -380,6 +380,22 @@ def get_all_questions(position: str, level: str) -> List[str]:
     return questions
 
 
+def load_questions(position: str = None) -> Dict[str, List[str]]:
+    """
+    Get the question set grouped by stage:
+    leveling, beginner, intermediate, advanced, wage.
+    Uses the first position in the bank when none is given.
+    """
+    position = position or next(iter(QUESTION_BANK))
+    if position not in QUESTION_BANK:
+        raise ValueError(f"Unknown position: {position}")
+    return {
+        "leveling": LEVELING_QUESTIONS.copy(),
+        **{level: list(qs) for level, qs in QUESTION_BANK[position].items()},
+        "wage": [WAGE_QUESTION],
+    }
+
+
 def get_job_positions() -> Dict:
     """Get all job positions with wage info."""
     return JOB_POSITIONS
@@ -399,6 +415,7 @@ __all__ = [
     "get_leveling_questions",
     "get_wage_question",
     "get_all_questions",
+    "load_questions",
     "get_job_positions",
     "determine_level",
     ]
@@ -0,0 +1,163 @@
+# app/modules/QnA/score_cache.py
+"""
+Content-addressed cache for answer scoring results.
+
+Keys are a SHA-256 over the kind of result ("sentiment", "relevance",
+"keywords"), the model identifiers involved and the normalized input
+texts, so identical (boilerplate) answers are scored only once.
+
+Two tiers:
+- in-process LRU (always on, bounded by `max_entries`)
+- optional on-disk JSON tier under app/data/temp/score_cache,
+  shared between processes and restarts (`enable_disk()`)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from ..io_manager.storage_paths import TEMP_DIR
+from ..logging.metrics import metrics
+
+CACHE_DIR = TEMP_DIR / "score_cache"
+DEFAULT_MAX_ENTRIES = 4096
+
+MISSING = object()
+
+
+def normalize_text(text) -> str:
+    """
+    Canonical form used for keys: NFKC, whitespace collapsed, stripped.
+    """
+    text = unicodedata.normalize("NFKC", "" if text is None else str(text))
+    return " ".join(text.split())
+
+
+def make_key(kind: str, texts: Iterable, model_ids: Iterable[str] = ()) -> str:
+    """
+    Build the cache key for `kind` over `texts` scored by `model_ids`.
+    """
+    h = hashlib.sha256(kind.encode("utf-8"))
+    for model_id in model_ids:
+        h.update(b"\x01")
+        h.update(str(model_id).encode("utf-8"))
+    for text in texts:
+        h.update(b"\x00")
+        h.update(normalize_text(text).encode("utf-8"))
+    return h.hexdigest()
+
+
+class ScoreCache:
+    """
+    LRU cache with an optional disk tier and hit/miss counters.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, disk_dir: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # -------------------------------------------------------------------
+    def enable_disk(self, disk_dir: Path = CACHE_DIR):
+        self.disk_dir = Path(disk_dir)
+        self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    def disable_disk(self):
+        self.disk_dir = None
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    # -------------------------------------------------------------------
+    def get(self, key: str) -> Any:
+        """
+        Return the cached value or `MISSING`.
+        """
+        with self._lock:
+            value = self._entries.get(key, MISSING)
+            if value is not MISSING:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if value is not MISSING:
+            metrics.inc("cache_hits", cache="score", tier="memory")
+            return value
+
+        if self.disk_dir is not None:
+            try:
+                value = json.loads(self._disk_path(key).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                value = MISSING
+            if value is not MISSING:
+                self._remember(key, value)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                metrics.inc("cache_hits", cache="score", tier="disk")
+                return value
+
+        with self._lock:
+            self.misses += 1
+        metrics.inc("cache_misses", cache="score")
+        return MISSING
+
+    def put(self, key: str, value: Any):
+        self._remember(key, value)
+        if self.disk_dir is not None:
+            path = self._disk_path(key)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp, path)
+            except OSError:
+                pass  # disk tier is best-effort
+
+    def _remember(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # -------------------------------------------------------------------
+    def clear(self):
+        """Drop the in-process tier and reset counters (disk is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk": str(self.disk_dir) if self.disk_dir else None,
+            }
+
+
+# Process-wide cache used by text_mining
+score_cache = ScoreCache()
+
+
+__all__ = [
+    "ScoreCache",
+    "score_cache",
+    "make_key",
+    "normalize_text",
+    "MISSING",
+    "CACHE_DIR",
+]
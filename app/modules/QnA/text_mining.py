@@ -1,34 +1,149 @@
 # app/modules/nlp_engine.py
 import math
 import numpy as np
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
-from transformers import pipeline
 
-# Initialize models (Cached to prevent reloading)
-stemmer = StemmerFactory().create_stemmer()
-sentiment_pipeline = pipeline("sentiment-analysis", model="w11wo/indonesian-roberta-base-sentiment-classifier")
-# Using a multilingual model for Indonesian support
-embedding_model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+from .model_registry import (
+    registry,
+    warm_models,
+    release_models,
+    model_tag,
+    SENTIMENT_MODEL_ID,
+    EMBEDDING_MODEL_ID,
+    STEMMER_ID,
+)
+from .question_index import get_question_index
+from .model_server import get_model_client, ModelServerError
+from .score_cache import score_cache, make_key, MISSING
+from .preprocessing import Tokenizer, Stemmer, Lemmatizer, iter_tokens, stem_cache
+from .behavioral import BehavioralSentiment, behavioral_analyze
+from ..io_manager.embedding_store import open_embedding_store
+from ..logging.metrics import metrics, span
+
+# Models are loaded lazily through the registry (see model_registry.py);
+# importing this module no longer pulls in torch / transformers.
+_LAZY_MODELS = {
+    "stemmer": "stemmer",
+    "sentiment_pipeline": "sentiment",
+    "embedding_model": "embedding",
+}
+
+
+def __getattr__(name):
+    # Backwards compatibility for `text_mining.stemmer` & co.
+    if name in _LAZY_MODELS:
+        return registry.get(_LAZY_MODELS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Texts per forward pass for the batch APIs
+SENTIMENT_BATCH_SIZE = 32
+EMBEDDING_BATCH_SIZE = 64
+
+
+def _label_to_score(result):
+    """Map one pipeline result {'label', 'score'} to [-1, 1]."""
+    label = result['label']
+    score = result['score']
+
+    if label == 'positive':
+        return score
+    elif label == 'negative':
+        return -score
+    else:
+        return 0.0
+
+def _remote(method, *args):
+    """
+    Run `method` on the shared model server (HIREON_MODEL_SERVER), or
+    return None to run in-process (no server configured / unreachable /
+    inference failed on the server).
+    """
+    client = get_model_client()
+    if client is None:
+        return None
+    try:
+        return getattr(client, method)(*args)
+    except (OSError, ModelServerError):
+        return None
+
+def _sentiment_uncached(texts, batch_size=SENTIMENT_BATCH_SIZE):
+    scores = _remote("sentiment", texts)
+    if scores is not None:
+        return scores
+    model = registry.get("sentiment")
+    with span("inference", model="sentiment"):
+        results = model(texts, batch_size=batch_size, truncation=True)
+    if len(results) != len(texts):
+        raise ValueError(f"sentiment model returned {len(results)} results for {len(texts)} texts")
+    return [float(_label_to_score(r)) for r in results]
 
 def analyze_sentiment(text):
     """
     Returns a score between -1 (Negative) and 1 (Positive).
+    Cached by normalized text (see score_cache.py).
     """
+    key = make_key("sentiment", [text], (model_tag(SENTIMENT_MODEL_ID),))
+    cached = score_cache.get(key)
+    if cached is not MISSING:
+        return cached
     try:
-        result = sentiment_pipeline(text)[0]
-        label = result['label']
-        score = result['score']
-        
-        if label == 'positive':
-            return score
-        elif label == 'negative':
-            return -score
-        else:
-            return 0.0
+        score = _sentiment_uncached([text])[0]
     except:
+        metrics.inc("errors", stage="inference")
         return 0.0
+    score_cache.put(key, score)
+    return score
+
+def analyze_sentiment_batch(texts, batch_size=SENTIMENT_BATCH_SIZE, strict=False):
+    """
+    Batched analyze_sentiment: one padded forward pass per `batch_size` texts.
+    Returns a list of scores in [-1, 1], aligned with `texts`.
+    Only cache misses (deduplicated) reach the model.
+
+    A failed forward pass scores the misses 0.0 (not cached), or raises
+    with `strict` (the model server, so its clients can fall back).
+    """
+    texts = [str(t) if t is not None else "" for t in texts]
+    if not texts:
+        return []
+
+    keys = [make_key("sentiment", [t], (model_tag(SENTIMENT_MODEL_ID),)) for t in texts]
+    scores = [score_cache.get(k) for k in keys]
+
+    pending = {}
+    for key, text, score in zip(keys, texts, scores):
+        if score is MISSING:
+            pending.setdefault(key, text)
+    if not pending:
+        return scores
+
+    try:
+        computed = dict(zip(pending, _sentiment_uncached(list(pending.values()), batch_size)))
+        for key, value in computed.items():
+            score_cache.put(key, value)
+    except:
+        metrics.inc("errors", stage="inference")
+        if strict:
+            raise
+        computed = dict.fromkeys(pending, 0.0)
+
+    return [computed[k] if s is MISSING else s for k, s in zip(keys, scores)]
+
+def encode_texts(texts, batch_size=EMBEDDING_BATCH_SIZE):
+    """
+    Encode texts into L2-normalized float32 embeddings, shape (n, dim).
+    """
+    vectors = _remote("encode", list(texts))
+    if vectors is not None:
+        return vectors
+    model = registry.get("embedding")
+    with span("inference", model="embedding"):
+        embeddings = model.encode(
+            list(texts),
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+    return np.asarray(embeddings, dtype=np.float32)
 
 def calculate_relevance(answer, question_context=""):
     """
@@ -38,11 +153,86 @@ def calculate_relevance(answer, question_context=""):
     """
     # In a real system, you'd compare 'answer' vs 'key_answer'.
     # Here, we check if the answer is relevant to the question context.
-    
-    sentences = [question_context, answer]
-    embeddings = embedding_model.encode(sentences)
-    score = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-    return score
+    return calculate_relevance_batch([answer], [question_context])[0]
+
+def calculate_relevance_batch(answers, questions, encoded=None):
+    """
+    Batched calculate_relevance: cosine similarity of each answer with the
+    question at the same position.
+
+    Question vectors come from the precomputed question index when possible;
+    answers (and any question not in the index) are encoded together in one
+    pass. Similarities are a row-wise dot product of normalized embeddings.
+    Only cache misses are encoded; pass an `encoded` dict to collect their
+    vectors ({answer text: vector}) for reuse.
+    """
+    answers = [str(a) if a is not None else "" for a in answers]
+    questions = [str(q) if q is not None else "" for q in questions]
+    if len(answers) != len(questions):
+        raise ValueError("answers and questions must have the same length")
+    if not answers:
+        return []
+
+    keys = [
+        make_key("relevance", [a, q], (model_tag(EMBEDDING_MODEL_ID),))
+        for a, q in zip(answers, questions)
+    ]
+    scores = [score_cache.get(k) for k in keys]
+    pending = {}
+    for i, (key, score) in enumerate(zip(keys, scores)):
+        if score is MISSING:
+            pending.setdefault(key, i)
+    if not pending:
+        return scores
+
+    rows = list(pending.values())
+    uncached = _relevance_uncached([answers[i] for i in rows], [questions[i] for i in rows], encoded)
+    computed = dict(zip(pending, uncached))
+    for key, value in computed.items():
+        score_cache.put(key, value)
+    return [computed[k] if s is MISSING else s for k, s in zip(keys, scores)]
+
+def _relevance_uncached(answers, questions, encoded=None):
+    scores = _remote("relevance", answers, questions)
+    if scores is not None:
+        return scores
+    # Bank questions come from the precomputed index; anything else
+    # (custom prompts, missing index) is encoded with the answers, once.
+    q_vectors = _indexed_questions(questions)
+    to_encode = [q for q in dict.fromkeys(questions) if q not in q_vectors]
+
+    embeddings = encode_texts(answers + to_encode)
+    a_emb = embeddings[:len(answers)]
+    if encoded is not None:
+        encoded.update(zip(answers, a_emb))
+    for q, vec in zip(to_encode, embeddings[len(answers):]):
+        q_vectors[q] = vec
+    return _dot_rows(a_emb, np.stack([q_vectors[q] for q in questions]))
+
+def _indexed_questions(questions):
+    """{question: vector} for the questions found in the question index."""
+    index = get_question_index()
+    q_vectors = {}
+    if index is not None:
+        for q in questions:
+            if q not in q_vectors:
+                vec = index.lookup(q)
+                if vec is not None:
+                    q_vectors[q] = vec
+    return q_vectors
+
+def _dot_rows(a_emb, q_emb):
+    with span("scoring", kind="relevance"):
+        scores = np.einsum("ij,ij->i", np.asarray(a_emb, dtype=np.float32), np.asarray(q_emb, dtype=np.float32))
+    return [float(x) for x in scores]
+
+def answer_embedding_store(dim=None):
+    """
+    Persisted answer embeddings of the current encoder (see
+    io_manager/embedding_store.py); None until something was stored,
+    unless `dim` is given.
+    """
+    return open_embedding_store(model_tag(EMBEDDING_MODEL_ID), dim)
 
 def grading_formula(sentiment_score, relevance_score):
     """
@@ -57,21 +247,44 @@ def grading_formula(sentiment_score, relevance_score):
     return final_grade
 
 def extract_keywords(text_list, top_n=3):
-    """Simple frequency-based keyword extraction using Sastrawi stemmer"""
+    """
+    Simple frequency-based keyword extraction using Sastrawi stemmer.
+
+    `text_list` may be any iterable of answers: tokens are streamed text by
+    text (no joined string) and each distinct word is stemmed once
+    (see preprocessing.stem_cache). Lists / tuples are also result-cached.
+    """
     from collections import Counter
-    import re
-    
-    all_text = " ".join(text_list)
-    clean_text = re.sub(r'[^\w\s]', '', all_text).lower()
-    words = clean_text.split()
-    stemmed_words = [stemmer.stem(w) for w in words if len(w) > 3]
-    
-    counter = Counter(stemmed_words)
-    return counter.most_common(top_n)
+
+    key = None
+    if isinstance(text_list, (list, tuple)):
+        text_list = [str(t) for t in text_list]
+        key = make_key("keywords", text_list + [str(top_n)], (STEMMER_ID,))
+        cached = score_cache.get(key)
+        if cached is not MISSING:
+            return [tuple(item) for item in cached]
+
+    counter = Counter(stem_cache.stem(w) for w in iter_tokens(text_list) if len(w) > 3)
+    keywords = counter.most_common(top_n)
+    if key is not None:
+        score_cache.put(key, list(keywords))
+    return keywords
 
 __all__ = [
+    "Tokenizer",
+    "Stemmer",
+    "Lemmatizer",
+    "BehavioralSentiment",
+    "behavioral_analyze",
     "analyze_sentiment",
+    "analyze_sentiment_batch",
     "calculate_relevance",
+    "calculate_relevance_batch",
+    "encode_texts",
+    "answer_embedding_store",
     "grading_formula",
     "extract_keywords",
+    "warm_models",
+    "release_models",
+    "score_cache",
 ]
\ No newline at end of file
@@ -27,7 +27,9 @@ from .QnA.decisions import DecisionEngine, FinalDecisions
 
 from .QnA.text_mining import(
     analyze_sentiment,
+    analyze_sentiment_batch,
     calculate_relevance,
+    calculate_relevance_batch,
     grading_formula,
     extract_keywords,)
 
@@ -65,7 +67,9 @@ __all__ = [
     "DecisionEngine",
     "FinalDecisions",
     "analyze_sentiment",
+    "analyze_sentiment_batch",
     "calculate_relevance",
+    "calculate_relevance_batch",
     "grading_formula",
     "extract_keywords",
     
@@ -8,6 +8,8 @@ Exports:
 - extract_initials
 - empty_metadata_template
 - login, user_exists, get_user_metadata
+- UserIndex (username -> user file index; the shared instance is
+  app.modules.auth.user_index.user_index)
 """
 
 from .metadata_filler import (
@@ -24,6 +26,8 @@ from .login import (
     get_user_metadata
 )
 
+from .user_index import UserIndex
+
 from .auth_manager import (
     create_user,
     load_user,
@@ -42,4 +46,5 @@ __all__ = [
     "load_user",
     "verify_user",
     "update_user",
+    "UserIndex",
 ]
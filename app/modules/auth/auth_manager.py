@@ -2,7 +2,7 @@
 import hashlib
 from pathlib import Path
 from typing import Optional, Dict
-from app.modules.io_manager import save_json, load_json, USERS_DIR
+from app.modules.io_manager import get_backend, USERS_DIR
 from app.modules.utils.idgen import generate_user_id
 
 USERS_DIR.mkdir(parents=True, exist_ok=True)
@@ -19,8 +19,8 @@ def create_user(username: str, password: str, full_name: str = "") -> Dict:
     Create a user if username not exists.
     Returns saved metadata dict.
     """
-    path = user_file(username)
-    if path.exists():
+    backend = get_backend()
+    if backend.load_user(username) is not None:
         raise FileExistsError("User already exists")
 
     # generate a stable id based on username + timestamp
@@ -34,14 +34,11 @@ def create_user(username: str, password: str, full_name: str = "") -> Dict:
         "wage_expectation": 0,
         "Specialties": [],
     }
-    save_json(metadata, path)
+    backend.save_user(metadata, filename=user_file(username).name)
     return metadata
 
 def load_user(username: str) -> Optional[Dict]:
-    path = user_file(username)
-    if not path.exists():
-        return None
-    return load_json(path)
+    return get_backend().load_user(username)
 
 def verify_user(username: str, password: str) -> bool:
     data = load_user(username)
@@ -52,5 +49,6 @@ def verify_user(username: str, password: str) -> bool:
 def update_user(username: str, updates: Dict) -> Dict:
     data = load_user(username) or {}
     data.update(updates)
-    save_json(data, user_file(username))
+    data.setdefault("Username", username)
+    get_backend().save_user(data, filename=user_file(username).name)
     return data
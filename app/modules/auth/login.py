@@ -2,27 +2,20 @@
 
 from pathlib import Path
 from app.modules.utils import validate_username
-from app.modules.io_manager import load_json, USERS_DIR
+from app.modules.io_manager import get_backend
 
 def user_exists(username: str) -> bool:
     """
     Check if any metadata file belongs to this username.
     """
-    for file in USERS_DIR.glob("*.json"):
-        data = load_json(file)
-        if data.get("Username") == username:
-            return True
-    return False
+    return get_user_metadata(username) is not None
 
 def get_user_metadata(username: str) -> dict | None:
     """
     Load and return metadata JSON by username.
+    With the file backend this is one username-index lookup + one file read.
     """
-    for file in USERS_DIR.glob("*.json"):
-        data = load_json(file)
-        if data.get("Username") == username:
-            return data
-    return None
+    return get_backend().load_user(username)
 
 def login(username: str) -> dict:
     """
@@ -5,7 +5,7 @@ from app.modules.utils import (
     validate_metadata,
     generate_user_id
 )
-from app.modules.io_manager import save_json, USERS_DIR
+from app.modules.io_manager import get_backend, USERS_DIR
 
 def extract_initials(name: str) -> str:
     """
@@ -45,5 +45,5 @@ def save_metadata(metadata: dict) -> Path:
     """
     file_id = metadata["File_ID"]
     output_path = USERS_DIR / f"{file_id}.json"
-    save_json(metadata, output_path)
+    get_backend().save_user(metadata, filename=output_path.name)
     return output_path
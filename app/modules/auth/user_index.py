@@ -0,0 +1,154 @@
+# app/modules/auth/user_index.py
+"""
+Persistent username -> user file index.
+
+Avoids globbing and parsing every JSON under USERS_DIR on each login.
+The index lives in app/data/temp/user_index.json together with the
+mtime of USERS_DIR it was built from; when the directory changes behind
+our back (files added/removed by another process) or the index file is
+missing, it is rebuilt with one scan.
+
+create_user, save_metadata and update_user keep it current via
+`stamp()` before writing a user file and `add()` after it.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.modules.io_manager import load_json, USERS_DIR, TEMP_DIR
+
+INDEX_PATH = TEMP_DIR / "user_index.json"
+
+
+class UserIndex:
+    """
+    Username -> file name map for USERS_DIR, persisted to `index_path`.
+    """
+
+    def __init__(self, users_dir: Path = USERS_DIR, index_path: Path = INDEX_PATH):
+        self.users_dir = Path(users_dir)
+        self.index_path = Path(index_path)
+        self._users: Dict[str, str] = {}
+        self._dir_mtime_ns: Optional[int] = None
+        # mtime of index_path when we last wrote / read it: a change means
+        # another process recorded a user since
+        self._index_mtime_ns: Optional[int] = None
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------------------
+    def _current_dir_mtime(self) -> Optional[int]:
+        try:
+            return self.users_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _current_index_mtime(self) -> Optional[int]:
+        try:
+            return self.index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _save(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"dir_mtime_ns": self._dir_mtime_ns, "users": self._users}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.index_path)
+        self._index_mtime_ns = self._current_index_mtime()
+
+    def rebuild(self):
+        """
+        Scan USERS_DIR once and rewrite the index.
+        """
+        with self._lock:
+            mtime = self._current_dir_mtime()
+            users: Dict[str, str] = {}
+            if self.users_dir.exists():
+                for file in sorted(self.users_dir.glob("*.json")):
+                    username = load_json(file).get("Username")
+                    if username and username not in users:
+                        users[username] = file.name
+            self._users = users
+            self._dir_mtime_ns = mtime
+            self._save()
+
+    def _ensure_fresh(self):
+        mtime = self._current_dir_mtime()
+        if self._dir_mtime_ns is not None and self._dir_mtime_ns == mtime:
+            return
+        # Not loaded in this process yet (or stale): try the persisted index
+        index_mtime = self._current_index_mtime()
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if data.get("dir_mtime_ns") == mtime and mtime is not None:
+            with self._lock:
+                self._users = dict(data.get("users", {}))
+                self._dir_mtime_ns = mtime
+                self._index_mtime_ns = index_mtime
+            return
+        self.rebuild()
+
+    # -------------------------------------------------------------------
+    def lookup(self, username: str) -> Optional[Path]:
+        """
+        Path of the user file for `username`, or None.
+        """
+        self._ensure_fresh()
+        name = self._users.get(username)
+        if name:
+            return self.users_dir / name
+        # auth_manager stores <username>.json: one stat covers a file
+        # written by another process since our last refresh
+        direct = self.users_dir / f"{username}.json"
+        if direct.exists() and load_json(direct).get("Username") == username:
+            # The index missed a file, so it may have missed others too
+            self.rebuild()
+            return direct
+        return None
+
+    def stamp(self) -> Optional[int]:
+        """
+        Freshen the index and return the directory mtime it reflects.
+        Call right before writing a user file and pass the result to
+        `add(..., before=)`.
+        """
+        self._ensure_fresh()
+        return self._dir_mtime_ns
+
+    def add(self, username: str, path: Path, before: Optional[int] = None):
+        """
+        Record that `username` is stored in `path` (call after writing it).
+
+        If the index was fresh at `before` (from `stamp()`) and no other
+        process has recorded a user since, our own write is the only change
+        it can be missing, so it is re-stamped with the new directory mtime
+        instead of rescanned. Otherwise it is rebuilt.
+        """
+        if not username:
+            return
+        with self._lock:
+            unchanged = (
+                before is not None
+                and before == self._dir_mtime_ns
+                and self._index_mtime_ns == self._current_index_mtime()
+            )
+            if unchanged:
+                self._users[username] = Path(path).name
+                self._dir_mtime_ns = self._current_dir_mtime()
+                self._save()
+                return
+        self.rebuild()
+
+
+# Process-wide index used by login / auth_manager / metadata_filler
+user_index = UserIndex()
+
+
+__all__ = ["UserIndex", "user_index"]
@@ -1,10 +1,22 @@
 from .aggregator import build_dashboard
-from .analyser import clarity_score, relevance_score
+from .analyser import AnswerAnalysis, clarity_score, relevance_score
 from .scorer import Scorer
+from .hr_analytics import refresh_candidate_table, load_candidate_table, rank_candidates
+from .regrade import regrade_reports, load_results, model_version
+from .what_if import load_pool, simulate
 
 __all__ = [
     "build_dashboard",
+    "AnswerAnalysis",
     "clarity_score",
     "relevance_score",
     "Scorer",
+    "refresh_candidate_table",
+    "load_candidate_table",
+    "rank_candidates",
+    "regrade_reports",
+    "load_results",
+    "model_version",
+    "load_pool",
+    "simulate",
 ]
\ No newline at end of file
@@ -20,8 +20,9 @@ import json
 from ..QnA.text_mining import behavioral_analyze
 from ..QnA.decisions import DecisionEngine
 from .scorer import Scorer
-from .analyser import clarity_score, relevance_score
+from .analyser import AnswerAnalysis
 from ..io_manager.storage_paths import USERS_DIR, REPORTS_DIR
+from ..io_manager.score_store import read_scores
 
 DASHBOARD_DIR = Path(REPORTS_DIR)
 DASHBOARD_DIR.mkdir(parents=True, exist_ok=True)
@@ -39,11 +40,11 @@ def build_dashboard(user_id: str, company_budget: int):
     # --- Load metadata ---
     metadata = json.loads(meta_path.read_text())
 
-    # --- Load QnA Report ---
-    df = pd.read_csv(report_path)
+    # --- Load QnA Report (typed long format, text columns only) ---
+    df = read_scores(report_path, columns=["label", "question", "answer"])
 
-    # Extract question columns only (Q1..Q16 + Wage)
-    question_cols = [c for c in df.columns if c.startswith("Q")]
+    # Question rows only (Q1..Q16)
+    df = df[df["label"].astype(str).str.startswith("Q")]
 
     # --- Compute metrics ---
     clarity = []
@@ -52,15 +53,15 @@ def build_dashboard(user_id: str, company_budget: int):
 
     scorer = Scorer()
 
-    for q in question_cols:
-        q_text = df[q].iloc[0]   # Question
-        a_text = df[q].iloc[1]   # Answer
+    for q_text, a_text in zip(df["question"], df["answer"]):
+        # Tokenize once; question tokens come from the shared cache
+        analysis = AnswerAnalysis(a_text)
 
-        axis_scores = behavioral_analyze(a_text)
+        axis_scores = behavioral_analyze(analysis.tokens)
         scores.append(scorer.overall_score(axis_scores))
 
-        clarity.append(clarity_score(a_text))
-        relevance.append(relevance_score(a_text, q_text))
+        clarity.append(analysis.clarity())
+        relevance.append(analysis.relevance(q_text))
 
     # --- Decision Engine ---
     engine = DecisionEngine(company_budget)
@@ -78,10 +79,10 @@ def build_dashboard(user_id: str, company_budget: int):
         "avg_sentiment_score": round(sum(scores) / len(scores), 4),
         "avg_clarity": round(sum(clarity) / len(clarity), 4),
         "avg_relevance": round(sum(relevance) / len(relevance), 4),
-        "final_decision": summary["decision"],
+        "final_decision": summary["label"],
         "final_score": summary["final_score"],
         "difficulty": summary["difficulty"],
-        "wage_penalty": summary["wage_penalty"]
+        "wage_penalty": summary["penalty"]
     }
 
     pd.DataFrame([result]).to_csv(out_path, index=False)
@@ -9,10 +9,15 @@ Provides lightweight text analytics for dashboard:
 - relevance scoring (keyword overlap)
 - frequent words
 - semantic similarity placeholder (Jaccard)
+
+`AnswerAnalysis` tokenizes an answer once and serves all four metrics
+from the shared tokens; question token sets are cached by question text.
+The module-level functions are thin wrappers kept for existing callers.
 """
 
-from typing import List, Dict
+from typing import List, Dict, FrozenSet, Union
 from collections import Counter
+from functools import lru_cache
 import re
 
 from ..QnA.text_mining import Tokenizer
@@ -27,76 +32,117 @@ STOPWORDS = {
 }
 
 
-# ---------------------------------------------------------------------
-# 1. Clarity Scoring
-# ---------------------------------------------------------------------
-def clarity_score(text: str) -> float:
+_TOKENIZER = Tokenizer()
+
+
+@lru_cache(maxsize=4096)
+def question_tokens(question: str) -> FrozenSet[str]:
     """
-    Measures clarity based on:
-    - token length (8–40 ideal)
-    - stopword fraction
-    - proportion of special characters
+    Token set of a question, tokenized once per distinct question text.
+    """
+    return frozenset(_TOKENIZER.process(question))
+
 
-    Returns score ∈ [0, 1].
+class AnswerAnalysis:
     """
-    tokens = Tokenizer().process(text)
-    n = len(tokens)
-    if n == 0:
-        return 0.0
+    One answer, tokenized once; every metric reads the same tokens.
+    """
+
+    __slots__ = ("text", "tokens", "token_set")
+
+    def __init__(self, text: str):
+        self.text = "" if text is None else str(text)
+        self.tokens: List[str] = _TOKENIZER.process(self.text)
+        self.token_set: FrozenSet[str] = frozenset(self.tokens)
+
+    # -----------------------------------------------------------------
+    # 1. Clarity Scoring
+    # -----------------------------------------------------------------
+    def clarity(self) -> float:
+        """
+        Measures clarity based on:
+        - token length (8–40 ideal)
+        - stopword fraction
+        - proportion of special characters
+
+        Returns score ∈ [0, 1].
+        """
+        n = len(self.tokens)
+        if n == 0:
+            return 0.0
+
+        # Length score: linear between 8–40 tokens
+        length_score = min(max((min(n, 40) - 8) / (40 - 8), 0), 1)
+
+        # Stopword fraction penalty
+        stop_frac = sum(1 for t in self.tokens if t in STOPWORDS) / n
+        stop_penalty = 1 - stop_frac  # higher fraction reduces score
 
-    # Length score: linear between 8–40 tokens
-    length_score = min(max((min(n, 40) - 8) / (40 - 8), 0), 1)
+        # Special character penalty
+        special_chars = sum(1 for c in self.text if not c.isalnum() and not c.isspace())
+        special_frac = special_chars / max(len(self.text), 1)
+        special_penalty = 1 - special_frac  # more special chars reduces score
 
-    # Stopword fraction penalty
-    stop_frac = sum(1 for t in tokens if t in STOPWORDS) / n
-    stop_penalty = 1 - stop_frac  # higher fraction reduces score
+        # Combined score: weighted average
+        score = 0.5 * length_score + 0.25 * stop_penalty + 0.25 * special_penalty
+        return round(score, 4)
 
-    # Special character penalty
-    special_chars = sum(1 for c in text if not c.isalnum() and not c.isspace())
-    special_frac = special_chars / max(len(text), 1)
-    special_penalty = 1 - special_frac  # more special chars reduces score
+    # -----------------------------------------------------------------
+    # 2. Relevance Scoring
+    # -----------------------------------------------------------------
+    def relevance(self, question: str) -> float:
+        """
+        Uses token overlap ratio between question and answer.
+        Returns relevance ∈ [0, 1].
+        """
+        qtok = question_tokens("" if question is None else str(question))
+        if not self.token_set or not qtok:
+            return 0.0
+        overlap = len(self.token_set & qtok)
+        base = len(qtok)
+        return round(overlap / base, 4)
+
+    # -----------------------------------------------------------------
+    # 3. Frequent Word Extraction
+    # -----------------------------------------------------------------
+    def frequent_words(self, top_k=5, exclude_stopwords=True) -> Dict[str, int]:
+        tokens = self.tokens
+        if exclude_stopwords:
+            tokens = [t for t in tokens if t not in STOPWORDS]
+        return dict(Counter(tokens).most_common(top_k))
+
+    # -----------------------------------------------------------------
+    # 4. Semantic Similarity (Jaccard placeholder)
+    # -----------------------------------------------------------------
+    def similarity(self, other: Union[str, "AnswerAnalysis"]) -> float:
+        """
+        Placeholder for semantic similarity.
+        Jaccard(set(tokens)).
+        Returns [0,1].
+        """
+        if not isinstance(other, AnswerAnalysis):
+            other = AnswerAnalysis(other)
+        t1, t2 = self.token_set, other.token_set
+        if not t1 or not t2:
+            return 0.0
+        score = len(t1 & t2) / len(t1 | t2)
+        return round(score, 4)
 
-    # Combined score: weighted average
-    score = 0.5 * length_score + 0.25 * stop_penalty + 0.25 * special_penalty
-    return round(score, 4)
 
 # ---------------------------------------------------------------------
-# 2. Relevance Scoring
+# Function API (one-off calls)
 # ---------------------------------------------------------------------
+def clarity_score(text: str) -> float:
+    return AnswerAnalysis(text).clarity()
+
+
 def relevance_score(text: str, question: str) -> float:
-    """
-    Uses token overlap ratio between question and answer.
-    Returns relevance ∈ [0, 1].
-    """
-    tok = set(Tokenizer().process(text))
-    qtok = set(Tokenizer().process(question))
-    if not tok or not qtok:
-        return 0.0
-    overlap = len(tok & qtok)
-    base = len(qtok)
-    return round(overlap / base, 4)
+    return AnswerAnalysis(text).relevance(question)
+
 
-# ---------------------------------------------------------------------
-# 3. Frequent Word Extraction
-# ---------------------------------------------------------------------
 def frequent_words(text: str, top_k=5, exclude_stopwords=True) -> Dict[str, int]:
-    tokens = Tokenizer().process(text)
-    if exclude_stopwords:
-        tokens = [t for t in tokens if t not in STOPWORDS]
-    return dict(Counter(tokens).most_common(top_k))
+    return AnswerAnalysis(text).frequent_words(top_k, exclude_stopwords)
+
 
-# ---------------------------------------------------------------------
-# 4. Semantic Similarity (Jaccard placeholder)
-# ---------------------------------------------------------------------
 def semantic_similarity(a: str, b: str) -> float:
-    """
-    Placeholder for semantic similarity.
-    Jaccard(set(tokens)).
-    Returns [0,1].
-    """
-    t1 = set(Tokenizer().process(a))
-    t2 = set(Tokenizer().process(b))
-    if not t1 or not t2:
-        return 0.0
-    score = len(t1 & t2) / len(t1 | t2)
-    return round(score, 4)
+    return AnswerAnalysis(a).similarity(b)
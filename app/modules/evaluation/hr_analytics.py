@@ -0,0 +1,309 @@
+# app/modules/evaluation/hr_analytics.py
+
+"""
+HR analytics engine
+-------------------
+Cross-candidate version of `build_dashboard`:
+
+- scans every report in app/data/reports once
+- computes per-answer clarity / relevance in vectorized pandas passes
+  over one long (report, question) table, instead of per-answer calls
+- scores each answer's behavioral sentiment in [-1, 1] (the Judger's
+  sentiment, see regrade.behavioral_scores) for the decision
+- aggregates one row per candidate (scores, metrics, decision)
+- writes a columnar candidate table (Parquet), partitioned by
+  position and level:
+
+    app/data/analytics/candidates/position=<p>/level=<l>/part.parquet
+
+Refreshes are incremental: a manifest keeps each report's mtime, and only
+new/changed/removed reports are recomputed; only the partitions they
+belong to are rewritten. A manifest of another TABLE_VERSION (older
+columns) recomputes everything once.
+
+Usage:
+    python -m app.modules.evaluation.hr_analytics
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+from ..QnA.decisions import DecisionEngine
+from ..QnA.questions import JOB_POSITIONS, determine_level
+from ..io_manager.answer_log import read_records, records_from_csv
+from ..io_manager.jsonio import load_json
+from ..io_manager.storage_paths import DATA_ROOT, USERS_DIR, REPORTS_DIR
+from ..QnA.preprocessing import TOKEN_RE
+from .analyser import STOPWORDS
+from .regrade import behavioral_scores
+
+ANALYTICS_DIR = DATA_ROOT / "analytics" / "candidates"
+MANIFEST_NAME = "manifest.json"
+PART_NAME = "part.parquet"
+TABLE_VERSION = 2
+
+# Same tokens as analyser (preprocessing.Tokenizer: lowercase TOKEN_RE)
+TOKEN_PATTERN = TOKEN_RE.pattern
+SPECIAL_PATTERN = r"[^\w\s]"
+
+QUESTION_LABELS = [f"Q{i}" for i in range(1, 17)]
+DEFAULT_BUDGET = 8_000_000
+
+
+# ---------------------------------------------------------------------
+# Report scanning
+# ---------------------------------------------------------------------
+def _report_mtimes(reports_dir: Path) -> Dict[str, int]:
+    """report_id -> newest mtime (ns) of its .jsonl log / .csv."""
+    mtimes: Dict[str, int] = {}
+    for pattern in ("*.jsonl", "*.csv"):
+        for path in reports_dir.glob(pattern):
+            mtime = path.stat().st_mtime_ns
+            if mtime > mtimes.get(path.stem, -1):
+                mtimes[path.stem] = mtime
+    return mtimes
+
+
+def _load_answers(reports_dir: Path, report_ids: List[str]) -> pd.DataFrame:
+    """
+    Long table with one row per (report, question):
+    report_id, label, question, answer, score
+    """
+    rows = []
+    for report_id in report_ids:
+        log_path = reports_dir / f"{report_id}.jsonl"
+        records = read_records(log_path) if log_path.exists() else records_from_csv(reports_dir / f"{report_id}.csv")
+        # Later records replace earlier ones with the same label
+        latest = {rec.get("label"): rec for rec in records}
+        for label, rec in latest.items():
+            if label in ("FINAL", "Wage_Expectation") or not str(label).startswith(("L", "Q")):
+                continue
+            rows.append((report_id, label, rec.get("question", ""), rec.get("answer", ""), rec.get("score", 0.0)))
+
+    df = pd.DataFrame(rows, columns=["report_id", "label", "question", "answer", "score"])
+    df["question"] = df["question"].fillna("").astype(str)
+    df["answer"] = df["answer"].fillna("").astype(str)
+    df["score"] = pd.to_numeric(df["score"], errors="coerce").fillna(0.0).astype("float32")
+    return df
+
+
+# ---------------------------------------------------------------------
+# Vectorized metrics (same formulas as analyser.clarity_score /
+# analyser.relevance_score, computed for all answers at once)
+# ---------------------------------------------------------------------
+def _token_frame(text: pd.Series) -> pd.DataFrame:
+    """Explode texts into (row, token) pairs."""
+    tokens = text.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+    return pd.DataFrame({"row": tokens.index, "token": tokens.values})
+
+
+def compute_answer_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add `clarity` and `relevance` columns to a long answer table.
+    """
+    df = df.reset_index(drop=True)
+    n_rows = len(df)
+    if n_rows == 0:
+        return df.assign(clarity=pd.Series(dtype="float32"), relevance=pd.Series(dtype="float32"))
+
+    answer_tokens = _token_frame(df["answer"])
+    question_tokens = _token_frame(df["question"])
+
+    n_tokens = answer_tokens.groupby("row").size().reindex(range(n_rows), fill_value=0)
+    n_stop = (
+        answer_tokens[answer_tokens["token"].isin(STOPWORDS)]
+        .groupby("row").size().reindex(range(n_rows), fill_value=0)
+    )
+    n_special = df["answer"].str.count(SPECIAL_PATTERN)
+    n_chars = df["answer"].str.len().clip(lower=1)
+
+    safe_n = n_tokens.clip(lower=1)
+    length_score = ((n_tokens.clip(upper=40) - 8) / (40 - 8)).clip(0, 1)
+    stop_penalty = 1 - n_stop / safe_n
+    special_penalty = 1 - n_special / n_chars
+    clarity = 0.5 * length_score + 0.25 * stop_penalty + 0.25 * special_penalty
+    clarity = clarity.where(n_tokens > 0, 0.0)
+
+    # Relevance: |answer ∩ question| / |question| over unique tokens
+    a_set = answer_tokens.drop_duplicates()
+    q_set = question_tokens.drop_duplicates()
+    q_size = q_set.groupby("row").size().reindex(range(n_rows), fill_value=0)
+    overlap = (
+        a_set.merge(q_set, on=["row", "token"])
+        .groupby("row").size().reindex(range(n_rows), fill_value=0)
+    )
+    relevance = (overlap / q_size.clip(lower=1)).where((q_size > 0) & (n_tokens > 0), 0.0)
+
+    return df.assign(
+        clarity=clarity.round(4).astype("float32"),
+        relevance=relevance.round(4).astype("float32"),
+    )
+
+
+# ---------------------------------------------------------------------
+# Candidate table
+# ---------------------------------------------------------------------
+def _candidate_rows(answers: pd.DataFrame, users_dir: Path, budgets: Dict[str, int]) -> pd.DataFrame:
+    """One row per report: averages + decision + position/level."""
+    if answers.empty:
+        return pd.DataFrame()
+
+    grouped = answers.groupby("report_id")
+    summary = pd.DataFrame({
+        "n_answers": grouped.size(),
+        "avg_score": grouped["score"].mean(),
+        "avg_sentiment": grouped["sentiment"].mean(),
+        "avg_clarity": grouped["clarity"].mean(),
+        "avg_relevance": grouped["relevance"].mean(),
+    })
+    questions = answers[answers["label"].isin(QUESTION_LABELS)].groupby("report_id")
+    q_scores = questions["score"].agg(list)
+    q_sentiment = questions["sentiment"].mean()
+
+    rows = []
+    for report_id, agg in summary.iterrows():
+        meta = load_json(users_dir / f"{report_id}.json")
+        position = meta.get("Position") or "Unknown"
+        months = int(meta.get("months_experience", 0) or 0)
+        wage = float(meta.get("wage_expectation", 0) or 0)
+        scores = q_scores.get(report_id) or [float(agg["avg_score"])]
+        # Like Judger.finalize: sentiment over the main questions
+        sentiment = float(q_sentiment.get(report_id, agg["avg_sentiment"]))
+
+        budget = budgets.get(position, DEFAULT_BUDGET)
+        decision = DecisionEngine(budget).judge(
+            question_scores=scores,
+            sentiment=sentiment,
+            months_experience=months,
+            wage_expectation=wage,
+        )
+        rows.append({
+            "report_id": report_id,
+            "username": meta.get("Username", ""),
+            "position": position,
+            "level": determine_level(months),
+            "months_experience": months,
+            "wage_expectation": wage,
+            "n_answers": int(agg["n_answers"]),
+            "avg_score": round(float(agg["avg_score"]), 4),
+            "avg_question_score": round(sum(scores) / len(scores), 4),
+            "avg_sentiment": round(sentiment, 4),
+            "avg_clarity": round(float(agg["avg_clarity"]), 4),
+            "avg_relevance": round(float(agg["avg_relevance"]), 4),
+            "final_score": decision["final_score"],
+            "label": decision["label"],
+            "penalty": decision["penalty"],
+        })
+    return pd.DataFrame(rows)
+
+
+def _partition_dir(out_dir: Path, position: str, level: str) -> Path:
+    safe = re.sub(r"[^\w.-]+", "_", str(position))
+    return out_dir / f"position={safe}" / f"level={level}"
+
+
+def load_candidate_table(out_dir: Path = ANALYTICS_DIR) -> pd.DataFrame:
+    """
+    Read all partitions of the candidate table.
+    """
+    parts = [pd.read_parquet(p) for p in sorted(Path(out_dir).glob(f"position=*/level=*/{PART_NAME}"))]
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat(parts, ignore_index=True)
+
+
+def refresh_candidate_table(
+    reports_dir: Path = REPORTS_DIR,
+    users_dir: Path = USERS_DIR,
+    out_dir: Path = ANALYTICS_DIR,
+    budgets: Dict[str, int] = None,
+) -> Dict[str, int]:
+    """
+    Incrementally bring the partitioned candidate table up to date.
+    Returns counts: scanned / updated / removed reports, partitions written.
+    """
+    reports_dir, users_dir, out_dir = Path(reports_dir), Path(users_dir), Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    budgets = budgets or {name: info["standard"] for name, info in JOB_POSITIONS.items()}
+
+    manifest_path = out_dir / MANIFEST_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get("version") != TABLE_VERSION:
+        # Unversioned / older table: every stored row is recomputed
+        old = manifest.get("reports", manifest)
+        manifest = {"reports": dict.fromkeys(old, None)}
+    known = manifest["reports"]
+
+    current = _report_mtimes(reports_dir)
+    changed = [rid for rid, mtime in current.items() if known.get(rid) != mtime]
+    removed = [rid for rid in known if rid not in current]
+    if not changed and not removed:
+        return {"scanned": len(current), "updated": 0, "removed": 0, "partitions": 0}
+
+    answers = compute_answer_metrics(_load_answers(reports_dir, changed))
+    answers["sentiment"] = pd.Series(behavioral_scores(answers["answer"].tolist()), dtype="float32")
+    fresh = _candidate_rows(answers, users_dir, budgets)
+
+    table = load_candidate_table(out_dir)
+    stale_ids = set(changed) | set(removed)
+    touched = set()
+    if not table.empty:
+        stale = table[table["report_id"].isin(stale_ids)]
+        touched |= set(zip(stale["position"], stale["level"]))
+        table = table[~table["report_id"].isin(stale_ids)]
+    if not fresh.empty:
+        touched |= set(zip(fresh["position"], fresh["level"]))
+        table = pd.concat([table, fresh], ignore_index=True) if not table.empty else fresh
+
+    for position, level in touched:
+        part_dir = _partition_dir(out_dir, position, level)
+        part = table[(table["position"] == position) & (table["level"] == level)] if not table.empty else table
+        if part.empty:
+            (part_dir / PART_NAME).unlink(missing_ok=True)
+            continue
+        part_dir.mkdir(parents=True, exist_ok=True)
+        part = part.astype({"position": "category", "level": "category", "label": "category"})
+        part.sort_values("final_score", ascending=False).to_parquet(part_dir / PART_NAME, index=False)
+
+    tmp = manifest_path.with_name(f".{MANIFEST_NAME}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"version": TABLE_VERSION, "reports": current}), encoding="utf-8")
+    os.replace(tmp, manifest_path)
+
+    return {"scanned": len(current), "updated": len(changed), "removed": len(removed), "partitions": len(touched)}
+
+
+def rank_candidates(position: str, level: str = None, out_dir: Path = ANALYTICS_DIR) -> pd.DataFrame:
+    """
+    Ranking for one position (optionally one level), best first.
+    Reads only the matching partition(s).
+    """
+    pattern = f"{_partition_dir(out_dir, position, level or '*').relative_to(out_dir)}/{PART_NAME}"
+    parts = [pd.read_parquet(p) for p in sorted(Path(out_dir).glob(pattern))]
+    if not parts:
+        return pd.DataFrame()
+    df = pd.concat(parts, ignore_index=True)
+    return df.sort_values("final_score", ascending=False, ignore_index=True)
+
+
+__all__ = [
+    "compute_answer_metrics",
+    "refresh_candidate_table",
+    "load_candidate_table",
+    "rank_candidates",
+]
+
+
+if __name__ == "__main__":
+    counts = refresh_candidate_table()
+    print(
+        f"Scanned {counts['scanned']} reports: {counts['updated']} updated, "
+        f"{counts['removed']} removed, {counts['partitions']} partitions written"
+    )
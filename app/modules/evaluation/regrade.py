@@ -0,0 +1,382 @@
+# app/modules/evaluation/regrade.py
+"""
+Offline bulk re-grading of every stored interview report.
+
+Use after changing the sentiment / embedding models or `grading_formula`:
+
+- reports in app/data/reports are streamed in chunks (`chunk_size`)
+- all answers of a chunk go through analyze_sentiment_batch and
+  calculate_relevance_batch together (large cross-candidate batches)
+- behavioral lexicon scoring (tokenize + lemmatize, the Judger
+  preprocessing) is fanned out over a process pool and overlaps with
+  inference
+- per answer: sentiment, relevance, grade = grading_formula(...) and the
+  behavioral score; per report: DecisionEngine.judge on the behavioral
+  scores of the first 16 answers, the same inputs as Judger.finalize, so
+  an unchanged lexicon / Judger reproduces the stored labels. The model
+  grades are recorded next to them for comparison.
+
+Results are tagged with a model version (model tags + a hash of
+grading_formula) and written to
+
+    app/data/regrade/<model_version>/results.jsonl    one line per report
+    app/data/regrade/<model_version>/manifest.json
+
+results.jsonl doubles as the checkpoint: an interrupted run resumes with
+the reports not yet in it. The owner of a report is loaded as in
+Judger._owner (storage backend, then the <id>.json user file); reports
+without answers or without user metadata are not judged; they are listed under "skipped" in the summary.
+`--apply` also stores each new decision through
+the storage backend and drops the report's dashboard artifact, which is
+rebuilt with that decision on the next view. The answer log, CSV and score
+store are left as graded at interview time.
+
+Usage:
+    python -m app.modules.evaluation.regrade [--workers 8] [--chunk-size 512] [--apply]
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from ..QnA.decisions import DecisionEngine
+from ..QnA.model_registry import model_tag, SENTIMENT_MODEL_ID, EMBEDDING_MODEL_ID
+from ..QnA.questions import JOB_POSITIONS
+from ..QnA.text_mining import analyze_sentiment_batch, calculate_relevance_batch, grading_formula
+from ..io_manager.answer_log import read_records, records_from_csv
+from ..io_manager.dashboard_artifact import remove_artifact
+from ..io_manager.jsonio import load_json
+from ..io_manager.storage_paths import DATA_ROOT, USERS_DIR, REPORTS_DIR
+
+REGRADE_DIR = DATA_ROOT / "regrade"
+RESULTS_NAME = "results.jsonl"
+MANIFEST_NAME = "manifest.json"
+
+CHUNK_SIZE = 512            # reports per inference chunk
+PREPROCESS_BATCH = 256      # answers per process-pool task
+DEFAULT_BUDGET = 8_000_000
+
+
+def model_version() -> str:
+    """
+    Short tag identifying the models and grading formula in use.
+    """
+    h = hashlib.sha256()
+    for part in (model_tag(SENTIMENT_MODEL_ID), model_tag(EMBEDDING_MODEL_ID), inspect.getsource(grading_formula)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()[:12]
+
+
+# ---------------------------------------------------------------------
+# Report streaming
+# ---------------------------------------------------------------------
+def iter_report_ids(reports_dir: Path = REPORTS_DIR) -> List[str]:
+    """Report ids with a .jsonl answer log or a .csv report, sorted."""
+    reports_dir = Path(reports_dir)
+    ids = {p.stem for p in reports_dir.glob("*.jsonl")}
+    ids |= {p.stem for p in reports_dir.glob("*.csv")}
+    return sorted(ids)
+
+
+def load_report(reports_dir: Path, report_id: str) -> Tuple[List[Dict], Optional[str]]:
+    """
+    (answers, wage answer) for one report; answers are the latest L*/Q*
+    records in interview order.
+    """
+    log_path = reports_dir / f"{report_id}.jsonl"
+    records = read_records(log_path) if log_path.exists() else records_from_csv(reports_dir / f"{report_id}.csv")
+    latest = {rec.get("label"): rec for rec in records}
+    wage = latest.get("Wage_Expectation", {}).get("answer")
+    answers = [
+        {"label": str(label), "question": str(rec.get("question") or ""), "answer": str(rec.get("answer") or "")}
+        for label, rec in latest.items()
+        if str(label).startswith(("L", "Q"))
+    ]
+    return answers, wage
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# ---------------------------------------------------------------------
+# Preprocessing (process pool)
+# ---------------------------------------------------------------------
+_scorer = None
+
+
+def _init_worker():
+    global _scorer
+    from ..QnA.preprocessing import Tokenizer, Lemmatizer
+    from ..QnA.behavioral import BehavioralSentiment
+
+    _scorer = (Tokenizer(), Lemmatizer(), BehavioralSentiment())
+
+
+def behavioral_scores(answers: List[str]) -> List[float]:
+    """
+    Judger._compute_sentiment_score for a batch of answers: tokenize,
+    lemmatize, average of the four behavioral axes.
+    """
+    if _scorer is None:
+        _init_worker()
+    tokenizer, lemmatizer, behavior = _scorer
+    scores = []
+    for text in answers:
+        tokens = lemmatizer.process(" ".join(tokenizer.process(text)))
+        axes = behavior.score_axes(tokens)
+        scores.append(round(sum(axes.values()) / 4, 4))
+    return scores
+
+
+# ---------------------------------------------------------------------
+# Checkpoint / output
+# ---------------------------------------------------------------------
+def completed_ids(results_path: Path) -> Set[str]:
+    """Report ids already in results.jsonl (a torn last line is ignored)."""
+    done = set()
+    if not results_path.exists():
+        return done
+    with open(results_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["report_id"])
+            except (ValueError, KeyError):
+                continue
+    return done
+
+
+def _truncate_torn_tail(results_path: Path):
+    """Drop a partial last line left by an interrupted run."""
+    if not results_path.exists() or results_path.stat().st_size == 0:
+        return
+    with open(results_path, "rb+") as f:
+        data = f.read()
+        if not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def _skip_reason(answers: List[Dict], meta: Dict) -> Optional[str]:
+    """Why a report cannot be judged, or None."""
+    if not answers:
+        return "no answers"
+    if not meta.get("Username"):
+        return "no user metadata"
+    return None
+
+
+def _decide(meta: Dict, answers: List[Dict], wage_answer: Optional[str]) -> Dict:
+    position = meta.get("Position") or "Unknown"
+    months = int(meta.get("months_experience", 0) or 0)
+    try:
+        wage = float(wage_answer)
+    except (TypeError, ValueError):
+        wage = float(meta.get("wage_expectation", 0) or 0)
+
+    # As Judger.finalize: behavioral scores of the first 16 answers, and
+    # their mean as the sentiment
+    scores = [a["behavioral"] for a in answers[:16]]
+    budget = JOB_POSITIONS.get(position, {}).get("standard", DEFAULT_BUDGET)
+    decision = DecisionEngine(budget).judge(
+        question_scores=scores,
+        sentiment=sum(scores) / len(scores),
+        months_experience=months,
+        wage_expectation=wage,
+    )
+    return {"username": meta.get("Username"), "position": position, **decision}
+
+
+def regrade_reports(
+    reports_dir: Path = REPORTS_DIR,
+    users_dir: Path = USERS_DIR,
+    out_dir: Path = None,
+    workers: int = None,
+    chunk_size: int = CHUNK_SIZE,
+    apply: bool = False,
+    limit: int = None,
+    progress: bool = False,
+) -> Dict:
+    """
+    Re-grade all reports not yet in this model version's results.
+    Returns counts and the output location.
+    """
+    reports_dir, users_dir = Path(reports_dir), Path(users_dir)
+    version = model_version()
+    out_dir = Path(out_dir) if out_dir else REGRADE_DIR / version
+    out_dir.mkdir(parents=True, exist_ok=True)
+    results_path = out_dir / RESULTS_NAME
+
+    manifest_path = out_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        manifest_path.write_text(json.dumps({
+            "model_version": version,
+            "sentiment_model": model_tag(SENTIMENT_MODEL_ID),
+            "embedding_model": model_tag(EMBEDDING_MODEL_ID),
+            "decision_inputs": "behavioral scores of the first 16 answers (as Judger.finalize)",
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+        }, indent=2), encoding="utf-8")
+
+    _truncate_torn_tail(results_path)
+    done = completed_ids(results_path)
+    todo = [rid for rid in iter_report_ids(reports_dir) if rid not in done]
+    if limit is not None:
+        todo = todo[:limit]
+
+    from ..io_manager.storage_backend import get_backend
+    backend = get_backend()
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) if workers > 1 else None
+    started = time.perf_counter()
+    graded = answers_total = 0
+    skipped: Dict[str, str] = {}
+
+    try:
+        with open(results_path, "a", encoding="utf-8") as out:
+            for chunk in _chunks(todo, chunk_size):
+                reports = []
+                for rid in chunk:
+                    answers, wage = load_report(reports_dir, rid)
+                    meta = backend.load_user(rid) or load_json(users_dir / f"{rid}.json")
+                    reason = _skip_reason(answers, meta)
+                    if reason:
+                        # Nothing to judge: no result line, decision or artifact
+                        skipped[rid] = reason
+                        continue
+                    reports.append((rid, meta, answers, wage))
+                if not reports:
+                    continue
+                flat = [a for _, _, answers, _ in reports for a in answers]
+                texts = [a["answer"] for a in flat]
+
+                # Preprocessing runs in the pool while the models score the chunk
+                batches = list(_chunks(texts, PREPROCESS_BATCH))
+                if pool is not None:
+                    pending = pool.map(behavioral_scores, batches)
+                else:
+                    pending = map(behavioral_scores, batches)
+
+                sentiments = analyze_sentiment_batch(texts)
+                relevances = calculate_relevance_batch(texts, [a["question"] for a in flat])
+                behavioral = [score for batch in pending for score in batch]
+
+                for a, sent, rel, beh in zip(flat, sentiments, relevances, behavioral):
+                    a.update(
+                        sentiment=round(float(sent), 4),
+                        relevance=round(float(rel), 4),
+                        grade=round(float(grading_formula(sent, rel)), 4),
+                        behavioral=beh,
+                    )
+
+                lines = []
+                for report_id, meta, answers, wage in reports:
+                    decision = _decide(meta, answers, wage)
+                    lines.append(json.dumps({
+                        "report_id": report_id,
+                        "model_version": version,
+                        "answers": answers,
+                        "decision": decision,
+                    }, ensure_ascii=False))
+                    if apply:
+                        stored = {k: v for k, v in decision.items() if k not in ("username", "position")}
+                        stored["model_version"] = version
+                        backend.save_decision(
+                            report_id, stored, username=decision["username"], position=decision["position"]
+                        )
+                        # The artifact holds the old decision; the next view
+                        # rebuilds it from the report and the stored decision
+                        remove_artifact(reports_dir / f"{report_id}.csv")
+
+                # One append + fsync per chunk: the checkpoint
+                out.write("\n".join(lines) + "\n")
+                out.flush()
+                os.fsync(out.fileno())
+
+                graded += len(reports)
+                answers_total += len(flat)
+                if progress:
+                    rate = graded / max(time.perf_counter() - started, 1e-9)
+                    print(f"  {graded}/{len(todo)} reports ({rate:.1f}/s)")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return {
+        "model_version": version,
+        "out_dir": str(out_dir),
+        "resumed": len(done),
+        "graded": graded,
+        "skipped": skipped,
+        "answers": answers_total,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def load_results(model_version_tag: str = None, out_dir: Path = None) -> Dict[str, Dict]:
+    """
+    report_id -> regrade result for one model version (default: current).
+    """
+    out_dir = Path(out_dir) if out_dir else REGRADE_DIR / (model_version_tag or model_version())
+    results = {}
+    path = out_dir / RESULTS_NAME
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                results[record["report_id"]] = record
+    return results
+
+
+__all__ = [
+    "model_version",
+    "regrade_reports",
+    "load_results",
+    "behavioral_scores",
+    "REGRADE_DIR",
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-grade all stored interview reports.")
+    parser.add_argument("--reports-dir", type=Path, default=REPORTS_DIR)
+    parser.add_argument("--users-dir", type=Path, default=USERS_DIR)
+    parser.add_argument("--out", type=Path, help="output directory (default app/data/regrade/<model_version>)")
+    parser.add_argument("--workers", type=int, default=None, help="preprocessing processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="reports per inference chunk")
+    parser.add_argument("--limit", type=int, default=None, help="grade at most this many reports")
+    parser.add_argument("--apply", action="store_true", help="also store the new decisions via the storage backend (dashboards pick them up)")
+    args = parser.parse_args(argv)
+
+    summary = regrade_reports(
+        reports_dir=args.reports_dir,
+        users_dir=args.users_dir,
+        out_dir=args.out,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        apply=args.apply,
+        limit=args.limit,
+        progress=True,
+    )
+    print(
+        f"Model version {summary['model_version']}: graded {summary['graded']} reports "
+        f"({summary['answers']} answers) in {summary['seconds']}s, "
+        f"{summary['resumed']} already done -> {summary['out_dir']}"
+    )
+    for report_id, reason in sorted(summary["skipped"].items()):
+        print(f"  skipped {report_id}: {reason}")
+
+
+if __name__ == "__main__":
+    main()
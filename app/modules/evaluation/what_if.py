@@ -0,0 +1,200 @@
+# app/modules/evaluation/what_if.py
+"""
+Threshold / wage-penalty what-if simulator
+------------------------------------------
+"What if PASS_THRESHOLD were 0.75, or the φ wage penalty 0.1?" over the
+whole applicant pool.
+
+The pool is loaded once into NumPy arrays from the HR analytics candidate
+table (see hr_analytics.py). The sweep then evaluates every
+(pass threshold, wage penalty) combination in one vectorized pass:
+base scores are computed once, each penalty value is one (N,) subtraction,
+and labels for all thresholds come from broadcasting against the
+threshold grid.
+
+Usage:
+    python -m app.modules.evaluation.what_if --pass 0.7 0.75 0.8 --penalty 0.05 0.1
+    python -m app.modules.evaluation.what_if --by-position
+    python -m app.modules.evaluation.what_if --synthetic 100000   # timing
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..QnA.decisions import DecisionEngine, CONSIDER_THRESHOLD, PASS_THRESHOLD, PHI, WAGE_PENALTY, LABELS
+from ..QnA.questions import JOB_POSITIONS
+from .hr_analytics import ANALYTICS_DIR, DEFAULT_BUDGET, load_candidate_table
+
+
+class CandidatePool(NamedTuple):
+    report_id: np.ndarray       # (N,) str
+    position: np.ndarray        # (N,) str
+    avg_score: np.ndarray       # (N,) average per-question score
+    sentiment: np.ndarray       # (N,) average behavioral sentiment, [-1, 1]
+    months: np.ndarray          # (N,)
+    wage: np.ndarray            # (N,)
+    budget: np.ndarray          # (N,)
+
+    def __len__(self):
+        return len(self.report_id)
+
+
+def pool_from_table(table: pd.DataFrame, budgets: Dict[str, int] = None) -> CandidatePool:
+    """
+    Build the pool from a candidate table (one row per report).
+    """
+    budgets = budgets or {name: info["standard"] for name, info in JOB_POSITIONS.items()}
+    if table.empty:
+        empty = np.array([], dtype=np.float64)
+        return CandidatePool(np.array([], dtype=str), np.array([], dtype=str), empty, empty, empty, empty, empty)
+
+    missing = {"avg_question_score", "avg_sentiment"} - set(table.columns)
+    if missing:
+        raise ValueError(f"Candidate table lacks {sorted(missing)}; refresh it with hr_analytics first")
+    position = table["position"].astype(str).to_numpy()
+    return CandidatePool(
+        report_id=table["report_id"].astype(str).to_numpy(),
+        position=position,
+        avg_score=table["avg_question_score"].to_numpy(dtype=np.float64),
+        sentiment=table["avg_sentiment"].to_numpy(dtype=np.float64),
+        months=table["months_experience"].to_numpy(dtype=np.float64),
+        wage=table["wage_expectation"].to_numpy(dtype=np.float64),
+        budget=pd.Series(position).map(budgets).fillna(DEFAULT_BUDGET).to_numpy(dtype=np.float64),
+    )
+
+
+def load_pool(out_dir: Path = ANALYTICS_DIR, budgets: Dict[str, int] = None) -> CandidatePool:
+    """
+    All stored candidates (run `refresh_candidate_table()` first).
+    """
+    return pool_from_table(load_candidate_table(out_dir), budgets)
+
+
+def synthetic_pool(n: int, seed: int = 0) -> CandidatePool:
+    """Random pool of `n` candidates, for timing the sweep."""
+    rng = np.random.default_rng(seed)
+    positions = np.array(list(JOB_POSITIONS))
+    codes = rng.integers(0, len(positions), n)
+    position = positions[codes]
+    budget = np.array([JOB_POSITIONS[p]["standard"] for p in positions], dtype=np.float64)[codes]
+    return CandidatePool(
+        report_id=np.array([f"sim{i}" for i in range(n)]),
+        position=position,
+        avg_score=rng.beta(5, 2, n),
+        sentiment=rng.uniform(-0.2, 1.0, n),
+        months=rng.integers(0, 36, n).astype(np.float64),
+        wage=budget * rng.uniform(0.5, 2.0, n),
+        budget=budget,
+    )
+
+
+def simulate(
+    pool: CandidatePool,
+    pass_thresholds: Sequence[float] = (PASS_THRESHOLD,),
+    wage_penalties: Sequence[float] = (WAGE_PENALTY,),
+    consider_threshold: float = CONSIDER_THRESHOLD,
+    penalty_ratio: float = PHI,
+    by_position: bool = False,
+) -> pd.DataFrame:
+    """
+    Label counts for every (pass threshold, wage penalty) pair.
+
+    One row per combination (per position with `by_position`):
+    pass_threshold, wage_penalty, [position], n, Layak, Dipertimbangkan,
+    Tidak Layak, pass_rate, mean_final_score.
+    """
+    thresholds = np.asarray(pass_thresholds, dtype=np.float64)
+    penalties = np.asarray(wage_penalties, dtype=np.float64)
+
+    # Penalty-independent part, once for the whole pool
+    engine = DecisionEngine(DEFAULT_BUDGET)
+    base = engine.judge_batch(
+        pool.avg_score, pool.sentiment, pool.months, pool.wage, company_budget=pool.budget,
+        wage_penalty=0.0, penalty_ratio=penalty_ratio,
+    )["base_score"]
+    over_budget = pool.wage / pool.budget >= penalty_ratio
+
+    # (P, N) final scores, then (T, P, N) label masks by broadcasting
+    final = np.round(np.maximum(0.0, base[None, :] - penalties[:, None] * over_budget[None, :]), 4)
+    passed = final[None, :, :] >= thresholds[:, None, None]
+    consider = ~passed & (final >= consider_threshold)[None, :, :]
+
+    if by_position:
+        groups, codes = np.unique(pool.position, return_inverse=True)
+    else:
+        groups, codes = np.array(["all"]), np.zeros(len(pool), dtype=np.intp)
+    n_groups = len(groups)
+
+    # (N, G) one-hot membership: per-group sums are a single matmul
+    onehot = np.zeros((len(pool), n_groups), dtype=np.float64)
+    onehot[np.arange(len(pool)), codes] = 1.0
+
+    n_per_group = np.bincount(codes, minlength=n_groups)
+    n_pass = np.rint(passed.astype(np.float64) @ onehot).astype(np.int64)        # (T, P, G)
+    n_consider = np.rint(consider.astype(np.float64) @ onehot).astype(np.int64)  # (T, P, G)
+    score_sums = final @ onehot                                                  # (P, G)
+
+    t_idx, p_idx, g_idx = np.meshgrid(
+        np.arange(len(thresholds)), np.arange(len(penalties)), np.arange(n_groups), indexing="ij"
+    )
+    t_idx, p_idx, g_idx = t_idx.ravel(), p_idx.ravel(), g_idx.ravel()
+    n = n_per_group[g_idx]
+    layak = n_pass.ravel()
+    dipertimbangkan = n_consider.ravel()
+
+    result = pd.DataFrame({
+        "pass_threshold": thresholds[t_idx],
+        "wage_penalty": penalties[p_idx],
+        "position": groups[g_idx],
+        "n": n,
+        LABELS[0]: layak,
+        LABELS[1]: dipertimbangkan,
+        LABELS[2]: n - layak - dipertimbangkan,
+        "pass_rate": np.round(layak / np.maximum(n, 1), 4),
+        "mean_final_score": np.round(score_sums[p_idx, g_idx] / np.maximum(n, 1), 4),
+    })
+    if not by_position:
+        result = result.drop(columns="position")
+    return result
+
+
+__all__ = [
+    "CandidatePool",
+    "pool_from_table",
+    "load_pool",
+    "synthetic_pool",
+    "simulate",
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep decision thresholds over the candidate pool.")
+    parser.add_argument("--pass", dest="pass_thresholds", type=float, nargs="+", default=[0.7, 0.75, PASS_THRESHOLD, 0.85])
+    parser.add_argument("--penalty", dest="penalties", type=float, nargs="+", default=[0.0, WAGE_PENALTY, 0.1])
+    parser.add_argument("--consider", type=float, default=CONSIDER_THRESHOLD)
+    parser.add_argument("--ratio", type=float, default=PHI, help="wage / budget ratio that triggers the penalty")
+    parser.add_argument("--by-position", action="store_true")
+    parser.add_argument("--synthetic", type=int, default=0, help="use N random candidates instead of stored ones")
+    args = parser.parse_args(argv)
+
+    pool = synthetic_pool(args.synthetic) if args.synthetic else load_pool()
+    if len(pool) == 0:
+        print("No candidates found; run `python -m app.modules.evaluation.hr_analytics` first.")
+        return
+
+    start = time.perf_counter()
+    result = simulate(pool, args.pass_thresholds, args.penalties, args.consider, args.ratio, args.by_position)
+    elapsed = time.perf_counter() - start
+
+    with pd.option_context("display.max_rows", None, "display.width", 160):
+        print(result.to_string(index=False))
+    print(f"\n{len(pool)} candidates x {len(args.pass_thresholds) * len(args.penalties)} scenarios in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+import copy
+import os
+import threading
 import streamlit as st
 import streamlit.components.v1 as components
 from pathlib import Path
@@ -5,17 +8,69 @@ from pathlib import Path
 # Resolve frontend folder absolutely, no matter where Streamlit is run from
 BASE = Path(__file__).resolve().parent.parent.parent / "frontend"
 
+
+def file_mtime(path):
+    """st_mtime_ns of a file, or None if it doesn't exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class MtimeCache:
+    """
+    Process-wide {path: (mtime, value)} cache. A hit needs only a stat;
+    editing the file (new mtime) makes the next get() load it again.
+    Values are deep-copied in and out, so callers may mutate them.
+    Plain dict, no Streamlit runtime needed (importable from scripts/tests).
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, load):
+        """Cached value of `path`, or load(path) when missing / changed; None if no file."""
+        key = str(path)
+        mtime = file_mtime(key)
+        if mtime is None:
+            return None
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, load(key))
+            with self._lock:
+                self._entries[key] = cached
+        return copy.deepcopy(cached[1])
+
+    def put(self, path, value):
+        """Write-through: remember `value` as the content just written to `path`."""
+        key = str(path)
+        with self._lock:
+            self._entries[key] = (file_mtime(key), copy.deepcopy(value))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_static_cache = MtimeCache()
+
+def _read(path):
+    """Return file text (cached per mtime), or None if it doesn't exist."""
+    return _static_cache.get(path, lambda p: Path(p).read_text())
+
 def load_css(name="style.css"):
-    path = BASE / "static" / name
-    if path.exists():
-        st.markdown(f"<style>{path.read_text()}</style>", unsafe_allow_html=True)
+    text = _read(BASE / "static" / name)
+    if text is not None:
+        st.markdown(f"<style>{text}</style>", unsafe_allow_html=True)
 
 def load_js(name="script.js"):
-    path = BASE / "static" / name
-    if path.exists():
-        st.markdown(f"<script>{path.read_text()}</script>", unsafe_allow_html=True)
+    text = _read(BASE / "static" / name)
+    if text is not None:
+        st.markdown(f"<script>{text}</script>", unsafe_allow_html=True)
 
 def render_template(name, height=600):
-    path = BASE / "templates" / name
-    if path.exists():
-        components.html(path.read_text(), height=height, scrolling=True)
+    text = _read(BASE / "templates" / name)
+    if text is not None:
+        components.html(text, height=height, scrolling=True)
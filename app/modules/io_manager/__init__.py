@@ -6,6 +6,11 @@ I/O management layer for JSON and CSV operations.
 Exports:
 - save_json, load_json
 - write_csv, append_csv
+- append_record, materialize_csv, ensure_materialized (append-only answer log)
+- read_scores, write_scores (typed long-format score store, Feather)
+- EmbeddingStore, open_embedding_store (append-only answer embeddings)
+- read_artifact, write_artifact, remove_artifact (precomputed dashboard artifact)
+- get_backend, set_backend (file / SQLite storage backends)
 - USERS_DIR, REPORTS_DIR, TEMP_DIR
 """
 
@@ -21,8 +26,28 @@ from .csvio import (
     create_csv_report,   # <--- WAJIB DITAMBAHKAN
 )
 
+from .answer_log import (
+    log_path_for,
+    append_record,
+    read_records,
+    materialize_csv,
+    ensure_materialized,
+)
+
+from .score_store import scores_path_for, read_scores, write_scores
+from .embedding_store import EmbeddingStore, open_embedding_store
+from .dashboard_artifact import artifact_path_for, read_artifact, write_artifact, remove_artifact
+
 from .storage_paths import USERS_DIR, REPORTS_DIR, TEMP_DIR, ensure_directories
 
+from .storage_backend import (
+    StorageBackend,
+    FileBackend,
+    SQLiteBackend,
+    get_backend,
+    set_backend,
+)
+
 __all__ = [
     "save_json",
     "load_json",
@@ -38,4 +63,23 @@ __all__ = [
     "load_csv_report",
     "append_to_csv",
     "create_csv_report", 
+    "log_path_for",
+    "append_record",
+    "read_records",
+    "materialize_csv",
+    "ensure_materialized",
+    "scores_path_for",
+    "read_scores",
+    "write_scores",
+    "EmbeddingStore",
+    "open_embedding_store",
+    "artifact_path_for",
+    "read_artifact",
+    "write_artifact",
+    "remove_artifact",
+    "StorageBackend",
+    "FileBackend",
+    "SQLiteBackend",
+    "get_backend",
+    "set_backend",
 ]
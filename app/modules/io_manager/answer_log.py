@@ -0,0 +1,199 @@
+# app/modules/io_manager/answer_log.py
+"""
+Append-only answer log (JSON Lines), one file per interview report.
+
+Each answered question is one line:
+    {"label": "Q3", "question": "...", "answer": "...", "score": 0.42}
+
+Appending is O(1) regardless of how many answers are already stored.
+The legacy 4-row column CSV (Label / Question / Answer / Score) is
+produced from the log on demand by `materialize_csv()`; readers call
+`ensure_materialized()` so they always see the latest answers. The log's
+size and mtime at materialize time are kept in <id>.csv.source; the CSV
+is current while they still match the log.
+
+Semantics match `csvio.append_column`: a record whose label already
+exists replaces that column's values in place.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .storage_paths import ensure_directories
+
+# First column of every report, as created by ensure_csv(headers=["ID"])
+BASE_COLUMN = ["ID", "", "", 0.0]
+
+
+def log_path_for(report_path: Path) -> Path:
+    """app/data/reports/<id>.csv -> app/data/reports/<id>.jsonl"""
+    return Path(report_path).with_suffix(".jsonl")
+
+
+def file_signature(path: Path) -> Optional[Dict]:
+    """
+    {"size", "mtime_ns"} of a file, or None if it does not exist.
+    An append changes the size even within one mtime tick.
+    """
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _source_path_for(csv_path: Path) -> Path:
+    """app/data/reports/<id>.csv -> app/data/reports/<id>.csv.source"""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + ".source")
+
+
+def append_record(log_path: Path, label: str, question: str, answer: str, score: float):
+    """
+    Append one answer record to the log.
+    """
+    log_path = Path(log_path)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    record = {
+        "label": str(label),
+        "question": "" if question is None else str(question),
+        "answer": "" if answer is None else str(answer),
+        "score": score,
+    }
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with log_path.open("a", encoding="utf-8") as f:
+        f.write(line)
+        f.flush()
+
+
+def read_records(log_path: Path) -> List[Dict]:
+    """
+    Return all records in append order.
+    A truncated last line (interrupted write) is skipped.
+    """
+    log_path = Path(log_path)
+    if not log_path.exists():
+        return []
+    records = []
+    with log_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def records_from_csv(csv_path: Path) -> List[Dict]:
+    """
+    Read a column-layout CSV report as log records (one per column
+    except ID).
+    """
+    try:
+        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    except Exception:
+        return []
+
+    records = []
+    for col in df.columns:
+        if col == BASE_COLUMN[0]:
+            continue
+        values = df[col].tolist() + [""] * (4 - len(df[col]))
+        try:
+            score = float(values[3]) if values[3] != "" else 0.0
+        except ValueError:
+            score = values[3]
+        records.append({"label": col, "question": values[1], "answer": values[2], "score": score})
+    return records
+
+
+def import_csv_report(csv_path: Path, log_path: Path = None) -> Path:
+    """
+    Seed a log from an existing column-layout CSV report, so reports
+    written before the log existed keep their columns.
+    Does nothing if the log already exists.
+    """
+    csv_path = Path(csv_path)
+    log_path = Path(log_path) if log_path else log_path_for(csv_path)
+    if log_path.exists() or not csv_path.exists():
+        return log_path
+
+    lines = [json.dumps(rec, ensure_ascii=False) + "\n" for rec in records_from_csv(csv_path)]
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with log_path.open("w", encoding="utf-8") as f:
+        f.writelines(lines)
+    return log_path
+
+
+def to_frame(records: List[Dict]) -> pd.DataFrame:
+    """
+    Build the legacy 4-row report DataFrame from log records.
+    """
+    columns: Dict[str, list] = {BASE_COLUMN[0]: list(BASE_COLUMN)}
+    for rec in records:
+        label = rec.get("label", "")
+        columns[label] = [label, rec.get("question", ""), rec.get("answer", ""), rec.get("score", 0.0)]
+    return pd.DataFrame(columns)
+
+
+def materialize_csv(log_path: Path, csv_path: Path = None) -> Path:
+    """
+    Write the column-layout CSV for a log (atomically) and return its path.
+    """
+    ensure_directories()
+    log_path = Path(log_path)
+    csv_path = Path(csv_path) if csv_path else log_path.with_suffix(".csv")
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+
+    signature = file_signature(log_path)  # before reading: later appends leave the CSV stale
+    df = to_frame(read_records(log_path))
+    tmp = csv_path.with_suffix(f".{os.getpid()}.tmp")
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, csv_path)
+
+    source = _source_path_for(csv_path)
+    tmp = source.with_name(f".{source.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(signature), encoding="utf-8")
+    os.replace(tmp, source)
+    return csv_path
+
+
+def ensure_materialized(csv_path: Path) -> bool:
+    """
+    Re-materialize `csv_path` if its log changed since the CSV was written
+    (or the CSV is missing). Returns True when the CSV was rewritten.
+    """
+    csv_path = Path(csv_path)
+    log_path = log_path_for(csv_path)
+    current = file_signature(log_path)
+    if current is None:
+        return False
+    if csv_path.exists():
+        try:
+            stored = json.loads(_source_path_for(csv_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            stored = None
+        if stored == current:
+            return False
+    materialize_csv(log_path, csv_path)
+    return True
+
+
+__all__ = [
+    "log_path_for",
+    "file_signature",
+    "append_record",
+    "read_records",
+    "records_from_csv",
+    "import_csv_report",
+    "to_frame",
+    "materialize_csv",
+    "ensure_materialized",
+]
@@ -0,0 +1,94 @@
+# app/modules/io_manager/dashboard_artifact.py
+"""
+Precomputed dashboard artifact, one JSON file per report:
+
+    app/data/reports/<id>.dashboard.json
+
+Written when an interview is finalized with
+everything the dashboard shows: score vector, questions / answers, top
+keywords, weighted terms, decision and a Plotly figure spec. Dashboard
+views only deserialize it.
+
+`read_artifact()` returns None (caller rebuilds) when the file is
+missing, unreadable, of another ARTIFACT_VERSION, or when the report's
+source (answer log, else CSV) no longer has the size and mtime recorded
+in the artifact (see score_store.source_signature). `remove_artifact()`
+forces a rebuild (e.g. after a new decision was stored for the report).
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from .score_store import source_signature
+
+ARTIFACT_SUFFIX = ".dashboard.json"
+ARTIFACT_VERSION = 1
+
+
+def artifact_path_for(report_path: Path) -> Path:
+    """app/data/reports/<id>.csv -> app/data/reports/<id>.dashboard.json"""
+    report_path = Path(report_path)
+    return report_path.with_name(report_path.stem + ARTIFACT_SUFFIX)
+
+
+def write_artifact(report_path: Path, payload: Dict, source: Optional[Dict] = None) -> Path:
+    """
+    Write the artifact for a report (atomically) and return its path.
+    `source` is the source_signature() taken before `payload` was built;
+    without it the artifact is rebuilt on its first read.
+    """
+    path = artifact_path_for(report_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "version": ARTIFACT_VERSION,
+        "report": Path(report_path).stem,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        **payload,
+        "source": source,
+    }
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def read_artifact(report_path: Path, stale_ok: bool = False) -> Optional[Dict]:
+    """
+    The artifact for the report at `report_path` (the <id>.csv path), or
+    None if it has to be rebuilt. With `stale_ok`, an artifact built from
+    an earlier state of the report is returned as well.
+    """
+    report_path = Path(report_path)
+    try:
+        data = json.loads(artifact_path_for(report_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != ARTIFACT_VERSION:
+        return None
+    if not stale_ok:
+        current = source_signature(report_path)
+        if current is not None and data.get("source") != current:
+            return None
+    return data
+
+
+def remove_artifact(report_path: Path) -> bool:
+    """Delete the artifact of a report; True if there was one."""
+    try:
+        artifact_path_for(report_path).unlink()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+__all__ = [
+    "ARTIFACT_SUFFIX",
+    "ARTIFACT_VERSION",
+    "artifact_path_for",
+    "write_artifact",
+    "read_artifact",
+    "remove_artifact",
+]
@@ -0,0 +1,219 @@
+# app/modules/io_manager/embedding_store.py
+"""
+Append-only store of answer embeddings, one matrix per encoder:
+
+    app/data/embeddings/<model hash>/vectors.bin
+        256-byte header  b"HIREMB1\\n" + JSON {"model", "dim", "dtype"}, space padded
+        rows             dtype[dim], appended, never rewritten
+    app/data/embeddings/<model hash>/index/<user_id>.jsonl
+        {"key": "Q3", "row": 1234}    one line per stored answer
+
+Grading appends each answer's vector once; readers memory-map the matrix
+and get rows for a user through the offset index, so dashboards and
+analyses never run the encoder again. Rows are written with a single
+O_APPEND write, so several workers can share one matrix; the row number
+comes from the file offset after the write.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .storage_paths import DATA_ROOT
+
+EMBEDDINGS_DIR = DATA_ROOT / "embeddings"
+MATRIX_NAME = "vectors.bin"
+INDEX_DIR_NAME = "index"
+MAGIC = b"HIREMB1\n"
+HEADER_SIZE = 256
+DEFAULT_DTYPE = "<f2"
+
+
+def _model_dir(model_id: str, root: Path) -> Path:
+    return Path(root) / hashlib.sha256(model_id.encode("utf-8")).hexdigest()[:12]
+
+
+def _read_header(path: Path) -> Dict:
+    with Path(path).open("rb") as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE or not raw.startswith(MAGIC):
+        raise ValueError(f"Not an embedding matrix: {path}")
+    return json.loads(raw[len(MAGIC):].decode("utf-8").strip())
+
+
+class EmbeddingStore:
+    """
+    Embeddings of one encoder (`model_id`), shared by all users.
+    """
+
+    def __init__(self, model_id: str, dim: int, root: Path = EMBEDDINGS_DIR, dtype: str = DEFAULT_DTYPE):
+        self.model_id = model_id
+        self.dim = int(dim)
+        self.dtype = np.dtype(dtype)
+        self.dir = _model_dir(model_id, root)
+        self.path = self.dir / MATRIX_NAME
+        self.index_dir = self.dir / INDEX_DIR_NAME
+        self.row_bytes = self.dim * self.dtype.itemsize
+        self._matrix: Optional[np.memmap] = None
+
+    @classmethod
+    def open(cls, model_id: str, root: Path = EMBEDDINGS_DIR) -> Optional["EmbeddingStore"]:
+        """
+        Store of an existing matrix (dim / dtype from its header), or None
+        if nothing was stored for `model_id` yet.
+        """
+        path = _model_dir(model_id, root) / MATRIX_NAME
+        if not path.exists():
+            return None
+        header = _read_header(path)
+        if header.get("model") != model_id:
+            raise ValueError(f"{path} holds embeddings of {header.get('model')!r}, not {model_id!r}")
+        return cls(model_id, header["dim"], root, header["dtype"])
+
+    def header(self) -> Dict:
+        return {"model": self.model_id, "dim": self.dim, "dtype": self.dtype.str}
+
+    def _create(self):
+        """Write the header once; an existing matrix must match it."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.index_dir.mkdir(exist_ok=True)
+        if self.path.exists():
+            if _read_header(self.path) != self.header():
+                raise ValueError(f"{self.path} header does not match {self.header()}")
+            return
+        raw = MAGIC + json.dumps(self.header()).encode("utf-8")
+        tmp = self.path.with_name(f".{MATRIX_NAME}.{os.getpid()}.tmp")
+        tmp.write_bytes(raw.ljust(HEADER_SIZE, b" "))
+        try:
+            # First writer wins; a concurrent creator's header is identical
+            os.link(tmp, self.path)
+        except FileExistsError:
+            pass
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    # -------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------
+    def append(self, user_id: str, keys: Sequence[str], vectors: np.ndarray) -> List[int]:
+        """
+        Store one vector per key for `user_id`; returns their row numbers.
+        Storing a key again makes the new row the current one.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=self.dtype).reshape(-1, self.dim)
+        if len(vectors) != len(keys):
+            raise ValueError("keys and vectors must have the same length")
+        if not len(keys):
+            return []
+        self._create()
+
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, vectors.tobytes())
+            end = os.lseek(fd, 0, os.SEEK_CUR)
+        finally:
+            os.close(fd)
+        first = (end - HEADER_SIZE) // self.row_bytes - len(keys)
+        rows = list(range(first, first + len(keys)))
+
+        lines = "".join(json.dumps({"key": str(k), "row": r}) + "\n" for k, r in zip(keys, rows))
+        with self._index_path(user_id).open("a", encoding="utf-8") as f:
+            f.write(lines)
+        return rows
+
+    # -------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------
+    def _index_path(self, user_id: str) -> Path:
+        return self.index_dir / f"{user_id}.jsonl"
+
+    def __len__(self) -> int:
+        if not self.path.exists():
+            return 0
+        return (self.path.stat().st_size - HEADER_SIZE) // self.row_bytes
+
+    def matrix(self) -> np.ndarray:
+        """
+        Read-only memory map of all complete rows, (n, dim). Re-mapped
+        when other writers have appended since the last call.
+        """
+        n = len(self)
+        if n <= 0:
+            return np.empty((0, self.dim), dtype=self.dtype)
+        if self._matrix is None or len(self._matrix) != n:
+            self._matrix = np.memmap(self.path, dtype=self.dtype, mode="r", offset=HEADER_SIZE, shape=(n, self.dim))
+        return self._matrix
+
+    def rows(self, user_id: str) -> Dict[str, int]:
+        """{key: row} for a user, latest row per key, in storage order."""
+        path = self._index_path(user_id)
+        if not path.exists():
+            return {}
+        out: Dict[str, int] = {}
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # interrupted write
+                out.pop(entry["key"], None)
+                out[entry["key"]] = int(entry["row"])
+        return out
+
+    def vectors(self, user_id: str, keys: Sequence[str] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        (keys, (n, dim) vectors) for a user, optionally limited to `keys`.
+        A run of consecutive rows (one grading batch) is returned as a
+        view on the memory map, without copying.
+        """
+        rows = self.rows(user_id)
+        if keys is not None:
+            rows = {k: rows[k] for k in keys if k in rows}
+        matrix = self.matrix()
+        rows = {k: r for k, r in rows.items() if r < len(matrix)}
+        if not rows:
+            return [], np.empty((0, self.dim), dtype=self.dtype)
+
+        idx = np.fromiter(rows.values(), dtype=np.int64, count=len(rows))
+        if np.all(np.diff(idx) == 1):
+            return list(rows), matrix[idx[0]:idx[-1] + 1]
+        return list(rows), matrix[idx]
+
+    def get(self, user_id: str, key: str) -> Optional[np.ndarray]:
+        """One stored vector (a view on the memory map), or None."""
+        row = self.rows(user_id).get(str(key))
+        matrix = self.matrix()
+        if row is None or row >= len(matrix):
+            return None
+        return matrix[row]
+
+
+_stores: Dict[Tuple[str, str], EmbeddingStore] = {}
+
+
+def open_embedding_store(model_id: str, dim: int = None, root: Path = EMBEDDINGS_DIR) -> Optional[EmbeddingStore]:
+    """
+    Process-wide store for `model_id`. Without `dim`, only an existing
+    matrix is opened (None if nothing was stored yet).
+    """
+    key = (model_id, str(root))
+    store = _stores.get(key)
+    if store is None:
+        store = EmbeddingStore.open(model_id, root)
+        if store is None:
+            if dim is None:
+                return None
+            store = EmbeddingStore(model_id, dim, root)
+        _stores[key] = store
+    return store
+
+
+__all__ = [
+    "EMBEDDINGS_DIR",
+    "EmbeddingStore",
+    "open_embedding_store",
+]
@@ -0,0 +1,107 @@
+# app/modules/io_manager/migrate.py
+"""
+Import an existing app/data tree into the SQLite backend.
+
+- users/*.json             -> users
+- reports/<id>.jsonl       -> answers + scores (or reports/<id>.csv when
+                              no log exists yet)
+- FINAL summary column     -> decisions
+
+Usage:
+    python -m app.modules.io_manager.migrate [--db app/data/hireon.db] [--data app/data]
+
+Re-running is safe for users and decisions (upserts); answers of a report
+that is already present in the database are skipped.
+"""
+
+import argparse
+import ast
+from pathlib import Path
+from typing import Dict
+
+from .jsonio import load_json
+from .answer_log import read_records, records_from_csv, log_path_for
+from .storage_backend import SQLiteBackend, SQLITE_PATH
+from .storage_paths import DATA_ROOT
+
+
+def _parse_summary(text) -> Dict:
+    """FINAL answers hold str(dict) as written by Judger.finalize."""
+    try:
+        value = ast.literal_eval(str(text))
+        return value if isinstance(value, dict) else {}
+    except (ValueError, SyntaxError):
+        return {}
+
+
+def migrate(db_path: Path = SQLITE_PATH, data_root: Path = DATA_ROOT) -> Dict[str, int]:
+    """
+    Import users and reports under `data_root` into the database at
+    `db_path`. Returns counts of imported rows.
+    """
+    data_root = Path(data_root)
+    backend = SQLiteBackend(db_path)
+    counts = {"users": 0, "reports": 0, "answers": 0, "decisions": 0}
+
+    # --- Users ---
+    user_positions = {}
+    for file in sorted((data_root / "users").glob("*.json")):
+        data = load_json(file)
+        if not data.get("Username"):
+            continue
+        backend.save_user(data)
+        counts["users"] += 1
+        for key in (data.get("File_ID"), data.get("Username")):
+            if key:
+                user_positions[key] = (data.get("Username"), data.get("Position"))
+
+    # --- Reports ---
+    reports_dir = data_root / "reports"
+    report_ids = sorted({p.stem for p in reports_dir.glob("*.jsonl")} |
+                        {p.stem for p in reports_dir.glob("*.csv")})
+    conn = backend._conn()
+    for report_id in report_ids:
+        exists = conn.execute("SELECT 1 FROM answers WHERE report_id = ? LIMIT 1", (report_id,)).fetchone()
+        if exists:
+            continue
+
+        log_path = log_path_for(reports_dir / f"{report_id}.csv")
+        if log_path.exists():
+            records = read_records(log_path)
+        else:
+            records = records_from_csv(reports_dir / f"{report_id}.csv")
+        if not records:
+            continue
+
+        counts["reports"] += 1
+        summary = None
+        for rec in records:
+            backend.append_answer(report_id, rec["label"], rec.get("question", ""), rec.get("answer", ""), rec.get("score", 0.0))
+            counts["answers"] += 1
+            if rec["label"] == "FINAL":
+                summary = _parse_summary(rec.get("answer"))
+
+        if summary:
+            username, position = user_positions.get(report_id, (None, None))
+            backend.save_decision(report_id, summary, username=username, position=position)
+            counts["decisions"] += 1
+
+    backend.close()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import app/data into the SQLite backend.")
+    parser.add_argument("--db", type=Path, default=SQLITE_PATH, help="SQLite database path")
+    parser.add_argument("--data", type=Path, default=DATA_ROOT, help="data root to import")
+    args = parser.parse_args(argv)
+
+    counts = migrate(args.db, args.data)
+    print(
+        f"Imported {counts['users']} users, {counts['reports']} reports "
+        f"({counts['answers']} answers), {counts['decisions']} decisions into {args.db}"
+    )
+
+
+if __name__ == "__main__":
+    main()
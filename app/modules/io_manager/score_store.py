@@ -0,0 +1,166 @@
+# app/modules/io_manager/score_store.py
+"""
+Long-format, typed score store (Arrow / Feather), one file per report:
+
+    app/data/reports/<id>.scores.feather
+
+One row per answer:
+    seq       int16      interview order
+    label     category   L1, L2, Q1..Q16, Wage_Expectation, FINAL
+    question  string
+    answer    string
+    score     float32    NaN where the stored score is not numeric
+
+Readers ask for the columns they need (`columns=["label", "score"]`);
+Feather reads only those columns from disk, already typed, so views no
+longer re-parse the 4-row mixed-type CSV.
+
+`read_scores()` is also the compatibility reader: the Feather file
+records, in its schema metadata, the size and mtime of the source it was
+built from (the answer log <id>.jsonl, or the legacy column-layout CSV
+when there is no log). When the file is missing or that source has
+changed since, the frame is rebuilt from the source and the Feather file
+is refreshed for the next read.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from .answer_log import file_signature, log_path_for, read_records, records_from_csv
+
+SCORES_SUFFIX = ".scores.feather"
+COLUMNS = ["seq", "label", "question", "answer", "score"]
+SCORE_COLUMNS = ["label", "score"]
+NON_ANSWER_LABELS = ("FINAL", "Wage_Expectation")
+SOURCE_METADATA_KEY = b"hireon.source"
+
+
+def scores_path_for(report_path: Path) -> Path:
+    """app/data/reports/<id>.csv -> app/data/reports/<id>.scores.feather"""
+    report_path = Path(report_path)
+    return report_path.with_name(report_path.stem + SCORES_SUFFIX)
+
+
+def records_to_frame(records: List[Dict]) -> pd.DataFrame:
+    """
+    Long typed frame from answer-log records. A later record with the
+    same label replaces the earlier one (as in the CSV layout) but keeps
+    its position.
+    """
+    latest: Dict[str, Dict] = {}
+    for rec in records:
+        latest[str(rec.get("label", ""))] = rec
+
+    labels = list(latest)
+    df = pd.DataFrame({
+        "seq": pd.Series(range(len(labels)), dtype="int16"),
+        "label": pd.Categorical(labels),
+        "question": pd.Series([str(latest[l].get("question") or "") for l in labels], dtype="string"),
+        "answer": pd.Series([str(latest[l].get("answer") or "") for l in labels], dtype="string"),
+        "score": pd.to_numeric(
+            pd.Series([latest[l].get("score") for l in labels], dtype="object"), errors="coerce"
+        ).astype("float32"),
+    })
+    return df[COLUMNS]
+
+
+def write_scores(records: List[Dict], path: Path, source: Optional[Dict] = None) -> Path:
+    """
+    Write the Feather file for a report (atomically) and return its path.
+    `source` is the source_signature() taken before `records` were read;
+    without it the file is rebuilt on its first read_scores().
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(records_to_frame(records), preserve_index=False)
+    if source is not None:
+        metadata = dict(table.schema.metadata or {})
+        metadata[SOURCE_METADATA_KEY] = json.dumps(source).encode("utf-8")
+        table = table.replace_schema_metadata(metadata)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    feather.write_feather(table, tmp, compression="uncompressed")
+    os.replace(tmp, path)
+    return path
+
+
+def _source(report_path: Path) -> Optional[Path]:
+    """The answer log of a report, else its CSV; None if neither exists."""
+    for candidate in (log_path_for(report_path), Path(report_path)):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def source_signature(report_path: Path) -> Optional[Dict]:
+    """{"source", "size", "mtime_ns"} of the file the scores are built from."""
+    source = _source(report_path)
+    signature = file_signature(source) if source is not None else None
+    if signature is None:
+        return None
+    return {"source": source.name, **signature}
+
+
+def _stored_signature(path: Path) -> Optional[Dict]:
+    """Source signature recorded in a Feather file (schema only is read)."""
+    try:
+        with pa.OSFile(str(path), "rb") as f:
+            metadata = pa.ipc.open_file(f).schema.metadata or {}
+        return json.loads(metadata[SOURCE_METADATA_KEY])
+    except (OSError, KeyError, ValueError, pa.ArrowInvalid):
+        return None
+
+
+def read_scores(report_path: Path, columns: Sequence[str] = None, answers_only: bool = False) -> pd.DataFrame:
+    """
+    Typed long frame for the report at `report_path` (the <id>.csv path).
+
+    columns      : subset of COLUMNS to load (default: all)
+    answers_only : drop the FINAL / Wage_Expectation rows
+
+    Raises FileNotFoundError when the report has no Feather file, log or CSV.
+    """
+    report_path = Path(report_path)
+    path = scores_path_for(report_path)
+    wanted = list(columns) if columns else list(COLUMNS)
+    load = wanted if not answers_only or "label" in wanted else wanted + ["label"]
+
+    # Taken before reading: an append after this point (even within the
+    # same mtime tick, since the size changes) leaves the file stale
+    signature = source_signature(report_path)
+    if path.exists() and (signature is None or _stored_signature(path) == signature):
+        df = pd.read_feather(path, columns=load)
+    elif signature is not None:
+        # Legacy column-layout CSV when there is no answer log
+        source = Path(report_path).with_name(signature["source"])
+        records = read_records(source) if source.suffix == ".jsonl" else records_from_csv(source)
+        try:
+            write_scores(records, path, source=signature)
+        except OSError:
+            pass  # read-only tree: serve from memory
+        df = records_to_frame(records)[load]
+    else:
+        raise FileNotFoundError(f"No scores for report {report_path}")
+
+    if answers_only:
+        df = df[~df["label"].isin(NON_ANSWER_LABELS)]
+        if "label" not in wanted:
+            df = df.drop(columns="label")
+    return df.reset_index(drop=True)
+
+
+__all__ = [
+    "SCORES_SUFFIX",
+    "COLUMNS",
+    "SCORE_COLUMNS",
+    "scores_path_for",
+    "source_signature",
+    "records_to_frame",
+    "write_scores",
+    "read_scores",
+]
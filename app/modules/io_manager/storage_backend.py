@@ -0,0 +1,405 @@
+# app/modules/io_manager/storage_backend.py
+"""
+Pluggable storage backend behind the io_manager API.
+
+- FileBackend   : today's layout (one JSON per user, JSONL/CSV per report)
+- SQLiteBackend : one embedded database (WAL mode) with tables for users,
+                  answers, scores and decisions, indexed by username,
+                  position and date
+
+The active backend is chosen with `set_backend()` or the environment:
+    HIREON_STORAGE_BACKEND=file|sqlite   (default: file)
+    HIREON_SQLITE_PATH=app/data/hireon.db
+
+Existing data can be imported with:
+    python -m app.modules.io_manager.migrate
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .jsonio import save_json, load_json
+from .answer_log import append_record, read_records, log_path_for, to_frame
+from .score_store import scores_path_for, source_signature, write_scores
+from .storage_paths import DATA_ROOT, USERS_DIR, REPORTS_DIR, ensure_directories
+
+SQLITE_PATH = DATA_ROOT / "hireon.db"
+
+
+class StorageBackend:
+    """
+    Base class for storage backends.
+    `report_id` is the id a Judger writes under (File_ID or username).
+    """
+
+    name = "base"
+
+    # -- users ----------------------------------------------------------
+    def save_user(self, metadata: Dict, filename: Optional[str] = None):
+        raise NotImplementedError("StorageBackend must implement save_user().")
+
+    def load_user(self, username: str) -> Optional[Dict]:
+        raise NotImplementedError("StorageBackend must implement load_user().")
+
+    # -- reports --------------------------------------------------------
+    def append_answer(self, report_id: str, label: str, question: str, answer: str, score: float):
+        raise NotImplementedError("StorageBackend must implement append_answer().")
+
+    def load_answers(self, report_id: str) -> List[Dict]:
+        raise NotImplementedError("StorageBackend must implement load_answers().")
+
+    def save_decision(self, report_id: str, decision: Dict, username: str = None, position: str = None):
+        raise NotImplementedError("StorageBackend must implement save_decision().")
+
+    def load_decision(self, report_id: str) -> Optional[Dict]:
+        raise NotImplementedError("StorageBackend must implement load_decision().")
+
+    # -- shared helpers -------------------------------------------------
+    def materialize_report(self, report_id: str, csv_path: Path = None) -> Path:
+        """
+        Write the legacy 4-row column CSV for `report_id`, plus the typed
+        long-format score file next to it (see score_store.py).
+        """
+        ensure_directories()
+        csv_path = Path(csv_path) if csv_path else Path(REPORTS_DIR) / f"{report_id}.csv"
+        csv_path.parent.mkdir(parents=True, exist_ok=True)
+        signature = source_signature(csv_path)  # before reading the answers
+        records = self.load_answers(report_id)
+        tmp = csv_path.with_suffix(f".{os.getpid()}.tmp")
+        to_frame(records).to_csv(tmp, index=False)
+        os.replace(tmp, csv_path)
+        if signature is None or signature["source"] == csv_path.name:
+            signature = source_signature(csv_path)  # no answer log: the CSV is the source
+        write_scores(records, scores_path_for(csv_path), source=signature)
+        return csv_path
+
+    def close(self):
+        pass
+
+
+# =====================================================================
+# File backend (default)
+# =====================================================================
+class FileBackend(StorageBackend):
+    """
+    users/<name>.json + reports/<report_id>.jsonl (+ materialized CSV).
+    Decisions are stored next to the report as <report_id>.decision.json.
+    """
+
+    name = "file"
+
+    def __init__(self, users_dir: Path = USERS_DIR, reports_dir: Path = REPORTS_DIR):
+        self.users_dir = Path(users_dir)
+        self.reports_dir = Path(reports_dir)
+        self._user_index = None
+
+    def _index(self):
+        """
+        Username index of users_dir: the process-wide one for USERS_DIR,
+        else a private one kept next to the directory (<dir>.index.json).
+        """
+        from ..auth.user_index import UserIndex, user_index
+
+        if self._user_index is None:
+            if self.users_dir == Path(USERS_DIR):
+                self._user_index = user_index
+            else:
+                index_path = self.users_dir.with_name(f"{self.users_dir.name}.index.json")
+                self._user_index = UserIndex(self.users_dir, index_path)
+        return self._user_index
+
+    def save_user(self, metadata: Dict, filename: Optional[str] = None):
+        index = self._index()
+        username = metadata.get("Username", "")
+        path = self.users_dir / (filename or f"{username}.json")
+        before = index.stamp()
+        save_json(metadata, path)
+        index.add(username, path, before=before)
+        return path
+
+    def load_user(self, username: str) -> Optional[Dict]:
+        index = self._index()
+        path = index.lookup(username)
+        if path is None:
+            return None
+        data = load_json(path)
+        if data.get("Username") != username:
+            # File changed owner or was removed: rescan once
+            index.rebuild()
+            path = index.lookup(username)
+            data = load_json(path) if path else {}
+        return data if data.get("Username") == username else None
+
+    def append_answer(self, report_id, label, question, answer, score):
+        append_record(self._log_path(report_id), label, question, answer, score)
+
+    def load_answers(self, report_id):
+        return read_records(self._log_path(report_id))
+
+    def save_decision(self, report_id, decision, username=None, position=None):
+        save_json(
+            {"report_id": report_id, "username": username, "position": position, **decision},
+            self.reports_dir / f"{report_id}.decision.json",
+        )
+
+    def load_decision(self, report_id):
+        data = load_json(self.reports_dir / f"{report_id}.decision.json")
+        return data or None
+
+    def _log_path(self, report_id: str) -> Path:
+        return log_path_for(self.reports_dir / f"{report_id}.csv")
+
+
+# =====================================================================
+# SQLite backend
+# =====================================================================
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username    TEXT PRIMARY KEY,
+    file_id     TEXT,
+    position    TEXT,
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_users_file_id  ON users(file_id);
+CREATE INDEX IF NOT EXISTS idx_users_position ON users(position);
+CREATE INDEX IF NOT EXISTS idx_users_created  ON users(created_at);
+
+CREATE TABLE IF NOT EXISTS answers (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    report_id   TEXT NOT NULL,
+    label       TEXT NOT NULL,
+    question    TEXT,
+    answer      TEXT,
+    created_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_answers_report  ON answers(report_id, id);
+CREATE INDEX IF NOT EXISTS idx_answers_created ON answers(created_at);
+
+CREATE TABLE IF NOT EXISTS scores (
+    answer_id   INTEGER PRIMARY KEY REFERENCES answers(id) ON DELETE CASCADE,
+    report_id   TEXT NOT NULL,
+    label       TEXT NOT NULL,
+    score       REAL,
+    raw         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scores_report ON scores(report_id, label);
+
+CREATE TABLE IF NOT EXISTS decisions (
+    report_id   TEXT PRIMARY KEY,
+    username    TEXT,
+    position    TEXT,
+    label       TEXT,
+    final_score REAL,
+    decided_at  TEXT NOT NULL,
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_username ON decisions(username);
+CREATE INDEX IF NOT EXISTS idx_decisions_position ON decisions(position, final_score);
+CREATE INDEX IF NOT EXISTS idx_decisions_date     ON decisions(decided_at);
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Single-file SQLite database in WAL mode: readers never block the
+    writer, so concurrent Streamlit sessions can share it.
+    One connection per thread; `close()` closes all of them.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path = SQLITE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can close it from
+            # another thread; each thread still uses its own connection
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    # -- users ----------------------------------------------------------
+    def save_user(self, metadata, filename=None):
+        username = metadata.get("Username", "")
+        now = _now()
+        with self._conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO users (username, file_id, position, created_at, updated_at, data)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(username) DO UPDATE SET
+                    file_id = excluded.file_id,
+                    position = excluded.position,
+                    updated_at = excluded.updated_at,
+                    data = excluded.data
+                """,
+                (
+                    username,
+                    metadata.get("File_ID"),
+                    metadata.get("Position"),
+                    now,
+                    now,
+                    json.dumps(metadata, ensure_ascii=False),
+                ),
+            )
+
+    def load_user(self, username):
+        row = self._conn().execute("SELECT data FROM users WHERE username = ?", (username,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    # -- reports --------------------------------------------------------
+    def append_answer(self, report_id, label, question, answer, score):
+        try:
+            numeric = float(score)
+        except (TypeError, ValueError):
+            numeric = None
+        with self._conn() as conn:
+            cur = conn.execute(
+                "INSERT INTO answers (report_id, label, question, answer, created_at) VALUES (?, ?, ?, ?, ?)",
+                (report_id, str(label), question, answer, _now()),
+            )
+            conn.execute(
+                "INSERT INTO scores (answer_id, report_id, label, score, raw) VALUES (?, ?, ?, ?, ?)",
+                (cur.lastrowid, report_id, str(label), numeric, None if numeric is not None else str(score)),
+            )
+
+    def load_answers(self, report_id):
+        rows = self._conn().execute(
+            """
+            SELECT a.label, a.question, a.answer, s.score, s.raw
+            FROM answers a LEFT JOIN scores s ON s.answer_id = a.id
+            WHERE a.report_id = ?
+            ORDER BY a.id
+            """,
+            (report_id,),
+        ).fetchall()
+        return [
+            {
+                "label": r["label"],
+                "question": r["question"] or "",
+                "answer": r["answer"] or "",
+                "score": r["score"] if r["score"] is not None else (r["raw"] or 0.0),
+            }
+            for r in rows
+        ]
+
+    def save_decision(self, report_id, decision, username=None, position=None):
+        with self._conn() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO decisions
+                    (report_id, username, position, label, final_score, decided_at, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    report_id,
+                    username,
+                    position,
+                    decision.get("label"),
+                    decision.get("final_score"),
+                    _now(),
+                    json.dumps(decision, ensure_ascii=False, default=str),
+                ),
+            )
+
+    def load_decision(self, report_id):
+        row = self._conn().execute("SELECT data FROM decisions WHERE report_id = ?", (report_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    # -- cross-candidate queries ---------------------------------------
+    def query_decisions(self, position: str = None, since: str = None) -> pd.DataFrame:
+        """
+        Decisions (one row per report), optionally filtered by position and
+        ISO date lower bound; served from the position/date indexes.
+        """
+        sql = "SELECT report_id, username, position, label, final_score, decided_at FROM decisions WHERE 1=1"
+        params = []
+        if position:
+            sql += " AND position = ?"
+            params.append(position)
+        if since:
+            sql += " AND decided_at >= ?"
+            params.append(since)
+        sql += " ORDER BY final_score DESC"
+        return pd.read_sql_query(sql, self._conn(), params=params)
+
+    def close(self):
+        """Close the connections of all threads."""
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
+        # Fresh thread-local storage: every thread reconnects on next use
+        self._local = threading.local()
+
+
+# =====================================================================
+# Active backend
+# =====================================================================
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> StorageBackend:
+    """
+    Return the process-wide backend (created from the environment on
+    first use).
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                kind = os.environ.get("HIREON_STORAGE_BACKEND", "file").lower()
+                if kind == "sqlite":
+                    _backend = SQLiteBackend(Path(os.environ.get("HIREON_SQLITE_PATH", SQLITE_PATH)))
+                else:
+                    _backend = FileBackend()
+    return _backend
+
+
+def set_backend(backend: StorageBackend):
+    """
+    Replace the process-wide backend (closing the previous one).
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is not None and _backend is not backend:
+            _backend.close()
+        _backend = backend
+
+
+__all__ = [
+    "StorageBackend",
+    "FileBackend",
+    "SQLiteBackend",
+    "get_backend",
+    "set_backend",
+    "SQLITE_PATH",
+]
@@ -6,16 +6,274 @@ Features:
 - Supports console + file logging
 - Automatically creates log directories
 - Can log general events or user-specific events
+
+Records are handed to a bounded in-memory queue (QueueHandler) and written
+by one background QueueListener thread, so logging never waits on disk in
+the request path; when the queue is full, records are dropped and counted
+instead of blocking.
+
+The listener routes each record to a file sink:
+    app/data/logs/<name>_<YYYYMMDD>.log      general loggers (get_logger)
+    app/data/logs/users/<user_id>.log        user events (log_user_event)
+
+Open sinks are kept in an LRU pool (`max_open_sinks`), so the number of
+file descriptors stays bounded however many users log. Files rotate at
+`max_bytes` into gzip-compressed backups (<file>.1.gz ... <file>.N.gz).
+
+JSON-lines records instead of plain text: HIREON_LOG_JSON=1 or
+configure_logging(json_format=True).
 """
 
+import atexit
+import gzip
+import json
 import logging
+import os
+import queue
+import shutil
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime
 from logging import Logger
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from datetime import datetime
+from typing import Optional
 
 LOG_DIR = Path("app/data/logs")
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+QUEUE_SIZE = 10_000
+MAX_OPEN_SINKS = 64
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+USER_TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+CONSOLE_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+USER_LOGGER = "hireon.users"
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, user_id (for
+    user events), any `extra` fields and the formatted exception.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class GzipRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler whose backups are gzip-compressed. The file is
+    opened lazily (on the first record).
+    """
+
+    def __init__(self, filename, max_bytes: int = MAX_BYTES, backup_count: int = BACKUP_COUNT):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self.namer = lambda name: name + ".gz"
+        self.rotator = self._compress
+
+    @staticmethod
+    def _compress(source: str, dest: str):
+        with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+
+class SinkPool:
+    """
+    LRU pool of open file sinks keyed by path; the least recently used
+    sink is closed when more than `max_open` are open. Only the listener
+    thread uses the pool.
+    """
+
+    def __init__(self, max_open: int = MAX_OPEN_SINKS, max_bytes: int = MAX_BYTES, backup_count: int = BACKUP_COUNT):
+        self.max_open = max_open
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._sinks: "OrderedDict[Path, GzipRotatingFileHandler]" = OrderedDict()
+
+    def get(self, path: Path, formatter: logging.Formatter) -> GzipRotatingFileHandler:
+        sink = self._sinks.get(path)
+        if sink is not None:
+            self._sinks.move_to_end(path)
+            return sink
+        path.parent.mkdir(parents=True, exist_ok=True)
+        sink = GzipRotatingFileHandler(path, self.max_bytes, self.backup_count)
+        sink.setFormatter(formatter)
+        self._sinks[path] = sink
+        while len(self._sinks) > self.max_open:
+            _, oldest = self._sinks.popitem(last=False)
+            oldest.close()
+        return sink
+
+    def __len__(self):
+        return len(self._sinks)
+
+    def close(self):
+        while self._sinks:
+            _, sink = self._sinks.popitem(last=False)
+            sink.close()
+
+
+class _Dispatcher(logging.Handler):
+    """
+    Listener-side handler: routes each record to its file sink (and
+    general records to the console).
+    """
+
+    def __init__(self, log_dir: Path, pool: SinkPool, json_format: bool, console: bool):
+        super().__init__()
+        self.log_dir = Path(log_dir)
+        self.pool = pool
+        if json_format:
+            self.file_formatter = self.user_formatter = JsonFormatter()
+        else:
+            self.file_formatter = logging.Formatter(TEXT_FORMAT)
+            self.user_formatter = logging.Formatter(USER_TEXT_FORMAT)
+        self.console = None
+        if console:
+            self.console = logging.StreamHandler(sys.stderr)
+            self.console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            user_id = getattr(record, "user_id", None)
+            if user_id is not None and record.name == USER_LOGGER:
+                sink = self.pool.get(self.log_dir / "users" / f"{user_id}.log", self.user_formatter)
+            else:
+                if self.console is not None:
+                    self.console.handle(record)
+                day = datetime.fromtimestamp(record.created).strftime("%Y%m%d")
+                sink = self.pool.get(self.log_dir / f"{record.name}_{day}.log", self.file_formatter)
+            sink.handle(record)
+        except Exception:
+            self.handleError(record)  # never let a bad record kill the listener
+
+    def close(self):
+        self.pool.close()
+        super().close()
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records when the queue is full."""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _NonBlockingQueueHandler.dropped += 1
+
+
+class _LoggingState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queue: "queue.Queue" = queue.Queue(QUEUE_SIZE)
+        self.handler = _NonBlockingQueueHandler(self.queue)
+        self.listener: Optional[QueueListener] = None
+        self.dispatcher: Optional[_Dispatcher] = None
+        self.config = {
+            "log_dir": LOG_DIR,
+            "json_format": os.environ.get("HIREON_LOG_JSON", "0").lower() in ("1", "true", "yes"),
+            "max_open_sinks": MAX_OPEN_SINKS,
+            "max_bytes": MAX_BYTES,
+            "backup_count": BACKUP_COUNT,
+            "console": True,
+        }
+
+    def ensure_started(self):
+        if self.listener is not None:
+            return
+        with self.lock:
+            if self.listener is not None:
+                return
+            cfg = self.config
+            pool = SinkPool(cfg["max_open_sinks"], cfg["max_bytes"], cfg["backup_count"])
+            self.dispatcher = _Dispatcher(cfg["log_dir"], pool, cfg["json_format"], cfg["console"])
+            self.listener = QueueListener(self.queue, self.dispatcher)
+            self.listener.start()
+
+    def stop(self):
+        with self.lock:
+            if self.listener is None:
+                return
+            self.listener.stop()  # drains the queue first
+            self.dispatcher.close()
+            self.listener = self.dispatcher = None
+
+
+_state = _LoggingState()
+atexit.register(_state.stop)
+
+
+def configure_logging(
+    log_dir: Optional[Path] = None,
+    json_format: Optional[bool] = None,
+    max_open_sinks: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    backup_count: Optional[int] = None,
+    console: Optional[bool] = None,
+):
+    """
+    Change sink settings. Pending records are written with the old
+    settings first; arguments left as None keep their current value.
+    """
+    was_running = _state.listener is not None
+    _state.stop()
+    updates = {
+        "log_dir": Path(log_dir) if log_dir is not None else None,
+        "json_format": json_format,
+        "max_open_sinks": max_open_sinks,
+        "max_bytes": max_bytes,
+        "backup_count": backup_count,
+        "console": console,
+    }
+    _state.config.update({k: v for k, v in updates.items() if v is not None})
+    if was_running:
+        _state.ensure_started()
+
+
+def flush_logging():
+    """
+    Block until every record queued so far has been written (tests,
+    shutdown hooks). Never needed in the request path.
+    """
+    if _state.listener is not None:
+        _state.queue.join()
+        for sink in list(_state.dispatcher.pool._sinks.values()):
+            sink.flush()
+
+
+def shutdown_logging():
+    """Drain the queue and close all sinks (also runs at exit)."""
+    _state.stop()
+
+
+def dropped_records() -> int:
+    """Records dropped because the queue was full."""
+    return _NonBlockingQueueHandler.dropped
+
 
 def get_logger(name: str = "pipeline", level: int = logging.INFO) -> Logger:
     """
@@ -25,42 +283,31 @@ def get_logger(name: str = "pipeline", level: int = logging.INFO) -> Logger:
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
-    if not logger.hasHandlers():
-        # Console handler
-        ch = logging.StreamHandler()
-        ch.setLevel(level)
-        ch_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-        ch.setFormatter(ch_formatter)
-        logger.addHandler(ch)
-
-        # File handler
-        log_file = LOG_DIR / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
-        fh = logging.FileHandler(log_file, mode="a", encoding="utf-8")
-        fh.setLevel(level)
-        fh_formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        fh.setFormatter(fh_formatter)
-        logger.addHandler(fh)
+    if _state.handler not in logger.handlers:
+        logger.addHandler(_state.handler)
+        logger.propagate = False
+    _state.ensure_started()
 
     return logger
 
 
-def log_user_event(user_id: str, message: str, level: int = logging.INFO):
+def log_user_event(user_id: str, message: str, level: int = logging.INFO, **fields):
     """
     Logs a user-specific event to a file named after the user ID.
+    Extra keyword `fields` are kept as structured data (JSON format).
     """
-    user_log_dir = LOG_DIR / "users"
-    user_log_dir.mkdir(exist_ok=True, parents=True)
-    user_log_file = user_log_dir / f"{user_id}.log"
-
-    user_logger = logging.getLogger(f"user_{user_id}")
-    user_logger.setLevel(level)
+    get_logger(USER_LOGGER, logging.DEBUG).log(level, message, extra={**fields, "user_id": user_id})
 
-    if not user_logger.hasHandlers():
-        fh = logging.FileHandler(user_log_file, mode="a", encoding="utf-8")
-        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-        fh.setFormatter(formatter)
-        user_logger.addHandler(fh)
 
-    user_logger.log(level, message)
+__all__ = [
+    "LOG_DIR",
+    "get_logger",
+    "log_user_event",
+    "configure_logging",
+    "flush_logging",
+    "shutdown_logging",
+    "dropped_records",
+    "JsonFormatter",
+    "GzipRotatingFileHandler",
+    "SinkPool",
+]
@@ -0,0 +1,269 @@
+# app/modules/logging/metrics.py
+"""
+Latency spans, histograms and counters for the grading pipeline.
+
+Stages instrumented across the code base:
+    model_load, preprocess, inference, scoring, report_io, decision
+
+    with span("inference", model="sentiment"):
+        ...
+
+Each span feeds a histogram (p50 / p95 / p99 over a bounded reservoir of
+recent samples, plus count and sum); exceptions escaping a span count as
+`errors{stage=...}`. Counters track cache hits / misses.
+
+Snapshots are written to app/data/logs:
+    metrics.prom   Prometheus text format (node_exporter textfile style)
+    metrics.json   same data as JSON
+
+Disabled by default; enable with HIREON_METRICS=1 or `metrics.enable()`.
+Only while disabled does `span()` return a shared no-op (and `inc()`
+return immediately); with metrics enabled every span is timed.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .logger import LOG_DIR
+
+RESERVOIR_SIZE = 2048
+FLUSH_INTERVAL = 30.0
+QUANTILES = (0.5, 0.95, 0.99)
+PREFIX = "hireon"
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, str]) -> _Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    """
+    Count, sum and a reservoir of the most recent samples (seconds).
+    """
+
+    __slots__ = ("count", "total", "samples")
+
+    def __init__(self, size: int = RESERVOIR_SIZE):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=size)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+
+    def quantiles(self) -> Dict[float, float]:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: 0.0 for q in QUANTILES}
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(round(q * last)))] for q in QUANTILES}
+
+
+class _Span:
+    __slots__ = ("registry", "stage", "labels", "start")
+
+    def __init__(self, registry: "MetricsRegistry", stage: str, labels: Dict[str, str]):
+        self.registry = registry
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.stage, time.perf_counter() - self.start, **self.labels)
+        if exc_type is not None:
+            self.registry.inc("errors", stage=self.stage)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class MetricsRegistry:
+    """
+    Process-wide store of stage histograms and counters.
+    """
+
+    def __init__(self, enabled: bool = False, out_dir: Path = LOG_DIR, flush_interval: float = FLUSH_INTERVAL):
+        self.enabled = enabled
+        self.out_dir = Path(out_dir)
+        self.flush_interval = flush_interval
+        self._histograms: Dict[_Key, Histogram] = {}
+        self._counters: Dict[_Key, float] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    # -------------------------------------------------------------------
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, stage: str, **labels):
+        """
+        Context manager timing one stage. When metrics are disabled
+        (HIREON_METRICS unset / 0), returns the shared no-op instead.
+        """
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, stage, labels)
+
+    def observe(self, stage: str, seconds: float, **labels):
+        if not self.enabled:
+            return
+        key = _key(stage, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram()
+            hist.observe(seconds)
+        self._maybe_flush()
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    # -------------------------------------------------------------------
+    def snapshot(self) -> Dict:
+        """
+        {"stages": [...], "counters": [...]} with latencies in milliseconds.
+        """
+        with self._lock:
+            histograms = {k: (h.count, h.total, h.quantiles()) for k, h in self._histograms.items()}
+            counters = dict(self._counters)
+
+        stages = []
+        for (stage, labels), (count, total, quantiles) in sorted(histograms.items()):
+            stages.append({
+                "stage": stage,
+                "labels": dict(labels),
+                "count": count,
+                "mean_ms": round(total / count * 1000, 4) if count else 0.0,
+                **{f"p{int(q * 100)}_ms": round(v * 1000, 4) for q, v in quantiles.items()},
+            })
+        return {
+            "timestamp": time.time(),
+            "stages": stages,
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Prometheus text exposition: stage latencies as a summary, counters
+        as `<prefix>_<name>_total`.
+        """
+        with self._lock:
+            histograms = {k: (h.count, h.total, h.quantiles()) for k, h in self._histograms.items()}
+            counters = dict(self._counters)
+
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            inner = ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in pairs)
+            return "{" + inner + "}"
+
+        metric = f"{PREFIX}_stage_seconds"
+        lines = [
+            f"# HELP {metric} Latency of grading pipeline stages.",
+            f"# TYPE {metric} summary",
+        ]
+        for (stage, labels), (count, total, quantiles) in sorted(histograms.items()):
+            base = (("stage", stage),) + labels
+            for q, v in quantiles.items():
+                lines.append(f"{metric}{fmt(base, [('quantile', q)])} {v:.6f}")
+            lines.append(f"{metric}_sum{fmt(base)} {total:.6f}")
+            lines.append(f"{metric}_count{fmt(base)} {count}")
+
+        seen = set()
+        for (name, labels), value in sorted(counters.items()):
+            counter = f"{PREFIX}_{name}_total"
+            if counter not in seen:
+                lines.append(f"# TYPE {counter} counter")
+                seen.add(counter)
+            lines.append(f"{counter}{fmt(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    # -------------------------------------------------------------------
+    def write(self, out_dir: Optional[Path] = None) -> Path:
+        """
+        Write metrics.prom and metrics.json atomically; returns the directory.
+        """
+        out_dir = Path(out_dir) if out_dir else self.out_dir
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for name, content in (
+            ("metrics.prom", self.to_prometheus()),
+            ("metrics.json", json.dumps(self.snapshot(), indent=2)),
+        ):
+            tmp = out_dir / f".{name}.{os.getpid()}.tmp"
+            tmp.write_text(content, encoding="utf-8")
+            os.replace(tmp, out_dir / name)
+        self._last_flush = time.monotonic()
+        return out_dir
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = time.monotonic()
+        try:
+            self.write()
+        except OSError:
+            pass  # metrics must never break grading
+
+    def _flush_at_exit(self):
+        if self.enabled and (self._histograms or self._counters):
+            try:
+                self.write()
+            except OSError:
+                pass
+
+
+metrics = MetricsRegistry(enabled=os.environ.get("HIREON_METRICS", "0").lower() in ("1", "true", "yes"))
+atexit.register(metrics._flush_at_exit)
+
+
+def span(stage: str, **labels):
+    """Shortcut for metrics.span(stage, **labels); a no-op unless metrics are enabled."""
+    return metrics.span(stage, **labels)
+
+
+__all__ = [
+    "MetricsRegistry",
+    "Histogram",
+    "metrics",
+    "span",
+]
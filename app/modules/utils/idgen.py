@@ -1,32 +1,183 @@
 # app/modules/utils/idgen.py
+"""
+User ID generation.
 
+IDs keep the form <ord_initials>-YYYYMMDD-HHMMSS-XXX. The suffix is
+allocated in memory, without touching the filesystem:
+
+    XXX = worker * 100 + sequence        (sequence 1..99 per second)
+
+`worker` (0-9) tells concurrent processes apart: HIREON_WORKER_ID when
+set (must be 0-9), otherwise the first free slot leased under
+app/data/temp/workers/<n>.lease. Leases are created with O_CREAT|O_EXCL,
+hold the owner's PID, are released at exit and reclaimed once their
+owner is gone (or when they name this process's PID but were left by an
+earlier run, e.g. after a container restart), so two live processes
+never share a worker id. A process
+that mints more than 99 IDs in one second waits for the next second
+instead of reusing a suffix.
+
+Earlier versions kept one counter file per second under
+app/data/temp/counters; remove them with
+
+    python -m app.modules.utils.idgen --cleanup [--dry-run]
+"""
+
+import atexit
+import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
+from typing import Optional, Tuple
+
+COUNTER_DIR = Path("app/data/temp/counters")  # legacy, see remove_legacy_counters()
+LEASE_DIR = Path("app/data/temp/workers")
 
-COUNTER_DIR = Path("app/data/temp/counters")
+MAX_WORKERS = 10
+SEQ_PER_SECOND = 99
 
-def _ensure_counter_dir():
-    COUNTER_DIR.mkdir(parents=True, exist_ok=True)
+# Lease files this process created (absolute paths). A lease holding our
+# own PID that is not in here was left by an earlier run that got the same
+# PID (container restarts), not by us.
+_held_leases = set()
 
-def _load_counter(timestamp: str) -> int:
-    """Load counter for this timestamp, return 0 if none."""
+
+def _check_worker_id(worker_id: int) -> int:
+    if not 0 <= worker_id < MAX_WORKERS:
+        raise ValueError(f"worker id must be 0-{MAX_WORKERS - 1}, got {worker_id}")
+    return worker_id
+
+
+def _pid_alive(pid: int) -> bool:
     try:
-        counter_file = COUNTER_DIR / f"{timestamp}.txt"
-        if counter_file.exists():
-            return int(counter_file.read_text().strip())
-    except Exception:
-        pass
-    return 0
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
 
-def _save_counter(timestamp: str, value: int):
-    """Added error handling for counter file writes"""
+
+def _reclaim_if_stale(path: Path):
+    """
+    Remove a lease whose owner process has exited, or that holds this
+    process's PID without having been leased by it.
+    """
     try:
-        counter_file = COUNTER_DIR / f"{timestamp}.txt"
-        _ensure_counter_dir()
-        counter_file.write_text(str(value))
-    except Exception:
+        before = path.stat()
+        pid = int(path.read_text().strip() or 0)
+    except (OSError, ValueError):
+        return
+    if pid == os.getpid():
+        if os.path.abspath(path) in _held_leases:
+            return
+    elif pid and _pid_alive(pid):
+        return
+    if not pid and time.time() - before.st_mtime < 5:
+        return  # just created, owner is about to write its PID
+    # Move it aside first: if another process already reclaimed the slot,
+    # the file we moved is its fresh lease and is put back
+    aside = path.with_name(f".{path.name}.{os.getpid()}")
+    try:
+        os.rename(path, aside)
+    except OSError:
+        return
+    if aside.stat().st_ino != before.st_ino:
+        try:
+            os.link(aside, path)
+        except OSError:
+            pass
+    aside.unlink(missing_ok=True)
+
+
+def _release_lease(path: Path):
+    _held_leases.discard(os.path.abspath(path))
+    try:
+        if int(path.read_text().strip()) == os.getpid():
+            path.unlink()
+    except (OSError, ValueError):
         pass
 
+
+def lease_worker_id(lease_dir: Path = LEASE_DIR) -> int:
+    """
+    Lease the lowest free worker slot for this process (released at exit).
+    Raises RuntimeError when all MAX_WORKERS slots are held by live
+    processes.
+    """
+    lease_dir = Path(lease_dir)
+    lease_dir.mkdir(parents=True, exist_ok=True)
+    for worker_id in range(MAX_WORKERS):
+        path = lease_dir / f"{worker_id}.lease"
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                _reclaim_if_stale(path)
+                continue
+            # Recorded before the PID is written, so no thread of ours
+            # takes the fresh lease for a leftover
+            _held_leases.add(os.path.abspath(path))
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            atexit.register(_release_lease, path)
+            return worker_id
+    raise RuntimeError(
+        f"All {MAX_WORKERS} worker ids are leased under {lease_dir}; set HIREON_WORKER_ID explicitly"
+    )
+
+
+def _resolve_worker_id() -> int:
+    env = os.environ.get("HIREON_WORKER_ID")
+    if env is not None:
+        try:
+            worker_id = int(env)
+        except ValueError:
+            raise ValueError(f"HIREON_WORKER_ID must be an integer, got {env!r}") from None
+        return _check_worker_id(worker_id)
+    return lease_worker_id()
+
+
+class IdAllocator:
+    """
+    Per-process (timestamp, suffix) allocator. Thread-safe; resolves its
+    worker id on first use and again after a fork.
+    """
+
+    def __init__(self, worker_id: Optional[int] = None):
+        self._fixed_worker = None if worker_id is None else _check_worker_id(worker_id)
+        self._lock = threading.Lock()
+        self._pid = None
+        self.worker_id = self._fixed_worker
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self.worker_id = self._fixed_worker if self._fixed_worker is not None else _resolve_worker_id()
+        self._timestamp = ""
+        self._seq = 0
+
+    def next(self) -> Tuple[str, str]:
+        """
+        Return ("YYYYMMDD-HHMMSS", "XXX") for a new ID.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            while True:
+                timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+                if timestamp != self._timestamp:
+                    self._timestamp, self._seq = timestamp, 0
+                if self._seq < SEQ_PER_SECOND:
+                    self._seq += 1
+                    return timestamp, f"{self.worker_id * 100 + self._seq:03d}"
+                # sequence exhausted for this second
+                time.sleep(1.0 - (time.time() % 1.0) + 0.001)
+
+
+_allocator = IdAllocator()
+
+
 def generate_user_id(initials: str) -> str:
     """
     Generate ID of the form:
@@ -34,21 +185,53 @@ def generate_user_id(initials: str) -> str:
     Example: MNR -> 77-78-82-20251123-020000-001
     """
     initials = (initials or "USR").upper().strip()[:3]  # Add default initials
-    
+
     try:
         ord_part = "-".join(str(ord(c)) for c in initials)
     except Exception:
         ord_part = "000"
 
-    now = datetime.now()
-    date_str = now.strftime("%Y%m%d")
-    time_str = now.strftime("%H%M%S")
+    timestamp, suffix = _allocator.next()
+    return f"{ord_part}-{timestamp}-{suffix}"
+
+
+def remove_legacy_counters(counter_dir: Path = COUNTER_DIR, dry_run: bool = False) -> int:
+    """
+    Delete the per-second counter files written by earlier versions
+    (<YYYYMMDD-HHMMSS>.txt) and the directory once empty.
+    Returns the number of files removed (or that would be removed).
+    """
+    counter_dir = Path(counter_dir)
+    if not counter_dir.is_dir():
+        return 0
+
+    removed = 0
+    for path in counter_dir.glob("*-*.txt"):
+        if not path.stem.replace("-", "").isdigit():
+            continue
+        removed += 1
+        if not dry_run:
+            path.unlink(missing_ok=True)
+
+    if not dry_run:
+        try:
+            counter_dir.rmdir()
+        except OSError:
+            pass  # not empty
+    return removed
+
 
-    timestamp = f"{date_str}-{time_str}"
+if __name__ == "__main__":
+    import argparse
 
-    _ensure_counter_dir()
-    counter = _load_counter(timestamp)
-    counter += 1
-    _save_counter(timestamp, counter)
+    parser = argparse.ArgumentParser(description="User ID generator maintenance.")
+    parser.add_argument("--cleanup", action="store_true", help="remove legacy counter files")
+    parser.add_argument("--dir", type=Path, default=COUNTER_DIR)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
 
-    return f"{ord_part}-{timestamp}-{counter:03d}"
+    if args.cleanup:
+        n = remove_legacy_counters(args.dir, dry_run=args.dry_run)
+        print(f"{'Would remove' if args.dry_run else 'Removed'} {n} counter file(s) from {args.dir}")
+    else:
+        parser.print_help()
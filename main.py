@@ -9,6 +9,10 @@ import plotly.graph_objects as go
 # Import custom modules
 # Ensure you have empty __init__.py files in app/ and app/modules/
 from app.modules import nlp_engine, question_bank
+from app.modules.QnA.grading_worker import get_grading_worker, RESULTS_TIMEOUT
+from app.modules.io_manager.score_store import write_scores, scores_path_for, source_signature
+from app.modules.QnA.dashboard import DashboardBuilder, load_dashboard
+from app.modules.frontend_loader import MtimeCache, file_mtime
 
 # --- CONFIG & SETUP ---
 st.set_page_config(page_title="Hire-ON!", layout="wide")
@@ -41,6 +45,14 @@ if 'wage_question_shown' not in st.session_state:
 
 # --- HELPER FUNCTIONS ---
 
+# Reads below are cached across reruns and keyed on file mtime; user
+# profiles are also write-through (save_user_data refreshes the cache), so a
+# rerun with nothing changed only stats files instead of reading them.
+
+@st.cache_data(show_spinner=False)
+def _read_jobs(path, mtime):
+    return pd.read_csv(path)
+
 def load_jobs():
     # Create dummy if not exists
     if not os.path.exists(JOB_DB_PATH):
@@ -49,18 +61,34 @@ def load_jobs():
             "affordable_wage": [5000000, 3000000, 8000000, 7000000, 15000000]
         })
         df.to_csv(JOB_DB_PATH, index=False)
-    return pd.read_csv(JOB_DB_PATH)
+    return _read_jobs(JOB_DB_PATH, file_mtime(JOB_DB_PATH))
+
+@st.cache_resource(show_spinner=False)
+def _user_cache():
+    # path -> (mtime, data), shared by all sessions of this process
+    return MtimeCache()
 
 def save_user_data(username, data):
-    with open(f"{USER_DB_PATH}/{username}.json", "w") as f:
+    path = f"{USER_DB_PATH}/{username}.json"
+    with open(path, "w") as f:
         json.dump(data, f)
+    _user_cache().put(path, data)
+
+def _read_user_file(path):
+    with open(path, "r") as f:
+        return json.load(f)
 
 def load_user_data(username):
-    path = f"{USER_DB_PATH}/{username}.json"
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            return json.load(f)
-    return None
+    return _user_cache().get(f"{USER_DB_PATH}/{username}.json", _read_user_file)
+
+@st.cache_resource(show_spinner=False)
+def _grading_worker():
+    # One background grader per process; answers are graded off the UI thread
+    return get_grading_worker()
+
+@st.cache_data(show_spinner=False)
+def _interview_questions(position, level):
+    return list(question_bank.get_interview_questions(position, level))
 
 def determine_level(years_exp):
     # Based on README Logic (simplified interpretation)
@@ -86,7 +114,19 @@ def save_interview_results(username, position, answers_data, wage_req, status, a
     grade_row = [a['grade'] for a in answers_data] + [status] # Using wage column for status in grade row
 
     df = pd.DataFrame([labels_row, qs_row, ans_row, grade_row], columns=cols)
-    df.to_csv(f"{REPORT_PATH}/{username}_interview.csv", index=False)
+    report_csv = f"{REPORT_PATH}/{username}_interview.csv"
+    df.to_csv(report_csv, index=False)
+
+    # Typed long-format copy (one row per answer) read by the dashboard
+    records = [
+        {"label": label, "question": question, "answer": answer, "score": grade}
+        for label, question, answer, grade in zip(cols, qs_row, ans_row, grade_row)
+    ]
+    write_scores(records, scores_path_for(report_csv), source=source_signature(report_csv))
+
+    # Everything the dashboard shows, computed once (keywords, weighted terms, figure)
+    decision = {"status": status, "avg_score": avg_score, "wage_request": wage_req}
+    DashboardBuilder(username, report_path=report_csv).write_artifact(decision=decision)
     
     # Update User Profile
     user_dat = load_user_data(username)
@@ -184,7 +224,7 @@ def interview_engine():
         
         st.session_state.determined_level = level
         # Generate next 16 questions
-        main_qs = question_bank.get_interview_questions(position, level)
+        main_qs = _interview_questions(position, level)
         st.session_state.q_list.extend(main_qs)
         st.rerun()
 
@@ -204,23 +244,18 @@ def interview_engine():
             if not answer:
                 st.warning("Please provide an answer.")
             else:
-                # --- GRADING ---
-                with st.spinner("Analyzing..."):
-                    sent_score = nlp_engine.analyze_sentiment(answer)
-                    # Calculate relevance against the Question text itself (simplified context)
-                    rel_score = nlp_engine.calculate_relevance(answer, q_text)
-                    grade = nlp_engine.grading_formula(sent_score, rel_score)
-                    
-                    st.session_state.interview_answers.append({
-                        "question": q_text,
-                        "answer": answer,
-                        "grade": grade,
-                        "sentiment": sent_score,
-                        "relevance": rel_score
-                    })
-                    
-                    st.session_state.current_q_index += 1
-                    st.rerun()
+                # --- GRADING (queued, collected before the final step) ---
+                _grading_worker().submit(st.session_state.username, current_idx, q_text, answer)
+                st.session_state.interview_answers.append({
+                    "question": q_text,
+                    "answer": answer,
+                    "grade": None,
+                    "sentiment": None,
+                    "relevance": None
+                })
+
+                st.session_state.current_q_index += 1
+                st.rerun()
     
     # RENDER WAGE QUESTION
     elif st.session_state.wage_question_shown:
@@ -228,6 +263,28 @@ def interview_engine():
         wage_input = st.number_input("What is your expected monthly wage (IDR)?", min_value=0.0)
         
         if st.button("Finish Interview"):
+            # --- COLLECT QUEUED GRADES ---
+            worker = _grading_worker()
+            with st.spinner("Analyzing..."):
+                graded = worker.results(st.session_state.username, timeout=RESULTS_TIMEOUT)
+                for idx, item in enumerate(st.session_state.interview_answers):
+                    result = graded.get(idx)
+                    if result is None or "error" in result:
+                        # Missing, failed or timed out in the background: grade it here
+                        try:
+                            sent_score = nlp_engine.analyze_sentiment(item["answer"])
+                            rel_score = nlp_engine.calculate_relevance(item["answer"], item["question"])
+                        except Exception as e:
+                            st.error(f"Could not grade answer {idx + 1}: {e}")
+                            st.stop()
+                        result = {
+                            "grade": nlp_engine.grading_formula(sent_score, rel_score),
+                            "sentiment": sent_score,
+                            "relevance": rel_score,
+                        }
+                    item.update(grade=result["grade"], sentiment=result["sentiment"], relevance=result["relevance"])
+            worker.discard(st.session_state.username)
+
             # --- FINAL CALCULATION ---
             total_score = sum([x['grade'] for x in st.session_state.interview_answers])
             avg_score = total_score / 18 if len(st.session_state.interview_answers) > 0 else 0
@@ -267,13 +324,15 @@ def dashboard_page():
     st.title("Candidate Dashboard")
     
     user_dat = load_user_data(st.session_state.username)
-    df_res = pd.read_csv(f"{REPORT_PATH}/{st.session_state.username}_interview.csv")
-    
-    # Extract data from CSV structure (Row based)
-    # Row 1: Questions, Row 2: Answers, Row 3: Grades
-    questions = df_res.iloc[0, :18].tolist() # First 18 cols
-    grades = pd.to_numeric(df_res.iloc[2, :18]).tolist()
-    answers = df_res.iloc[1, :18].tolist()
+    # Precomputed at save time; rebuilt only if the report changed since
+    dash = load_dashboard(
+        f"{REPORT_PATH}/{st.session_state.username}_interview.csv",
+        user_id=st.session_state.username,
+    )
+
+    questions = dash["questions"][:18] # L1, L2, Q1..Q16
+    grades = dash["scores"][:18]
+    answers = dash["answers"][:18]
     
     final_status = user_dat.get('final_status', 'Unknown')
     final_score = user_dat.get('final_score', 0)
@@ -288,9 +347,7 @@ def dashboard_page():
     
     # 2. Score Bar Plot vs Threshold
     st.subheader("Performance Analysis")
-    fig_bar = go.Figure()
-    fig_bar.add_trace(go.Bar(x=[f"Q{i}" for i in range(1, 19)], y=grades, name='Score'))
-    fig_bar.add_hline(y=0.8, line_dash="dash", line_color="red", annotation_text="Threshold (0.8)")
+    fig_bar = go.Figure(dash["figure"])
     st.plotly_chart(fig_bar, use_container_width=True)
     
     # 3. Tabular Score
@@ -306,7 +363,7 @@ def dashboard_page():
     st.subheader("Language Analysis")
     
     # Top Frequent
-    top_words = nlp_engine.extract_keywords(answers, top_n=3)
+    top_words = dash["keywords"]
     
     c1, c2 = st.columns(2)
     with c1:
@@ -317,8 +374,8 @@ def dashboard_page():
     # Simple weighting visualization (simulated by length/complexity)
     with c2:
         st.markdown("**Weighted/Significant Terms**")
-        # In a real app, use TF-IDF scores here
-        st.write("- (Analysis reserved for full TF-IDF implementation)")
+        for word, weight in dash["most_weighted_words"]:
+            st.write(f"- {word}: {weight:.2f}")
         st.write(f"- Top Context: {user_dat.get('position')}")
 
     # 5. Closing
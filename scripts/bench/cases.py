@@ -0,0 +1,236 @@
+"""
+Benchmark cases for the interview hot paths.
+
+Every case runs inside its own scratch working directory: app/data is a
+relative path, so users, reports and indexes written by a case never
+touch the real data tree.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, List, NamedTuple, Optional
+
+WORDS = (
+    "saya bekerja di dapur hotel selama dua tahun dan bertanggung jawab atas menu harian "
+    "tim kami melayani tamu dengan cepat serta menjaga kebersihan peralatan masak setiap hari "
+    "motivated determined reliable honest flexible punctual willing late quit transparent "
+    "pengalaman pelanggan laporan keuangan anggaran strategi operasional koordinasi evaluasi"
+).split()
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable[[], Any]                            # once, untimed
+    run: Callable[[Any], Any]                           # timed
+    before_each: Optional[Callable[[Any], Any]] = None  # untimed, per repeat
+    ops: int = 1                                        # operations per run()
+
+
+def make_answer(rng: random.Random, n_words: int = 40) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)) + "."
+
+
+def make_interview(rng: random.Random, n_answers: int = 18):
+    from app.modules.QnA.questions import get_all_questions
+
+    questions = get_all_questions("Chef", "beginner")[:n_answers]
+    return [(q, make_answer(rng, rng.randint(20, 80))) for q in questions]
+
+
+class Scratch:
+    """
+    Temporary working directory (app/data lives inside it).
+    """
+
+    def __init__(self):
+        self.origin = os.getcwd()
+        self.path = Path(tempfile.mkdtemp(prefix="hireon-bench-"))
+
+    def enter(self):
+        os.chdir(self.path)
+        from app.modules.io_manager.storage_paths import ensure_directories
+        ensure_directories()
+
+    def close(self):
+        os.chdir(self.origin)
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+# ---------------------------------------------------------------------
+# Judger.process_answer -> finalize
+# ---------------------------------------------------------------------
+def judger_interview_case(scratch: Scratch) -> Case:
+    def setup():
+        scratch.enter()
+        return {"interview": make_interview(random.Random(1)), "n": 0}
+
+    def run(state):
+        from app.modules.QnA import Judger
+
+        state["n"] += 1
+        judger = Judger(user_id=f"bench{state['n']}", company_budget=8_000_000)
+        for question, answer in state["interview"]:
+            judger.process_answer(question, answer)
+        return judger.finalize(months_experience=12, wage_expectation=6_000_000)
+
+    return Case("judger.process_answer+finalize", setup, run)
+
+
+# ---------------------------------------------------------------------
+# csvio.append_column
+# ---------------------------------------------------------------------
+def append_column_case(scratch: Scratch, n_columns: int) -> Case:
+    from app.modules.io_manager.csvio import ensure_csv, append_column
+
+    def setup():
+        scratch.enter()
+        template = Path(f"template_{n_columns}.csv")
+        ensure_csv(template, headers=[f"C{i}" for i in range(n_columns)])
+        return {"template": template, "path": Path(f"report_{n_columns}.csv")}
+
+    def before_each(state):
+        shutil.copyfile(state["template"], state["path"])
+
+    def run(state):
+        append_column(state["path"], "NEW", ["NEW", "Question?", "Answer.", 0.5])
+
+    return Case(f"csvio.append_column[cols={n_columns}]", setup, run, before_each)
+
+
+# ---------------------------------------------------------------------
+# Dashboards
+# ---------------------------------------------------------------------
+def _write_candidate(user_id: str, rng: random.Random):
+    from app.modules.io_manager import get_backend
+    from app.modules.io_manager.storage_paths import USERS_DIR
+    from app.modules.io_manager.jsonio import save_json
+
+    save_json(
+        {"Username": user_id, "Position": "Chef", "months_experience": 14, "wage_expectation": 6_000_000},
+        USERS_DIR / f"{user_id}.json",
+    )
+    backend = get_backend()
+    labels = ["L1", "L2"] + [f"Q{i}" for i in range(1, 17)]
+    for label, (question, answer) in zip(labels, make_interview(rng)):
+        backend.append_answer(user_id, label, question, answer, round(rng.random(), 4))
+    backend.append_answer(user_id, "Wage_Expectation", "Gaji?", "6000000", 0.0)
+
+
+def build_dashboard_case(scratch: Scratch) -> Case:
+    user_id = "bench.dashboard"
+
+    def setup():
+        scratch.enter()
+        _write_candidate(user_id, random.Random(2))
+
+    def before_each(_):
+        # build_dashboard writes its row over the report CSV
+        from app.modules.io_manager import get_backend
+        from app.modules.io_manager.storage_paths import REPORTS_DIR
+        get_backend().materialize_report(user_id, Path(REPORTS_DIR) / f"{user_id}.csv")
+
+    def run(_):
+        from app.modules.evaluation import build_dashboard
+        return build_dashboard(user_id, company_budget=8_000_000)
+
+    return Case("evaluation.build_dashboard", setup, run, before_each)
+
+
+def dashboard_builder_case(scratch: Scratch) -> Case:
+    user_id = "bench.builder"
+
+    def setup():
+        scratch.enter()
+        _write_candidate(user_id, random.Random(3))
+
+    def run(_):
+        from app.modules.QnA.dashboard import DashboardBuilder
+        return DashboardBuilder(user_id).build()
+
+    return Case("QnA.DashboardBuilder.build", setup, run)
+
+
+# ---------------------------------------------------------------------
+# login.get_user_metadata
+# ---------------------------------------------------------------------
+def login_case(scratch: Scratch, n_users: int, lookups: int = 200) -> Case:
+    def setup():
+        import json
+        from app.modules.auth.user_index import user_index
+        from app.modules.io_manager.storage_paths import USERS_DIR
+
+        scratch.enter()
+        names = [f"user{i:06d}" for i in range(n_users)]
+        for name in names:
+            with open(USERS_DIR / f"{name}.json", "w", encoding="utf-8") as f:
+                json.dump({"Username": name, "Position": "Chef"}, f)
+        user_index.rebuild()
+        rng = random.Random(4)
+        return [rng.choice(names) for _ in range(lookups)]
+
+    def run(targets):
+        from app.modules.auth.login import get_user_metadata
+        for name in targets:
+            assert get_user_metadata(name) is not None
+
+    return Case(f"login.get_user_metadata[users={n_users}]", setup, run, ops=lookups)
+
+
+# ---------------------------------------------------------------------
+# Text mining
+# ---------------------------------------------------------------------
+def extract_keywords_case(scratch: Scratch) -> Case:
+    def setup():
+        scratch.enter()
+        return [answer for _, answer in make_interview(random.Random(5))]
+
+    def before_each(_):
+        from app.modules.QnA.text_mining import score_cache
+        score_cache.clear()  # measure the work, not the result cache
+
+    def run(answers):
+        from app.modules.QnA.text_mining import extract_keywords
+        return extract_keywords(answers, top_n=3)
+
+    return Case("text_mining.extract_keywords", setup, run, before_each)
+
+
+def grading_case(scratch: Scratch) -> Case:
+    def setup():
+        scratch.enter()
+        return make_interview(random.Random(6))
+
+    def before_each(_):
+        from app.modules.QnA.text_mining import score_cache
+        score_cache.clear()
+
+    def run(interview):
+        from app.modules.QnA.text_mining import analyze_sentiment_batch, calculate_relevance_batch
+        answers = [a for _, a in interview]
+        analyze_sentiment_batch(answers)
+        return calculate_relevance_batch(answers, [q for q, _ in interview])
+
+    return Case("text_mining.grade_batch[fake models]", setup, run, before_each, ops=18)
+
+
+def all_cases(scratch_factory: Callable[[], Scratch], user_counts: List[int], column_counts: List[int]):
+    """
+    Yield (case, scratch) pairs; each case gets a fresh scratch directory.
+    """
+    yield from _with_scratch(scratch_factory, judger_interview_case)
+    for n in column_counts:
+        yield from _with_scratch(scratch_factory, append_column_case, n)
+    yield from _with_scratch(scratch_factory, build_dashboard_case)
+    yield from _with_scratch(scratch_factory, dashboard_builder_case)
+    for n in user_counts:
+        yield from _with_scratch(scratch_factory, login_case, n)
+    yield from _with_scratch(scratch_factory, extract_keywords_case)
+    yield from _with_scratch(scratch_factory, grading_case)
+
+
+def _with_scratch(scratch_factory, make_case, *args):
+    scratch = scratch_factory()
+    yield make_case(scratch, *args), scratch
@@ -0,0 +1,76 @@
+"""
+Deterministic stand-ins for the NLP models, so benchmarks run offline
+and without model downloads. Outputs depend only on the input text.
+"""
+
+import hashlib
+
+import numpy as np
+
+EMBEDDING_DIM = 384  # same width as paraphrase-multilingual-MiniLM-L12-v2
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest(), 16)
+
+
+class FakeSentimentPipeline:
+    """Mimics the transformers sentiment pipeline call signature."""
+
+    labels = ("positive", "neutral", "negative")
+
+    def __call__(self, texts, batch_size=32, truncation=True, **kwargs):
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        results = []
+        for text in texts:
+            h = _digest(text)
+            results.append({"label": self.labels[h % 3], "score": 0.5 + (h % 500) / 1000})
+        return results
+
+
+class FakeSentenceEncoder:
+    """Mimics SentenceTransformer.encode: hashed bag of words."""
+
+    def encode(self, texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=False, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        out = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                h = _digest(word)
+                out[row, h % EMBEDDING_DIM] += 1.0 if (h >> 16) & 1 else -1.0
+        if normalize_embeddings:
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            out /= np.where(norms == 0, 1.0, norms)
+        return out[0] if single else out
+
+
+class FakeStemmer:
+    """Strips a few Indonesian suffixes; used when Sastrawi is missing."""
+
+    suffixes = ("kan", "an", "i", "nya", "lah")
+
+    def stem(self, word):
+        for suffix in self.suffixes:
+            if len(word) > len(suffix) + 3 and word.endswith(suffix):
+                return word[: -len(suffix)]
+        return word
+
+
+def install_fakes(real_stemmer: bool = True):
+    """
+    Point the model registry at the fakes. The Sastrawi stemmer is kept
+    when installed (it is deterministic and offline) unless
+    `real_stemmer` is False.
+    """
+    from app.modules.QnA.model_registry import registry
+
+    registry.register("sentiment", FakeSentimentPipeline)
+    registry.register("embedding", FakeSentenceEncoder)
+    if real_stemmer:
+        try:
+            import Sastrawi  # noqa: F401
+            return
+        except ImportError:
+            pass
+    registry.register("stemmer", FakeStemmer)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the interview hot paths.
+
+Runs against deterministic fake sentiment / embedding models (see
+fakes.py), so it works offline. Results are written as JSON; a previous
+result file can be used as the baseline to flag regressions.
+
+Usage:
+    python scripts/bench/run.py --out bench.json
+    python scripts/bench/run.py --compare bench.json [--threshold 0.25]
+    python scripts/bench/run.py --quick --only login
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakes import install_fakes  # noqa: E402
+from cases import Scratch, all_cases  # noqa: E402
+
+
+def measure(case, repeat: int, warmup: int = 1) -> dict:
+    """
+    Time `case.run` `repeat` times (after `warmup` untimed runs).
+    Reported times are per operation, in milliseconds.
+    """
+    state = case.setup()
+    for _ in range(warmup):
+        if case.before_each:
+            case.before_each(state)
+        case.run(state)
+
+    samples = []
+    for _ in range(repeat):
+        if case.before_each:
+            case.before_each(state)
+        start = time.perf_counter()
+        case.run(state)
+        samples.append((time.perf_counter() - start) * 1000 / case.ops)
+
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "min_ms": round(samples[0], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 4),
+        "repeat": repeat,
+        "ops": case.ops,
+    }
+
+
+def run_suite(args) -> dict:
+    from app.modules.QnA.preprocessing import stem_cache
+
+    install_fakes(real_stemmer=not args.fake_stemmer)
+    stem_cache.path = None  # do not read or write the on-disk stem cache
+
+    results = {}
+    for case, scratch in all_cases(Scratch, args.users, args.columns):
+        if args.only and not any(key in case.name for key in args.only):
+            scratch.close()
+            continue
+        try:
+            results[case.name] = measure(case, args.repeat)
+            print(f"  {case.name:<45} {results[case.name]['median_ms']:>10.3f} ms")
+        except Exception as e:
+            results[case.name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"  {case.name:<45} ERROR {type(e).__name__}: {e}")
+        finally:
+            scratch.close()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Print median ratios against the baseline; return regressed case names.
+    """
+    regressions = []
+    print(f"\n  {'case':<45} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "median_ms" not in base or "median_ms" not in cur:
+            print(f"  {name:<45} {'-':>10} {cur.get('median_ms', 'error'):>10}")
+            continue
+        ratio = cur["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "faster"
+        print(f"  {name:<45} {base['median_ms']:>10.3f} {cur['median_ms']:>10.3f} {ratio:>7.2f} {flag}")
+    return regressions
+
+
+def _int_list(text: str):
+    return [int(x) for x in text.split(",") if x]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the interview hot paths.")
+    parser.add_argument("--out", type=Path, help="write results JSON here")
+    parser.add_argument("--compare", type=Path, help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown ratio (default 0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--users", type=_int_list, default=[10, 1_000, 100_000], help="user counts for login")
+    parser.add_argument("--columns", type=_int_list, default=[10, 100, 1_000], help="column counts for append_column")
+    parser.add_argument("--only", nargs="*", help="run cases whose name contains any of these")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and at most 1k users")
+    parser.add_argument("--fake-stemmer", action="store_true", help="use the fake stemmer even if Sastrawi is installed")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.repeat = min(args.repeat, 5)
+        args.users = [n for n in args.users if n <= 1_000]
+
+    print("=" * 60)
+    print("AI Interview System - Benchmarks")
+    print("=" * 60)
+    current = run_suite(args)
+
+    if args.out:
+        args.out.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.out}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
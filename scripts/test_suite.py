@@ -8,6 +8,7 @@ import sys
 from pathlib import Path
 import json
 import tempfile
+from contextlib import contextmanager
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -31,6 +32,30 @@ def test(name, func):
         errors.append(f"✗ {name}: {type(e).__name__}: {e}")
         print(f"✗ {name}")
 
+@contextmanager
+def temp_data_root():
+    """
+    Run the Judger / dashboard against a temporary data root: reports,
+    users (file backend) and logs all go under the yielded directory.
+    """
+    import app.modules.QnA.judger as judger_module
+    import app.modules.QnA.dashboard as dashboard_module
+    import app.modules.logging.logger as lg
+    from app.modules.io_manager.storage_backend import FileBackend, get_backend, set_backend
+
+    original = (judger_module.REPORTS_DIR, dashboard_module.REPORTS_DIR, get_backend())
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        judger_module.REPORTS_DIR = dashboard_module.REPORTS_DIR = root / "reports"
+        set_backend(FileBackend(root / "users", root / "reports"))
+        lg.configure_logging(log_dir=root / "logs")
+        try:
+            yield root
+        finally:
+            lg.configure_logging(log_dir=lg.LOG_DIR)  # drains pending records first
+            judger_module.REPORTS_DIR, dashboard_module.REPORTS_DIR = original[:2]
+            set_backend(original[2])
+
 # =================================================================
 # VALIDATORS TESTS
 # =================================================================
@@ -56,6 +81,75 @@ def test_age_validation():
     assert validate_age("31-12-2020") == False  # too young
     assert validate_age("invalid") == False
 
+def test_user_id_generation():
+    import os
+    import re
+    import subprocess
+    import threading
+    from app.modules.utils import idgen
+    from app.modules.utils.idgen import IdAllocator, generate_user_id, remove_legacy_counters, lease_worker_id
+
+    assert re.fullmatch(r"77-78-82-\d{8}-\d{6}-\d{3}", generate_user_id("mnr"))
+
+    allocator = IdAllocator(worker_id=7)
+    minted = []
+    threads = [threading.Thread(target=lambda: minted.extend(allocator.next() for _ in range(10))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(minted)) == 50
+    assert all(suffix.startswith("7") for _, suffix in minted)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        counters = Path(tmpdir) / "counters"
+        counters.mkdir()
+        (counters / "20251123-183909.txt").write_text("1")
+        (counters / "20251123-202310.txt").write_text("3")
+        assert remove_legacy_counters(counters, dry_run=True) == 2
+        assert remove_legacy_counters(counters) == 2
+        assert not counters.exists()
+
+        # Worker ids are leased, never shared by two live processes
+        leases = Path(tmpdir) / "workers"
+        assert lease_worker_id(leases) == 0 and lease_worker_id(leases) == 1
+        dead = subprocess.Popen([sys.executable, "-c", "pass"])
+        dead.wait()
+        (leases / "2.lease").write_text(str(dead.pid))  # owner has exited
+        (leases / "3.lease").write_text(str(os.getppid()))  # owner is alive
+        assert lease_worker_id(leases) == 2
+        assert (leases / "2.lease").read_text() == str(os.getpid())
+        assert lease_worker_id(leases) == 4
+        for _ in range(5, 10):
+            lease_worker_id(leases)
+        try:
+            lease_worker_id(leases)
+            assert False, "more leases than worker ids"
+        except RuntimeError:
+            pass
+
+        # Leases left by an earlier run that had our PID (container restart)
+        restarted = Path(tmpdir) / "restarted"
+        restarted.mkdir()
+        for worker_id in range(10):
+            (restarted / f"{worker_id}.lease").write_text(str(os.getpid()))
+        assert lease_worker_id(restarted) == 0 and lease_worker_id(restarted) == 1
+
+    for bad in ("10", "-1", "abc"):
+        os.environ["HIREON_WORKER_ID"] = bad
+        try:
+            idgen._resolve_worker_id()
+            assert False, f"HIREON_WORKER_ID={bad} accepted"
+        except ValueError:
+            pass
+        finally:
+            del os.environ["HIREON_WORKER_ID"]
+    try:
+        IdAllocator(worker_id=12)
+        assert False, "worker id 12 accepted"
+    except ValueError:
+        pass
+
 # =================================================================
 # I/O TESTS
 # =================================================================
@@ -86,6 +180,268 @@ def test_csv_operations():
         df = pd.read_csv(path)
         assert "Q3" in df.columns
 
+def test_answer_log():
+    from app.modules.io_manager.answer_log import (
+        append_record, ensure_materialized, log_path_for, read_records
+    )
+    import pandas as pd
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = Path(tmpdir) / "user.csv"
+        log_path = log_path_for(csv_path)
+
+        append_record(log_path, "L1", "Question 1", "Answer 1", 0.5)
+        append_record(log_path, "Q1", "Question 2", "Answer 2", 0.25)
+        append_record(log_path, "L1", "Question 1", "Answer 1b", 0.75)  # replaces L1
+        assert len(read_records(log_path)) == 3
+
+        assert ensure_materialized(csv_path) is True
+        assert ensure_materialized(csv_path) is False  # already up to date
+        df = pd.read_csv(csv_path)
+        assert list(df.columns) == ["ID", "L1", "Q1"]
+        assert df.shape[0] == 4
+        assert df["L1"].iloc[2] == "Answer 1b"
+
+        # An append in the same mtime tick as the last materialize is seen
+        import os
+        tick = log_path.stat().st_mtime_ns
+        os.utime(csv_path, ns=(tick, tick))
+        append_record(log_path, "Q2", "Question 3", "Answer 3", 0.5)
+        os.utime(log_path, ns=(tick, tick))
+        assert ensure_materialized(csv_path) is True
+        assert list(pd.read_csv(csv_path).columns) == ["ID", "L1", "Q1", "Q2"]
+        assert ensure_materialized(csv_path) is False
+
+def test_score_store():
+    from app.modules.io_manager.answer_log import append_record, materialize_csv
+    from app.modules.io_manager.score_store import read_scores, scores_path_for, write_scores, source_signature, _stored_signature
+    with tempfile.TemporaryDirectory() as tmpdir:
+        csv_path = Path(tmpdir) / "user.csv"
+        log_path = Path(tmpdir) / "user.jsonl"
+        append_record(log_path, "Q1", "Question 1", "Answer 1", 0.5)
+        append_record(log_path, "Wage_Expectation", "Wage?", "6000000", "ACCEPTED")
+
+        df = read_scores(csv_path)
+        assert scores_path_for(csv_path).exists()
+        assert str(df["score"].dtype) == "float32" and str(df["label"].dtype) == "category"
+        assert df["label"].tolist() == ["Q1", "Wage_Expectation"] and df["score"].isna().tolist() == [False, True]
+
+        # An append within the same mtime tick is still seen (the size changed)
+        import os
+        tick = log_path.stat().st_mtime_ns
+        append_record(log_path, "Q2", "Question 2", "Answer 2", 0.25)
+        os.utime(log_path, ns=(tick, tick))
+        scores = read_scores(csv_path, columns=["score"], answers_only=True)
+        assert list(scores.columns) == ["score"] and scores["score"].tolist() == [0.5, 0.25]
+        # Up to date: served from the Feather file, even if it is older than the log
+        built = scores_path_for(csv_path).stat().st_mtime_ns
+        os.utime(log_path, ns=(tick, tick))
+        os.utime(scores_path_for(csv_path), ns=(tick - 10**9, tick - 10**9))
+        assert source_signature(csv_path) == _stored_signature(scores_path_for(csv_path))
+        assert len(read_scores(csv_path)) == 3 and scores_path_for(csv_path).stat().st_mtime_ns < built
+        # A file written without a signature is rebuilt on its first read
+        write_scores([], scores_path_for(csv_path))
+        assert len(read_scores(csv_path)) == 3
+
+        # Legacy 4-row CSV without a log
+        materialize_csv(log_path, csv_path)
+        log_path.unlink()
+        scores_path_for(csv_path).unlink()
+        assert read_scores(csv_path, columns=["label"])["label"].tolist() == ["Q1", "Wage_Expectation", "Q2"]
+
+def test_embedding_store():
+    import numpy as np
+    from app.modules.io_manager.embedding_store import EmbeddingStore
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = EmbeddingStore("encoder-a", 4, root=Path(tmpdir))
+        assert store.append("ana", ["L1", "L2"], np.eye(4)[:2]) == [0, 1]
+        assert store.append("budi", ["L1"], np.eye(4)[2:3]) == [2]
+        assert store.append("ana", ["L1"], np.eye(4)[3:4]) == [3]  # re-graded answer
+
+        reopened = EmbeddingStore.open("encoder-a", root=Path(tmpdir))
+        assert reopened.header() == {"model": "encoder-a", "dim": 4, "dtype": "<f2"}
+        keys, vectors = reopened.vectors("ana")
+        assert keys == ["L2", "L1"] and vectors.tolist() == [[0, 1, 0, 0], [0, 0, 0, 1]]
+        keys, vectors = reopened.vectors("ana", keys=["L2"])
+        assert isinstance(vectors.base, np.memmap) or isinstance(vectors, np.memmap)  # zero-copy run
+        assert reopened.get("budi", "L1").tolist() == [0, 0, 1, 0]
+        assert EmbeddingStore.open("encoder-b", root=Path(tmpdir)) is None
+
+        try:
+            EmbeddingStore("encoder-a", 8, root=Path(tmpdir)).append("ana", ["Q1"], np.ones((1, 8)))
+            assert False, "dimension mismatch accepted"
+        except ValueError:
+            pass
+
+def test_mtime_cache():
+    import os
+    from app.modules import frontend_loader
+    from app.modules.frontend_loader import MtimeCache
+
+    loads = []
+    def load(path):
+        loads.append(path)
+        return json.loads(Path(path).read_text())
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "ana.json"
+        cache = MtimeCache()
+        assert cache.get(path, load) is None
+        path.write_text(json.dumps({"Position": "Chef"}))
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        assert cache.get(path, load) == {"Position": "Chef"}
+        # Unchanged mtime: served from the cache, as a copy
+        cache.get(path, load)["Position"] = "OB"
+        assert cache.get(path, load) == {"Position": "Chef"}
+        assert len(loads) == 1
+        # Edited file: loaded again
+        path.write_text(json.dumps({"Position": "Accountant"}))
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+        assert cache.get(path, load) == {"Position": "Accountant"}
+        assert len(loads) == 2
+
+        # Write-through: the value put() after writing is served without a load
+        data = {"Position": "General Manager"}
+        path.write_text(json.dumps(data))
+        os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+        cache.put(path, data)
+        data["Position"] = "mutated by caller"
+        assert cache.get(path, load) == {"Position": "General Manager"}
+        assert len(loads) == 2
+
+        # Static frontend files go through the same cache
+        css = Path(tmpdir) / "style.css"
+        css.write_text("body {}")
+        frontend_loader._static_cache.clear()
+        assert frontend_loader._read(css) == "body {}"
+        css.write_text("body { color: red; }")
+        os.utime(css, ns=(4_000_000_000, 4_000_000_000))
+        assert frontend_loader._read(css) == "body { color: red; }"
+        assert frontend_loader._read(Path(tmpdir) / "missing.css") is None
+        frontend_loader._static_cache.clear()
+
+def test_queued_logging():
+    import gzip
+    from app.modules.logging import logger as lg
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            lg.configure_logging(log_dir=Path(tmpdir), json_format=True, max_open_sinks=2, max_bytes=400, backup_count=2, console=False)
+            for i in range(5):
+                lg.log_user_event(f"user{i}", "answer recorded", label="Q1", score=0.5)
+            for _ in range(20):
+                lg.log_user_event("user0", "x" * 50)
+            lg.flush_logging()
+
+            assert len(lg._state.dispatcher.pool) == 2  # bounded open sinks
+            users = Path(tmpdir) / "users"
+            assert sorted(p.name for p in users.glob("user[1-4].log")) == ["user1.log", "user2.log", "user3.log", "user4.log"]
+            record = json.loads((users / "user3.log").read_text().splitlines()[0])
+            assert record["user_id"] == "user3" and record["label"] == "Q1" and record["score"] == 0.5
+
+            backups = sorted(users.glob("user0.log.*.gz"))
+            assert backups and len(backups) <= 2
+            with gzip.open(backups[0], "rt") as f:
+                assert "user_id" in f.readline()
+        finally:
+            lg.shutdown_logging()
+            lg.configure_logging(log_dir=lg.LOG_DIR, json_format=False, max_open_sinks=lg.MAX_OPEN_SINKS,
+                                 max_bytes=lg.MAX_BYTES, backup_count=lg.BACKUP_COUNT, console=True)
+
+def test_file_backend():
+    from app.modules.io_manager.storage_backend import FileBackend
+    from app.modules.auth.user_index import user_index
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = FileBackend(Path(tmpdir) / "users", Path(tmpdir) / "reports")
+
+        backend.save_user({"Username": "zed", "Position": "Chef"})
+        backend.save_user({"Username": "yan", "File_ID": "70-1"}, filename="70-1.json")
+        assert (Path(tmpdir) / "users" / "zed.json").exists()
+        assert backend.load_user("zed")["Position"] == "Chef"
+        assert backend.load_user("yan")["File_ID"] == "70-1"
+        assert backend.load_user("nobody") is None
+        # Another instance on the same directory finds them too; the
+        # index lives next to the directory, not in the shared one
+        assert FileBackend(Path(tmpdir) / "users", Path(tmpdir) / "reports").load_user("yan")["File_ID"] == "70-1"
+        assert (Path(tmpdir) / "users.index.json").exists()
+        assert "zed" not in user_index._users
+
+        backend.append_answer("70-1", "L1", "Question 1", "Answer 1", 0.5)
+        assert [a["label"] for a in backend.load_answers("70-1")] == ["L1"]
+        backend.save_decision("70-1", {"label": "Layak"}, username="yan", position="Chef")
+        assert backend.load_decision("70-1")["username"] == "yan"
+
+def test_sqlite_backend():
+    from app.modules.io_manager.storage_backend import SQLiteBackend
+    import pandas as pd
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = SQLiteBackend(Path(tmpdir) / "test.db")
+
+        backend.save_user({"Username": "alice", "File_ID": "65-1", "Position": "Chef"})
+        assert backend.load_user("alice")["File_ID"] == "65-1"
+        assert backend.load_user("nobody") is None
+
+        backend.append_answer("65-1", "L1", "Question 1", "Answer 1", 0.5)
+        backend.append_answer("65-1", "Q1", "Question 2", "Answer 2", 0.25)
+        assert [a["label"] for a in backend.load_answers("65-1")] == ["L1", "Q1"]
+
+        backend.save_decision("65-1", {"label": "Layak", "final_score": 0.85}, username="alice", position="Chef")
+        ranked = backend.query_decisions(position="Chef")
+        assert ranked["report_id"].tolist() == ["65-1"]
+
+        df = pd.read_csv(backend.materialize_report("65-1", Path(tmpdir) / "65-1.csv"))
+        assert list(df.columns) == ["ID", "L1", "Q1"]
+
+        # close() closes the connections of every thread
+        import sqlite3
+        import threading
+        conns = []
+        thread = threading.Thread(target=lambda: conns.append(backend._conn()))
+        thread.start()
+        thread.join()
+        conns.append(backend._conn())
+        backend.close()
+        for conn in conns:
+            try:
+                conn.execute("SELECT 1")
+                assert False, "connection left open"
+            except sqlite3.ProgrammingError:
+                pass
+        assert backend.load_user("alice")["File_ID"] == "65-1"  # reconnects
+
+def test_migrate():
+    from app.modules.io_manager.answer_log import append_record, materialize_csv
+    from app.modules.io_manager.jsonio import save_json
+    from app.modules.io_manager.migrate import migrate
+    from app.modules.io_manager.storage_backend import SQLiteBackend
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data, db = Path(tmpdir) / "data", Path(tmpdir) / "hireon.db"
+        reports = data / "reports"
+        save_json({"Username": "alice", "File_ID": "65-1", "Position": "Chef"}, data / "users" / "65-1.json")
+        save_json({"Username": "bob", "Position": "OB"}, data / "users" / "bob.json")
+        save_json({"no": "username"}, data / "users" / "broken.json")
+
+        append_record(reports / "65-1.jsonl", "Q1", "Pengalaman?", "Lima tahun", 0.5)
+        append_record(reports / "65-1.jsonl", "Wage_Expectation", "Gaji?", "6000000", "ACCEPTED")
+        append_record(reports / "65-1.jsonl", "FINAL", "Summary", str({"label": "Layak", "final_score": 0.85}), 0.0)
+        # Legacy report: CSV only, no log
+        append_record(Path(tmpdir) / "bob.jsonl", "Q1", "Pengalaman?", "Baru lulus", 0.25)
+        materialize_csv(Path(tmpdir) / "bob.jsonl", reports / "bob.csv")
+
+        counts = migrate(db, data)
+        assert counts == {"users": 2, "reports": 2, "answers": 4, "decisions": 1}
+        assert migrate(db, data) == {"users": 2, "reports": 0, "answers": 0, "decisions": 0}  # re-run is safe
+
+        backend = SQLiteBackend(db)
+        try:
+            assert backend.load_user("alice")["File_ID"] == "65-1"
+            assert [a["score"] for a in backend.load_answers("65-1")] == [0.5, "ACCEPTED", 0.0]
+            assert [a["answer"] for a in backend.load_answers("bob")] == ["Baru lulus"]
+            decisions = backend.query_decisions()
+            assert decisions[["report_id", "username", "position", "label"]].values.tolist() == [["65-1", "alice", "Chef", "Layak"]]
+        finally:
+            backend.close()
+
 # =================================================================
 # TEXT MINING TESTS
 # =================================================================
@@ -97,6 +453,60 @@ def test_tokenizer():
     assert "this" in tokens
     assert "is" in tokens
 
+def test_stem_cache():
+    from app.modules.QnA.preprocessing import StemCache
+    from app.modules.QnA.model_registry import registry
+
+    calls = []
+
+    class CountingStemmer:
+        def stem(self, word):
+            calls.append(word)
+            return word[:-3] if word.endswith("kan") else word
+
+    registry.register("stemmer", CountingStemmer)
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "stems.json"
+            cache = StemCache(max_entries=2, path=path)
+            assert [cache.stem(w) for w in ["jalankan", "jalankan", "makan"]] == ["jalan", "jalan", "ma"]
+            assert len(calls) == 2  # repeated word stemmed once
+            cache.stem("kerja")
+            assert cache.stats()["size"] == 2  # bounded
+            cache.save()
+
+            restored = StemCache(path=path)
+            assert restored.stem("kerja") == "kerja"
+            assert len(calls) == 3  # served from the saved file
+    finally:
+        from app.modules.QnA.model_registry import _load_stemmer
+        registry.register("stemmer", _load_stemmer)
+
+def test_answer_analysis():
+    from app.modules.evaluation.analyser import AnswerAnalysis, question_tokens, clarity_score, relevance_score
+
+    question = "Apa pengalaman anda di dapur?"
+    answer = "Saya memasak di dapur hotel selama dua tahun, dan saya suka pengalaman itu."
+    analysis = AnswerAnalysis(answer)
+
+    # Expected values computed with the analyser before answers were tokenized once
+    long_answer = (
+        "Saya bekerja di restoran selama tiga tahun sebagai juru masak utama, mengatur menu harian, "
+        "memesan bahan, melatih dua asisten baru, dan menjaga kebersihan dapur sesuai standar "
+        "keamanan pangan yang berlaku di hotel kami!!!"
+    )
+    assert analysis.clarity() == clarity_score(answer) == 0.4753
+    assert AnswerAnalysis(long_answer).clarity() == clarity_score(long_answer) == 0.8297
+    assert AnswerAnalysis("ya").clarity() == 0.5
+    assert analysis.relevance(question) == relevance_score(answer, question) == 0.6
+    assert analysis.frequent_words(top_k=1) == {"memasak": 1}
+    assert analysis.similarity(answer) == 1.0
+    assert AnswerAnalysis("").clarity() == 0.0
+
+    hits = question_tokens.cache_info().hits
+    analysis.relevance(question)
+    assert question_tokens.cache_info().hits == hits + 1  # question tokenized once
+
 def test_behavioral_sentiment():
     from app.modules.QnA.text_mining import behavioral_analyze
     
@@ -112,6 +522,582 @@ def test_behavioral_sentiment():
     result = behavioral_analyze("The weather is nice today")
     assert -0.1 < result["overall"] < 0.1
 
+def test_weighted_words():
+    from app.modules.QnA.text_mining import BehavioralSentiment
+
+    engine = BehavioralSentiment()
+    tokens = "saya honest dan reliable tapi kadang late honest trustworthy".split()
+
+    # Same ranking as scoring each word with score_axes([word])
+    expected = {}
+    for word in tokens:
+        expected[word] = sum(engine.score_axes([word]).values())
+    expected = sorted(expected.items(), key=lambda x: x[1], reverse=True)[:3]
+
+    assert engine.top_weighted(tokens, k=3) == expected
+    assert expected[0] == ("trustworthy", 1.0)
+
+def test_model_registry():
+    from app.modules.QnA.model_registry import ModelRegistry
+
+    calls = []
+    reg = ModelRegistry()
+    reg.register("fake", lambda: calls.append(1) or object())
+
+    assert not reg.is_loaded("fake")  # nothing loaded at registration
+    first = reg.get("fake")
+    assert reg.get("fake") is first  # one instance per process
+    assert len(calls) == 1
+
+    reg.release("fake")
+    assert not reg.is_loaded("fake")
+    reg.warm("fake")
+    assert len(calls) == 2
+    assert reg.release_idle(3600) == []  # used just now
+
+def test_inference_backend():
+    import os
+    from app.modules.QnA import model_registry as mr
+
+    assert mr.model_tag(mr.EMBEDDING_MODEL_ID) == mr.EMBEDDING_MODEL_ID  # torch by default
+    try:
+        mr.set_inference_backend("onnx-int8")
+        assert mr.model_tag(mr.EMBEDDING_MODEL_ID).endswith("@onnx-int8")
+        assert not mr.registry.is_loaded("sentiment")
+        try:
+            mr.set_inference_backend("tensorflow")
+            assert False, "unknown backend accepted"
+        except ValueError:
+            pass
+
+        # A bad value in the environment falls back to torch (with a
+        # logged warning) instead of failing the import
+        os.environ["HIREON_INFERENCE_BACKEND"] = "tensorflow"
+        with temp_data_root():
+            mr._backend_from_env()
+        assert mr.get_inference_backend() == "torch"
+    finally:
+        os.environ.pop("HIREON_INFERENCE_BACKEND", None)
+        mr.set_inference_backend("torch")
+
+def test_onnx_models():
+    try:
+        import onnx
+        from onnx import helper, TensorProto
+    except ImportError:
+        return  # optional dependency (requirements.txt)
+    import numpy as np
+    from app.modules.QnA.onnx_backend import OnnxSentimentClassifier, OnnxSentenceEncoder, MODEL_FILE, CONFIG_FILE
+
+    class WordLengths:
+        """Tokenizer stand-in: one id per word (its length), 0-padded."""
+        def __call__(self, texts, padding=True, truncation=True, max_length=512, return_tensors="np"):
+            ids = [[len(w) for w in t.split()][:max_length] for t in texts]
+            width = max(len(row) for row in ids)
+            return {
+                "input_ids": np.array([row + [0] * (width - len(row)) for row in ids], dtype=np.int64),
+                "attention_mask": np.array([[1] * len(row) + [0] * (width - len(row)) for row in ids], dtype=np.int64),
+            }
+
+    def save(model_dir, nodes, output, shape, initializers, config):
+        graph = helper.make_graph(
+            nodes, "tiny",
+            [helper.make_tensor_value_info(n, TensorProto.INT64, ["batch", "sequence"]) for n in ("input_ids", "attention_mask")],
+            [helper.make_tensor_value_info(output, TensorProto.FLOAT, shape)],
+            initializers,
+        )
+        model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+        model.ir_version = 8
+        model_dir.mkdir()
+        onnx.save(model, str(model_dir / MODEL_FILE))
+        (model_dir / CONFIG_FILE).write_text(json.dumps(config))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # logits = sum(input_ids) * [1, -1, 0.5]
+        save(Path(tmpdir) / "sentiment", [
+            helper.make_node("Cast", ["input_ids"], ["ids"], to=TensorProto.FLOAT),
+            helper.make_node("ReduceSum", ["ids", "axes"], ["total"], keepdims=1),
+            helper.make_node("Mul", ["total", "w"], ["logits"]),
+        ], "logits", ["batch", 3], [
+            helper.make_tensor("axes", TensorProto.INT64, [1], [1]),
+            helper.make_tensor("w", TensorProto.FLOAT, [1, 3], [1.0, -1.0, 0.5]),
+        ], {"max_length": 8, "id2label": {"0": "positive", "1": "negative", "2": "neutral"}})
+
+        # token embeddings = input_id * [1, 2]
+        save(Path(tmpdir) / "embedding", [
+            helper.make_node("Cast", ["input_ids"], ["ids"], to=TensorProto.FLOAT),
+            helper.make_node("Unsqueeze", ["ids", "axes"], ["ids3"]),
+            helper.make_node("Mul", ["ids3", "w"], ["token_embeddings"]),
+        ], "token_embeddings", ["batch", "sequence", 2], [
+            helper.make_tensor("axes", TensorProto.INT64, [1], [2]),
+            helper.make_tensor("w", TensorProto.FLOAT, [1, 1, 2], [1.0, 2.0]),
+        ], {"max_length": 8, "pooling": "mean"})
+
+        texts = ["aa bbb", "c", "dddd e ff"]
+        classifier = OnnxSentimentClassifier(Path(tmpdir) / "sentiment", quantized=False, tokenizer=WordLengths())
+        results = classifier(texts, batch_size=2)  # length-sorted batches, returned in input order
+        assert [r["label"] for r in results] == ["positive"] * 3
+        logits = np.array([[1.0, -1.0, 0.5]]) * np.array([[5.0], [1.0], [7.0]])
+        probs = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+        assert np.allclose([r["score"] for r in results], probs[:, 0], atol=1e-6)
+
+        encoder = OnnxSentenceEncoder(Path(tmpdir) / "embedding", quantized=False, tokenizer=WordLengths())
+        vectors = encoder.encode(texts, batch_size=2)  # padding is masked out of the mean
+        assert np.allclose(vectors, [[2.5, 5.0], [1.0, 2.0], [7 / 3, 14 / 3]])
+        unit = encoder.encode(texts, normalize_embeddings=True)
+        assert np.allclose(np.linalg.norm(unit, axis=1), 1.0)
+        assert np.allclose(encoder.encode("c"), [1.0, 2.0])
+
+        try:
+            OnnxSentenceEncoder(Path(tmpdir) / "embedding", quantized=True, tokenizer=WordLengths())
+            assert False, "missing int8 model accepted"
+        except FileNotFoundError:
+            pass
+
+def test_batch_scoring():
+    import numpy as np
+    from app.modules.QnA.model_registry import registry, _load_sentiment_pipeline, _load_embedding_model
+    from app.modules.QnA.text_mining import (
+        score_cache, analyze_sentiment, analyze_sentiment_batch, calculate_relevance, calculate_relevance_batch,
+    )
+
+    seen = {"sentiment": [], "embedding": []}
+
+    class ByWord:
+        def __call__(self, texts, **kwargs):
+            seen["sentiment"].extend(texts)
+            return [{"label": "negative" if "tidak" in t else "positive", "score": 0.5} for t in texts]
+
+    class ByLength:
+        def encode(self, texts, **kwargs):
+            seen["embedding"].extend(texts)
+            out = np.zeros((len(texts), 4), dtype=np.float32)
+            out[np.arange(len(texts)), [len(t) % 4 for t in texts]] = 1.0
+            return out
+
+    class Short:
+        def __call__(self, texts, **kwargs):
+            return [{"label": "positive", "score": 0.5}][:len(texts) - 1]
+
+    registry.register("sentiment", ByWord)
+    registry.register("embedding", ByLength)
+    try:
+        score_cache.clear()
+        texts = ["saya suka tim ini", "saya tidak suka lembur", "saya suka tim ini", "saya  suka tim ini "]
+        batch = analyze_sentiment_batch(texts)
+        # Misses are deduplicated (normalized text) before the forward pass
+        assert seen["sentiment"] == ["saya suka tim ini", "saya tidak suka lembur"]
+        score_cache.clear()
+        assert batch == [analyze_sentiment(t) for t in texts] == [0.5, -0.5, 0.5, 0.5]
+        assert analyze_sentiment_batch([]) == []
+
+        score_cache.clear()
+        answers = ["abcd", "abc", "abcd", "ab"]
+        questions = ["uji satu?", "uji satu?", "uji satu?", "uji dua?"]
+        encoded = {}
+        batch = calculate_relevance_batch(answers, questions, encoded=encoded)
+        # One encode pass: each distinct (answer, question) miss, plus the questions
+        assert sorted(seen["embedding"]) == sorted(["abcd", "abc", "ab", "uji satu?", "uji dua?"])
+        assert sorted(encoded) == ["ab", "abc", "abcd"]
+        seen["embedding"].clear()
+        assert calculate_relevance_batch(answers, questions) == batch
+        assert seen["embedding"] == []
+        score_cache.clear()
+        assert batch == [calculate_relevance(a, q) for a, q in zip(answers, questions)]
+
+        try:
+            calculate_relevance_batch(["abc", "ab"], ["uji satu?"])
+            assert False, "length mismatch must raise"
+        except ValueError:
+            pass
+        # A model returning fewer results than texts: 0.0 (uncached), or ValueError with strict
+        registry.register("sentiment", Short)
+        score_cache.clear()
+        assert analyze_sentiment_batch(["satu", "dua"]) == [0.0, 0.0]
+        try:
+            analyze_sentiment_batch(["satu", "dua"], strict=True)
+            assert False, "short model output must raise"
+        except ValueError:
+            pass
+    finally:
+        registry.register("sentiment", _load_sentiment_pipeline)
+        registry.register("embedding", _load_embedding_model)
+        score_cache.clear()
+
+def test_question_index():
+    import numpy as np
+    import app.modules.QnA.question_index as qi
+    import app.modules.QnA.model_registry as mr
+
+    encoded = []
+
+    class ByLength:
+        def encode(self, texts, **kwargs):
+            encoded.append(list(texts))
+            out = np.zeros((len(texts), 4), dtype=np.float32)
+            out[np.arange(len(texts)), [len(t) % 4 for t in texts]] = 1.0
+            return out
+
+    original_dir = qi.INDEX_DIR
+    mr.registry.register("embedding", ByLength)
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            qi.INDEX_DIR = Path(tmpdir)
+            qi._cached_index = qi._UNLOADED
+            assert qi.get_question_index() is None
+
+            # Index of an older question bank, dropped by the next build
+            (Path(tmpdir) / "0123456789abcdef.npy").write_bytes(b"")
+            (Path(tmpdir) / "0123456789abcdef.json").write_text("[]")
+            texts = qi.iter_question_texts()
+            path = qi.build_question_index()
+            assert path.name == f"{qi.question_bank_hash(texts)}.npy"
+            assert sorted(p.name for p in Path(tmpdir).iterdir()) == sorted([path.name, f"{path.stem}.json"])
+            assert qi.build_question_index() == path and len(encoded) == 1  # up to date: not rebuilt
+
+            index = qi.get_question_index()
+            assert len(index) == len(texts) and qi.get_question_index() is index
+            question = texts[3]
+            assert index.lookup(f"  {question} ").tolist() == ByLength().encode([question])[0].tolist()
+            assert question in index
+            assert index.lookup("Pertanyaan yang tidak ada di bank?") is None
+            assert "Pertanyaan yang tidak ada di bank?" not in index
+
+            # Another backend means another encoder: the torch index is not used
+            mr.set_inference_backend("onnx")
+            mr.registry.register("embedding", ByLength)
+            assert qi.get_question_index() is None
+            mr.set_inference_backend("torch")
+            reloaded = qi.get_question_index()
+            assert reloaded is not index and reloaded.vectors.shape == (len(texts), 4)
+    finally:
+        qi.INDEX_DIR = original_dir
+        qi._cached_index = qi._UNLOADED
+        mr.set_inference_backend("torch")
+
+def test_score_cache():
+    from app.modules.QnA.score_cache import ScoreCache, make_key, MISSING
+
+    # Normalized text -> same key; different model -> different key
+    assert make_key("sentiment", ["Saya  suka "], ("m1",)) == make_key("sentiment", ["Saya suka"], ("m1",))
+    assert make_key("sentiment", ["Saya suka"], ("m1",)) != make_key("sentiment", ["Saya suka"], ("m2",))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = ScoreCache(max_entries=2, disk_dir=Path(tmpdir))
+        cache.put("a", 0.1)
+        cache.put("b", 0.2)
+        cache.put("c", 0.3)  # evicts "a" from memory, disk still has it
+        assert cache.stats()["size"] == 2
+        assert cache.get("a") == 0.1
+        assert cache.get("zzz") is MISSING
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["disk_hits"] == 1 and stats["misses"] == 1
+
+def test_grading_worker():
+    from app.modules.QnA.grading_worker import GradingWorker
+
+    class LengthWorker(GradingWorker):
+        @staticmethod
+        def _grade(batch):
+            for j in batch:
+                j.future.set_result({"grade": len(j.answer) / 10, "sentiment": 0.0, "relevance": 0.0})
+
+    worker = LengthWorker()
+    future = worker.submit("alice", 0, "Q?", "abc")
+    worker.submit("alice", 1, "Q?", "abcdef")
+    worker.submit("bob", 0, "Q?", "a")
+    assert future.result(timeout=5)["grade"] == 0.3
+
+    results = worker.results("alice", timeout=5)
+    assert sorted(results) == [0, 1] and results[1]["grade"] == 0.6
+    assert worker.pending("alice") == 0
+    worker.discard("alice")
+    assert worker.results("alice") == {}
+    worker.shutdown()
+
+def test_grading_worker_failures():
+    import time
+    import numpy as np
+    from concurrent.futures import Future
+    from app.modules.QnA.grading_worker import GradingWorker, GradingJob
+    from app.modules.QnA.model_registry import registry, _load_sentiment_pipeline, _load_embedding_model
+    from app.modules.QnA.text_mining import score_cache
+
+    class Picky:
+        def __call__(self, texts, **kwargs):
+            if any("boom" in t for t in texts):
+                raise RuntimeError("bad input")
+            return [{"label": "positive", "score": 0.5} for _ in texts]
+
+    class Ones:
+        def encode(self, texts, **kwargs):
+            return np.ones((len(texts), 4), dtype=np.float32) / 2
+
+    class Stuck(GradingWorker):
+        def _grade(self, batch):
+            time.sleep(0.5)
+
+    registry.register("sentiment", Picky)
+    registry.register("embedding", Ones)
+    try:
+        # One failing answer only fails its own job
+        worker = GradingWorker(store_embeddings=False)
+        worker.shutdown()
+        jobs = [GradingJob("ana", i, "", answer, Future()) for i, answer in enumerate(["baik", "boom", "bagus"])]
+        worker._grade(jobs)
+        assert jobs[0].future.result(timeout=0)["sentiment"] == 0.5
+        assert jobs[2].future.result(timeout=0)["sentiment"] == 0.5
+        assert isinstance(jobs[1].future.exception(timeout=0), RuntimeError)
+
+        # The timeout bounds the whole wait; unfinished jobs come back as errors
+        stuck = Stuck()
+        for i in range(3):
+            stuck.submit("budi", i, "Q?", "jawaban")
+        started = time.perf_counter()
+        results = stuck.results("budi", timeout=0.1)
+        assert time.perf_counter() - started < 0.4
+        assert all("error" in r and r["grade"] == 0.0 for r in results.values())
+        stuck.shutdown()
+    finally:
+        registry.register("sentiment", _load_sentiment_pipeline)
+        registry.register("embedding", _load_embedding_model)
+        score_cache.clear()
+
+def test_grading_worker_embeddings():
+    import numpy as np
+    import app.modules.io_manager.embedding_store as embedding_store
+    from app.modules.QnA.grading_worker import GradingWorker, answer_label
+    from app.modules.QnA.model_registry import registry, model_tag, EMBEDDING_MODEL_ID
+    from app.modules.QnA.model_registry import _load_sentiment_pipeline, _load_embedding_model
+    from app.modules.QnA.text_mining import score_cache, answer_embedding_store
+
+    class Positive:
+        def __call__(self, texts, **kwargs):
+            return [{"label": "positive", "score": 0.5} for _ in texts]
+
+    encoded = []
+
+    class ByLength:
+        def encode(self, texts, **kwargs):
+            encoded.extend(texts)
+            out = np.zeros((len(texts), 4), dtype=np.float32)
+            out[np.arange(len(texts)), [len(t) % 4 for t in texts]] = 1.0
+            return out
+
+    registry.register("sentiment", Positive)
+    registry.register("embedding", ByLength)
+    model_id = model_tag(EMBEDDING_MODEL_ID)
+    cache_key = (model_id, str(embedding_store.EMBEDDINGS_DIR))
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            embedding_store._stores[cache_key] = embedding_store.EmbeddingStore(model_id, 4, root=Path(tmpdir))
+            worker = GradingWorker()
+            for index, answer in enumerate(["abcd", "abc", "ab"]):
+                worker.submit("ana", index, "abcd", answer)
+            results = worker.results("ana", timeout=10)
+            worker.shutdown()  # waits for the batch to be persisted
+
+            assert [answer_label(i) for i in range(3)] == ["L1", "L2", "Q1"]
+            assert results[0]["relevance"] == 1.0 and results[1]["relevance"] == 0.0
+            keys, vectors = answer_embedding_store().vectors("ana")
+            assert keys == ["L1", "L2", "Q1"] and vectors.argmax(axis=1).tolist() == [0, 3, 2]
+            # Vectors computed for relevance were reused for the store
+            assert encoded.count("abc") == 1 and encoded.count("ab") == 1
+
+            # Relevance cached and vectors stored: nothing is encoded again
+            encoded.clear()
+            worker = GradingWorker()
+            for index, answer in enumerate(["abcd", "abc", "ab"]):
+                worker.submit("ana", index, "abcd", answer)
+            worker.results("ana", timeout=10)
+            worker.shutdown()
+            assert encoded == []
+
+            # Another candidate with the same answers: encoded only for the store
+            worker = GradingWorker()
+            worker.submit("budi", 1, "abcd", "abc")
+            worker.submit("budi", 2, "abcd", "ab")
+            worker.results("budi", timeout=10)
+            worker.shutdown()
+            assert sorted(encoded) == ["ab", "abc"]
+            assert answer_embedding_store().vectors("budi")[0] == ["L2", "Q1"]
+    finally:
+        embedding_store._stores.pop(cache_key, None)
+        registry.register("sentiment", _load_sentiment_pipeline)
+        registry.register("embedding", _load_embedding_model)
+        score_cache.clear()
+
+def test_micro_batcher():
+    import threading
+    from app.modules.QnA.model_server import MicroBatcher
+
+    calls = []
+    batcher = MicroBatcher(lambda items: calls.append(len(items)) or [x * 2 for x in items], max_batch=100, max_wait_ms=200)
+    results = {}
+
+    def submit(i):
+        results[i] = batcher.submit([i, i + 100]).result(timeout=5)
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert all(results[i] == [2 * i, 2 * (i + 100)] for i in range(5))
+    assert sum(calls) == 10 and len(calls) < 5  # requests were coalesced
+
+def test_model_server_failure():
+    import threading
+    from app.modules.QnA import model_server, text_mining
+    from app.modules.QnA.model_registry import registry, _load_sentiment_pipeline
+    from app.modules.QnA.model_server import ModelServer, ModelClient, ModelServerError
+    from app.modules.QnA.score_cache import score_cache, make_key, MISSING
+    from app.modules.QnA.model_registry import model_tag, SENTIMENT_MODEL_ID
+
+    class Broken:
+        def __call__(self, texts, **kwargs):
+            raise RuntimeError("CUDA out of memory")
+
+    class Positive:
+        def __call__(self, texts, **kwargs):
+            return [{"label": "positive", "score": 0.5} for _ in texts]
+
+    registry.register("sentiment", Broken)
+    score_cache.clear()
+    get_client = text_mining.get_model_client
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            server = ModelServer(str(Path(tmpdir) / "models.sock"), max_wait_ms=1)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            client = ModelClient(server.socket_path, timeout=5)
+            try:
+                client.sentiment(["jawaban"])
+                assert False, "failed inference returned scores"
+            except ModelServerError:
+                pass
+            finally:
+                client.close()
+                server.shutdown()
+                server.server_close()
+        key = make_key("sentiment", ["jawaban"], (model_tag(SENTIMENT_MODEL_ID),))
+        assert score_cache.get(key) is MISSING  # the server cached nothing either
+
+        # The worker falls back to the in-process model and caches its score
+        class FailingServer:
+            def sentiment(self, texts):
+                raise ModelServerError("RuntimeError: CUDA out of memory")
+
+        registry.register("sentiment", Positive)
+        text_mining.get_model_client = FailingServer
+        assert text_mining.analyze_sentiment_batch(["jawaban"]) == [0.5]
+        assert text_mining.analyze_sentiment("jawaban") == 0.5
+    finally:
+        text_mining.get_model_client = get_client
+        model_server._client_disabled = False
+        registry.register("sentiment", _load_sentiment_pipeline)
+        score_cache.clear()
+
+def test_metrics():
+    import json
+    from app.modules.logging.metrics import MetricsRegistry
+
+    disabled = MetricsRegistry(enabled=False)
+    with disabled.span("inference"):
+        pass
+    disabled.inc("cache_hits")
+    assert disabled.snapshot()["stages"] == [] and disabled.snapshot()["counters"] == []
+
+    m = MetricsRegistry(enabled=True, flush_interval=3600)
+    for ms in range(1, 101):
+        m.observe("inference", ms / 1000, model="sentiment")
+    try:
+        with m.span("decision"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    m.inc("cache_hits", cache="score")
+
+    stage = next(s for s in m.snapshot()["stages"] if s["stage"] == "inference")
+    assert stage["count"] == 100 and stage["p50_ms"] == 51.0 and stage["p99_ms"] == 99.0
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        m.write(Path(tmpdir))
+        prom = (Path(tmpdir) / "metrics.prom").read_text()
+        assert 'hireon_stage_seconds{stage="inference",model="sentiment",quantile="0.95"}' in prom
+        assert 'hireon_errors_total{stage="decision"} 1' in prom
+        snapshot = json.loads((Path(tmpdir) / "metrics.json").read_text())
+        assert {"name": "cache_hits", "labels": {"cache": "score"}, "value": 1} in snapshot["counters"]
+
+def test_answer_index():
+    import numpy as np
+    import app.modules.QnA.answer_index as answer_index
+    from app.modules.QnA import Judger
+    from app.modules.QnA.model_registry import registry, model_tag, EMBEDDING_MODEL_ID, _load_embedding_model
+    from app.modules.QnA.text_mining import score_cache
+    from app.modules.QnA.answer_index import LSHIndex, AnswerIndex, question_key, RECORD_SUFFIX
+
+    rng = np.random.default_rng(3)
+    vectors = rng.standard_normal((600, 32)) + 0.8
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    # Exact scan below center_rows, LSH buckets above; same answers either way
+    index = LSHIndex(dim=32, n_tables=16, n_bits=6, center_rows=64)
+    index.add(vectors[:40], [f"u{i}" for i in range(40)], ["Q1"] * 40)
+    assert index.query(vectors[7])[0] == ("u7", "Q1", 1.0)
+    index.add(vectors[40:], [f"u{i}" for i in range(40, 600)], ["Q1"] * 560)
+    assert index.query(vectors[500])[0].user_id == "u500"
+    assert index.query(vectors[500], exclude_user="u500") == []
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first, second = AnswerIndex(tmpdir, dim=32), AnswerIndex(tmpdir, dim=32)
+        assert first.check_and_add("Pengalaman?", vectors[0], "ana", "Q1") == []
+        # Another worker sees the record; torn tail records are ignored
+        with open(Path(tmpdir) / f"{question_key('Pengalaman?')}{RECORD_SUFFIX}", "ab") as f:
+            f.write(b"\x00" * 10)
+        matches = second.check_and_add("Pengalaman?", vectors[0], "budi", "Q1")
+        assert [m.user_id for m in matches] == ["ana"]
+        assert second.query("Motivasi?", vectors[0]) == []
+
+    # Ids longer than the stored user field are still told apart
+    long_a, long_b = "kandidat-" + "a" * 60 + "-1", "kandidat-" + "a" * 60 + "-2"
+    index.add(vectors[:1], [long_a], ["Q2"])
+    assert sorted(m.user_id for m in index.query(vectors[0], exclude_user=long_b)) == [long_a, "u0"]
+    assert [m.user_id for m in index.query(vectors[0], exclude_user=long_a)] == ["u0"]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        AnswerIndex(tmpdir, dim=32).add("Pengalaman?", vectors[:1], [long_a], ["Q1"])
+        reloaded = AnswerIndex(tmpdir, dim=32)
+        assert reloaded.query("Pengalaman?", vectors[0], exclude_user=long_a) == []
+        assert len(reloaded.query("Pengalaman?", vectors[0], exclude_user=long_b)) == 1
+
+    # Judger integration: identical answers from two candidates, all
+    # files under a temporary data root
+    class Fixed:
+        def encode(self, texts, **kwargs):
+            return np.tile(np.eye(4, dtype=np.float32)[0], (len(texts), 1))
+
+    import app.modules.io_manager.embedding_store as embedding_store
+
+    cache_key = (model_tag(EMBEDDING_MODEL_ID), str(embedding_store.EMBEDDINGS_DIR))
+    registry.register("embedding", Fixed)
+    try:
+        with temp_data_root() as root:
+            embedding_store._stores[cache_key] = embedding_store.EmbeddingStore(cache_key[0], 4, root=root / "embeddings")
+            answer_index._cached_index = AnswerIndex(root / "index", dim=4)
+            answer_index._cached_tag = model_tag(EMBEDDING_MODEL_ID)
+            answer = "Saya selalu datang tepat waktu dan bekerja sama dengan tim."
+            Judger("testuser", 5000, similarity_check=True).process_answer("Pengalaman?", answer)
+            judger = Judger("otheruser", 5000, similarity_check=True)
+            assert judger.file_path.parent == root / "reports"
+            judger.process_answer("Pengalaman?", answer)
+            assert judger.similarity_flags[0]["matches"][0]["user_id"] == "testuser"
+            assert embedding_store._stores[cache_key].get("otheruser", "L1").tolist() == [1, 0, 0, 0]
+    finally:
+        embedding_store._stores.pop(cache_key, None)
+        answer_index._cached_index = None
+        registry.register("embedding", _load_embedding_model)
+        score_cache.clear()
+
 # =================================================================
 # AUTH TESTS
 # =================================================================
@@ -120,26 +1106,61 @@ def test_auth_create_user():
     import tempfile
     import shutil
     
-    # Use temp directory for testing
+    # Users go to a temporary directory (file backend)
+    with temp_data_root() as root:
+        metadata = create_user("testuser", "TestPass123!", "Test User")
+        assert metadata["Username"] == "testuser"
+        assert (root / "users" / "testuser.json").exists()
+
+        # Verify login
+        assert verify_user("testuser", "TestPass123!") == True
+        assert verify_user("testuser", "wrongpass") == False
+
+        # Load user
+        user = load_user("testuser")
+        assert user is not None
+
+def test_user_index():
+    import types
+    import app.modules.auth as auth
+    from app.modules.auth.user_index import UserIndex
+    from app.modules.io_manager import save_json
+
+    # The package attribute is the submodule (patchable), not the instance
+    assert isinstance(auth.user_index, types.ModuleType)
+
     with tempfile.TemporaryDirectory() as tmpdir:
-        import app.modules.io_manager.storage_paths as sp
-        original_users_dir = sp.USERS_DIR
-        sp.USERS_DIR = Path(tmpdir)
-        
-        try:
-            metadata = create_user("testuser", "TestPass123!", "Test User")
-            assert metadata["Username"] == "testuser"
-            
-            # Verify login
-            assert verify_user("testuser", "TestPass123!") == True
-            assert verify_user("testuser", "wrongpass") == False
-            
-            # Load user
-            user = load_user("testuser")
-            assert user is not None
-            
-        finally:
-            sp.USERS_DIR = original_users_dir
+        users_dir = Path(tmpdir) / "users"
+        index_path = Path(tmpdir) / "user_index.json"
+        save_json({"Username": "alice"}, users_dir / "alice.json")
+        save_json({"Username": "bob", "File_ID": "66-1"}, users_dir / "66-1.json")
+
+        index = UserIndex(users_dir, index_path)
+        assert index.lookup("bob") == users_dir / "66-1.json"  # built on first use
+        assert index.lookup("carol") is None
+        assert index_path.exists()
+
+        # A file written by someone else makes the index stale -> rebuilt
+        save_json({"Username": "carol"}, users_dir / "67-2.json")
+        fresh = UserIndex(users_dir, index_path)
+        assert fresh.lookup("carol") == users_dir / "67-2.json"
+
+        # Two processes: B records a user between A's stamp() and A's add()
+        a, b = UserIndex(users_dir, index_path), UserIndex(users_dir, index_path)
+        before_a = a.stamp()
+        before_b = b.stamp()
+        save_json({"Username": "dave"}, users_dir / "68-3.json")
+        b.add("dave", users_dir / "68-3.json", before=before_b)
+        save_json({"Username": "erin"}, users_dir / "69-4.json")
+        a.add("erin", users_dir / "69-4.json", before=before_a)
+        assert a._users.get("dave") == "68-3.json"  # A rescanned, not re-stamped
+        assert a.lookup("erin") == users_dir / "69-4.json"
+        assert UserIndex(users_dir, index_path).lookup("dave") == users_dir / "68-3.json"
+
+        # Without a stamp, add() rescans
+        save_json({"Username": "frank"}, users_dir / "70-5.json")
+        a.add("frank", users_dir / "70-5.json")
+        assert a.lookup("frank") == users_dir / "70-5.json"
 
 # =================================================================
 # QUESTION BANK TESTS
@@ -190,48 +1211,275 @@ def test_decision_engine():
     assert result["label"] == "Dipertimbangkan"
     assert 0.6 <= result["final_score"] < 0.8
 
+def test_regrade():
+    import numpy as np
+    from app.modules.QnA.model_registry import registry, _load_sentiment_pipeline, _load_embedding_model
+    from app.modules.QnA.text_mining import score_cache
+    from app.modules.io_manager.answer_log import append_record
+    from app.modules.io_manager.jsonio import save_json
+    from app.modules.evaluation.regrade import regrade_reports, load_results, RESULTS_NAME
+
+    class Positive:
+        def __call__(self, texts, **kwargs):
+            return [{"label": "positive", "score": 0.5} for _ in texts]
+
+    class Ones:
+        def encode(self, texts, **kwargs):
+            return np.ones((len(texts), 4), dtype=np.float32) / 2
+
+    from app.modules.io_manager.storage_backend import FileBackend, get_backend, set_backend
+
+    registry.register("sentiment", Positive)
+    registry.register("embedding", Ones)
+    original = get_backend()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            reports, users, out = Path(tmpdir) / "reports", Path(tmpdir) / "users", Path(tmpdir) / "out"
+            reports.mkdir()
+            set_backend(FileBackend(users, reports))
+            for name in ("ana", "budi", "citra"):
+                save_json({"Username": name, "Position": "Chef", "months_experience": 14}, users / f"{name}.json")
+                append_record(reports / f"{name}.jsonl", "Q1", "Pengalaman?", "Saya dedicated dan reliable", 0.0)
+                append_record(reports / f"{name}.jsonl", "Wage_Expectation", "Gaji?", "6000000", 0.0)
+
+            first = regrade_reports(reports, users, out_dir=out, workers=1, limit=2)
+            assert first["graded"] == 2
+            with open(out / RESULTS_NAME, "a", encoding="utf-8") as f:
+                f.write('{"report_id": "cit')  # interrupted write
+            # Reports that cannot be judged are skipped, never decided
+            append_record(reports / "ghost.jsonl", "Q1", "Pengalaman?", "Jawaban tanpa pemilik", 0.0)
+            save_json({"Username": "dewi", "Position": "Chef"}, users / "dewi.json")
+            append_record(reports / "dewi.jsonl", "Wage_Expectation", "Gaji?", "6000000", 0.0)
+
+            second = regrade_reports(reports, users, out_dir=out, workers=1)
+            assert second["graded"] == 1 and second["resumed"] == 2
+            assert second["skipped"] == {"ghost": "no user metadata", "dewi": "no answers"}
+
+            results = load_results(out_dir=out)
+            assert sorted(results) == ["ana", "budi", "citra"]
+            answer = results["citra"]["answers"][0]
+            assert answer["grade"] == 0.875 and answer["behavioral"] > 0  # (1 + (0.5 + 1) / 2) / 2
+            assert results["citra"]["model_version"] == first["model_version"]
+            # Judged like Judger.finalize: behavioral scores, not the model grades
+            from app.modules.QnA.decisions import DecisionEngine
+            from app.modules.QnA.questions import JOB_POSITIONS
+            expected = DecisionEngine(JOB_POSITIONS["Chef"]["standard"]).judge(
+                question_scores=[answer["behavioral"]], sentiment=answer["behavioral"],
+                months_experience=14, wage_expectation=6000000,
+            )
+            assert results["citra"]["decision"] == {"username": "citra", "position": "Chef", **expected}
+
+            # --apply stores the new decision and drops the outdated dashboard artifact
+            from app.modules.io_manager.dashboard_artifact import write_artifact, artifact_path_for
+            write_artifact(reports / "ana.csv", {"decision": {"label": "Tidak Layak"}})
+            regrade_reports(reports, users, out_dir=Path(tmpdir) / "applied", workers=1, apply=True)
+            stored = get_backend().load_decision("ana")
+            assert stored["label"] == results["ana"]["decision"]["label"]
+            assert stored["final_score"] == results["ana"]["decision"]["final_score"]
+            assert not artifact_path_for(reports / "ana.csv").exists()
+
+            # Users stored only in the database (SQLite backend) are found too
+            from app.modules.io_manager.storage_backend import SQLiteBackend
+            sqlite = SQLiteBackend(Path(tmpdir) / "hireon.db")
+            sqlite.save_user({"Username": "eka", "Position": "Chef", "months_experience": 14})
+            append_record(reports / "eka.jsonl", "Q1", "Pengalaman?", "Saya dedicated dan reliable", 0.0)
+            set_backend(sqlite)
+            try:
+                summary = regrade_reports(reports, users, out_dir=Path(tmpdir) / "sqlite", workers=1, apply=True)
+                assert "eka" not in summary["skipped"]
+                decisions = sqlite.query_decisions().set_index("report_id")
+                assert decisions.loc["eka", "username"] == "eka"
+            finally:
+                sqlite.close()
+    finally:
+        set_backend(original)
+        registry.register("sentiment", _load_sentiment_pipeline)
+        registry.register("embedding", _load_embedding_model)
+        score_cache.clear()
+
+def test_hr_analytics():
+    import json
+    import os
+    from app.modules.io_manager.answer_log import append_record
+    from app.modules.io_manager.jsonio import save_json
+    from app.modules.evaluation.hr_analytics import refresh_candidate_table, load_candidate_table, rank_candidates, MANIFEST_NAME
+    from app.modules.evaluation.regrade import behavioral_scores
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        reports, users, out = Path(tmpdir) / "reports", Path(tmpdir) / "users", Path(tmpdir) / "out"
+        reports.mkdir()
+        answers = {
+            "ana": ("Saya dedicated, reliable dan selalu bertanggung jawab", 0.9),
+            "budi": ("Saya malas dan sering terlambat", 0.4),
+            "citra": ("Saya bekerja dengan teliti", 0.7),
+        }
+        for name, (answer, score) in answers.items():
+            save_json({"Username": name, "Position": "Chef", "months_experience": 14, "wage_expectation": 5_000_000}, users / f"{name}.json")
+            append_record(reports / f"{name}.jsonl", "L1", "Pengalaman?", "Pernah", 0.5)
+            append_record(reports / f"{name}.jsonl", "Q1", "Kelebihan?", answer, score)
+
+        assert refresh_candidate_table(reports, users, out) == {"scanned": 3, "updated": 3, "removed": 0, "partitions": 1}
+        manifest = json.loads((out / MANIFEST_NAME).read_text())
+        assert manifest["version"] == 2 and sorted(manifest["reports"]) == ["ana", "budi", "citra"]
+        assert not [p for p in out.iterdir() if p.name.endswith(".tmp")]
+
+        table = load_candidate_table(out).set_index("report_id")
+        # Sentiment is the behavioral score of the answers, not the stored grade
+        assert table.loc["budi", "avg_sentiment"] == round(behavioral_scores([answers["budi"][0]])[0], 4)
+        assert table.loc["ana", "avg_question_score"] == 0.9
+        ranking = rank_candidates("Chef", out_dir=out)
+        assert ranking["report_id"].tolist()[0] == "ana" and ranking["final_score"].is_monotonic_decreasing
+
+        # Nothing changed: nothing recomputed
+        assert refresh_candidate_table(reports, users, out)["updated"] == 0
+
+        # One report changed, one removed
+        append_record(reports / "budi.jsonl", "Q1", "Kelebihan?", answers["ana"][0], 1.0)
+        stat = (reports / "budi.jsonl").stat()
+        os.utime(reports / "budi.jsonl", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        (reports / "citra.jsonl").unlink()
+        counts = refresh_candidate_table(reports, users, out)
+        assert counts["updated"] == 1 and counts["removed"] == 1
+        ranking = rank_candidates("Chef", out_dir=out)
+        assert ranking["report_id"].tolist() == ["budi", "ana"]
+
+def test_what_if():
+    import numpy as np
+    import pandas as pd
+    from app.modules.QnA.decisions import DecisionEngine
+    from app.modules.evaluation.what_if import pool_from_table, simulate
+
+    rng = np.random.default_rng(7)
+    n = 300
+    table = pd.DataFrame({
+        "report_id": [f"r{i}" for i in range(n)],
+        "position": rng.choice(["Chef", "OB"], n),
+        "avg_question_score": rng.uniform(0, 1, n).round(4),
+        "avg_sentiment": rng.uniform(-1, 1, n).round(4),
+        "months_experience": rng.integers(0, 24, n),
+        "wage_expectation": rng.integers(2_000_000, 12_000_000, n),
+    })
+    pool = pool_from_table(table, budgets={"Chef": 6_000_000, "OB": 4_000_000})
+
+    # Batch path agrees with judge() row by row
+    batch = DecisionEngine(0).judge_batch(pool.avg_score, pool.sentiment, pool.months, pool.wage, company_budget=pool.budget)
+    for i in range(n):
+        single = DecisionEngine(int(pool.budget[i])).judge([pool.avg_score[i]], pool.sentiment[i], pool.months[i], pool.wage[i])
+        assert single["label"] == batch["label"][i]
+        assert single["final_score"] == batch["final_score"][i]
+
+    result = simulate(pool, pass_thresholds=[0.7, 0.8], wage_penalties=[0.0, 0.05], by_position=True)
+    assert len(result) == 2 * 2 * 2
+    assert (result[["Layak", "Dipertimbangkan", "Tidak Layak"]].sum(axis=1) == result["n"]).all()
+
+    # Default scenario matches the per-candidate labels
+    row = simulate(pool, pass_thresholds=[0.8], wage_penalties=[0.05]).iloc[0]
+    assert row["Layak"] == int((batch["label"] == "Layak").sum())
+    assert row["Tidak Layak"] == int((batch["label"] == "Tidak Layak").sum())
+
+    # Lower pass threshold never passes fewer candidates
+    overall = simulate(pool, pass_thresholds=[0.6, 0.7, 0.8], wage_penalties=[0.05])
+    assert overall["Layak"].is_monotonic_decreasing
+
 # =================================================================
 # JUDGER TESTS
 # =================================================================
 def test_judger():
     from app.modules.QnA import Judger
-    import tempfile
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        import app.modules.io_manager.storage_paths as sp
-        original_reports = sp.REPORTS_DIR
-        sp.REPORTS_DIR = Path(tmpdir)
-        
-        try:
-            judger = Judger(user_id="testuser", company_budget=5000)
-            
-            # Process answer
-            score = judger.process_answer(
-                "What motivates you?",
-                "I am very motivated and determined to achieve my goals."
+
+    with temp_data_root() as root:
+        judger = Judger(user_id="testuser", company_budget=5000)
+        assert judger.file_path == root / "reports" / "testuser.csv"
+
+        # Process answer
+        score = judger.process_answer(
+            "What motivates you?",
+            "I am very motivated and determined to achieve my goals."
+        )
+        assert isinstance(score, float)
+        assert -1 <= score <= 1
+
+        # Process 15 more answers to reach 16
+        for i in range(15):
+            judger.process_answer(
+                f"Question {i}?",
+                "I am reliable and honest in my work."
             )
-            assert isinstance(score, float)
-            assert -1 <= score <= 1
-            
-            # Process 15 more answers to reach 16
-            for i in range(15):
-                judger.process_answer(
-                    f"Question {i}?",
-                    "I am reliable and honest in my work."
-                )
-            
-            # Finalize
-            report = judger.finalize(months_experience=12, wage_expectation=4000)
-            assert "label" in report
-            assert "final_score" in report
-            
+
+        # Finalize
+        report = judger.finalize(months_experience=12, wage_expectation=4000)
+        assert "label" in report
+        assert "final_score" in report
+        assert (root / "reports" / "testuser.decision.json").exists()
+
+def test_judger_decision_owner():
+    from app.modules.QnA import Judger
+    from app.modules.io_manager.storage_backend import SQLiteBackend
+
+    with temp_data_root() as root:
+        backend = SQLiteBackend(root / "hireon.db")
+        try:
+            backend.save_user({"Username": "owneruser", "Position": "Chef"})
+            judger = Judger(user_id="owneruser", company_budget=5000)
+            judger.backend = backend
+            judger.process_answer("Question?", "Saya jujur dan disiplin.")
+            judger.finalize(months_experience=12, wage_expectation=4000)
+            decisions = backend.query_decisions(position="Chef")
+            assert decisions[["report_id", "username"]].values.tolist() == [["owneruser", "owneruser"]]
         finally:
-            sp.REPORTS_DIR = original_reports
+            backend.close()
+
+def test_dashboard_artifact():
+    import os
+    from app.modules.QnA import Judger
+    from app.modules.QnA.dashboard import DashboardBuilder, load_dashboard
+    from app.modules.io_manager.answer_log import append_record
+    from app.modules.io_manager.dashboard_artifact import artifact_path_for, read_artifact, ARTIFACT_VERSION
+
+    with temp_data_root():
+        judger = Judger(user_id="artifactuser", company_budget=5000)
+        for i in range(3):
+            judger.process_answer(f"Question {i}?", "Saya jujur, disiplin dan bertanggung jawab.")
+        report = judger.finalize(months_experience=12, wage_expectation=4000)
+
+        artifact = read_artifact(judger.file_path)
+        assert artifact["version"] == ARTIFACT_VERSION
+        assert artifact["labels"] == ["L1", "L2", "Q1"] and len(artifact["scores"]) == 3
+        assert artifact["decision"]["label"] == report["label"]
+        assert artifact["figure"]["data"][0]["y"] == artifact["scores"] and artifact["keywords"]
+
+        # Served from the artifact while it is current
+        builder = DashboardBuilder("artifactuser")
+        assert builder.build()["bar_chart"] == artifact["bar_chart"]
+        with open(artifact_path_for(judger.file_path), "w", encoding="utf-8") as f:
+            json.dump({**artifact, "overall_score": -1.0}, f)
+        assert builder.build()["overall_score"] == -1.0
+
+        # A report change invalidates it, even within the same mtime tick;
+        # the dashboard rebuilds and stores it again
+        tick = judger.log_path.stat().st_mtime_ns
+        append_record(judger.log_path, "Q2", "Question 3?", "Saya siap belajar.", 0.5)
+        os.utime(judger.log_path, ns=(tick, tick))
+        assert read_artifact(judger.file_path) is None
+        assert builder.build()["overall_score"] != -1.0
+        rebuilt = load_dashboard(judger.file_path)
+        assert rebuilt["labels"] == ["L1", "L2", "Q1", "Q2"]
+        assert rebuilt["decision"]["label"] == report["label"]  # stored decision kept
+        assert read_artifact(judger.file_path) is not None
+
+        # Without a stored decision, the previous artifact's is carried over
+        judger.file_path.with_name("artifactuser.decision.json").unlink()
+        append_record(judger.log_path, "Q3", "Question 4?", "Saya tepat waktu.", 0.5)
+        assert load_dashboard(judger.file_path)["decision"]["final_score"] == report["final_score"]
 
 # =================================================================
 # RUN ALL TESTS
 # =================================================================
 def main():
+    # The shared stem cache is not persisted from test runs
+    from app.modules.QnA.preprocessing import stem_cache
+    stem_cache.path = None
+
     print("=" * 60)
     print("AI Interview System - Test Suite")
     print("=" * 60)
@@ -241,20 +1489,46 @@ def main():
     test("Username validation", test_username_validation)
     test("Password validation", test_password_validation)
     test("Age validation", test_age_validation)
+    test("User ID generation", test_user_id_generation)
     print()
     
     print("I/O OPERATIONS:")
     test("JSON I/O", test_json_io)
     test("CSV operations", test_csv_operations)
+    test("Answer log", test_answer_log)
+    test("Score store", test_score_store)
+    test("Embedding store", test_embedding_store)
+    test("Mtime-keyed file cache", test_mtime_cache)
+    test("Queued logging", test_queued_logging)
+    test("File backend", test_file_backend)
+    test("SQLite backend", test_sqlite_backend)
+    test("SQLite migration", test_migrate)
     print()
     
     print("TEXT MINING:")
     test("Tokenizer", test_tokenizer)
+    test("Stem cache", test_stem_cache)
+    test("Answer analysis", test_answer_analysis)
     test("Behavioral sentiment", test_behavioral_sentiment)
+    test("Weighted words", test_weighted_words)
+    test("Model registry", test_model_registry)
+    test("Inference backend", test_inference_backend)
+    test("ONNX runtime models", test_onnx_models)
+    test("Score cache", test_score_cache)
+    test("Batch sentiment / relevance", test_batch_scoring)
+    test("Question index", test_question_index)
+    test("Grading worker", test_grading_worker)
+    test("Grading worker failures", test_grading_worker_failures)
+    test("Grading worker embeddings", test_grading_worker_embeddings)
+    test("Model server micro-batching", test_micro_batcher)
+    test("Model server inference failure", test_model_server_failure)
+    test("Pipeline metrics", test_metrics)
+    test("Answer similarity index", test_answer_index)
     print()
     
     print("AUTHENTICATION:")
     test("Create and verify user", test_auth_create_user)
+    test("Username index", test_user_index)
     print()
     
     print("QUESTION BANK:")
@@ -263,10 +1537,15 @@ def main():
     
     print("DECISION ENGINE:")
     test("Decision engine scoring", test_decision_engine)
+    test("Bulk regrade", test_regrade)
+    test("HR analytics candidate table", test_hr_analytics)
+    test("Threshold what-if", test_what_if)
     print()
     
     print("JUDGER:")
     test("Judger pipeline", test_judger)
+    test("Judger decision owner", test_judger_decision_owner)
+    test("Dashboard artifact", test_dashboard_artifact)
     print()
     
     print("=" * 60)